@@ -0,0 +1,461 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import random
+import secrets
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.http_pool import client_errors
+from utils.instrumentation import instrumented
+from utils.rate_limit import TokenBucket
+
+SQLITE_MAX_PARAMS = 900
+MAX_BULK = 10000
+MAX_PENDING = 250000
+EVENT_BUFFER = 200000
+# Applications per second and burst size sent to any one employer's portal
+DEFAULT_EMPLOYER_LIMIT = {'rate': 2.0, 'burst': 5}
+ACTIVE_STATUSES = ('queued', 'processing', 'retrying')
+_ENCODER = json.JSONEncoder(separators=(',', ':'), default=str)
+
+Submitter = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class QueueFull(Exception):
+    def __init__(self, pending: int, retry_after: float):
+        super().__init__(f"Application queue is full ({pending} pending), retry after {retry_after:.1f}s")
+        self.pending = pending
+        self.retry_after = retry_after
+
+
+class EmployerRateLimited(Exception):
+    def __init__(self, employer: str, retry_after: float):
+        super().__init__(f"{employer} rate limited, retry after {retry_after:.1f}s")
+        self.employer = employer
+        self.retry_after = retry_after
+
+
+class EmployerUnavailable(Exception):
+    pass
+
+
+def application_id(user_id: Any, job_id: Any) -> str:
+    # One application per user and job: a re-sent bulk submission maps onto the same ids
+    return 'app_' + hashlib.sha1(f"{user_id}:{job_id}".encode()).hexdigest()[:20]
+
+
+async def simulated_submit(application: Dict[str, Any]) -> Dict[str, Any]:
+    # Simulated employer integration - in production, post to the employer's portal or ATS
+    return {'success': True, 'reference': f"ref_{secrets.token_hex(6)}", 'optimization_score': 92}
+
+
+class ApplicationQueue:
+    def __init__(self, db_path: Optional[str] = None, submitter: Optional[Submitter] = None,
+                 employer_limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 default_limit: Optional[Dict[str, float]] = None, max_concurrency: int = 64,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_cap: float = 30.0,
+                 max_pending: int = MAX_PENDING, flush_interval: float = 0.05,
+                 event_buffer: int = EVENT_BUFFER, rng: Optional[random.Random] = None):
+        self.submitter = submitter or simulated_submit
+        self.employer_limits = dict(employer_limits or {})
+        self.default_limit = default_limit or DEFAULT_EMPLOYER_LIMIT
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self._rng = rng or random.Random()
+        # Every accepted application is committed before its id is returned. Status changes after that
+        # are written in bulk every flush_interval; a crash replays whatever had not finished.
+        self._lock = threading.Lock()
+        db_path = db_path or os.environ.get(
+            'APPLICATION_QUEUE_DB', os.path.join(os.path.expanduser('~'), '.jobplatform', 'applications.db')
+        )
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS applications ('
+            'id TEXT PRIMARY KEY, batch_id TEXT NOT NULL, employer TEXT NOT NULL, payload TEXT NOT NULL, '
+            'status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, '
+            'created_at REAL NOT NULL, updated_at REAL NOT NULL)'
+        )
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_applications_batch ON applications (batch_id, status)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status, created_at)')
+        self.db.commit()
+
+        # Unfinished applications by id; per-employer FIFO queues served round-robin, so one employer's
+        # backlog never holds up another's
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._queues: Dict[str, Deque[str]] = {}
+        self._ready: Deque[str] = deque()
+        self._limiters: Dict[str, TokenBucket] = {}
+        self._batch_active: Dict[str, int] = {}
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._wakeup = asyncio.Event()
+        self._dirty: Dict[str, Tuple[Any, ...]] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._retry_handles: Set[asyncio.TimerHandle] = set()
+        # Status changes, oldest first, for long-poll and SSE clients resuming from a sequence number
+        self._changes: Deque[Tuple[int, str, str, str, int]] = deque(maxlen=event_buffer)
+        self._seq = 0
+        self._changed = asyncio.Event()
+        self._notify_pending = False
+        self._running = False
+        self._background: List[asyncio.Task] = []
+        self.counters = {'accepted': 0, 'duplicates': 0, 'rejected': 0, 'submitted': 0, 'failed': 0, 'retries': 0}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._load()
+        self._background = [asyncio.create_task(self._dispatch()), asyncio.create_task(self._flush_periodically())]
+
+    def _load(self):
+        # Anything not finished before a restart, including applications that were mid-submission
+        with self._lock:
+            rows = self.db.execute(
+                f"SELECT id, batch_id, employer, payload, attempts FROM applications "
+                f"WHERE status IN ({','.join('?' * len(ACTIVE_STATUSES))}) ORDER BY created_at", ACTIVE_STATUSES
+            ).fetchall()
+        for app_id, batch_id, employer, payload, attempts in rows:
+            self._track(app_id, batch_id, employer, json.loads(payload), attempts)
+            self._enqueue(app_id)
+
+    def _track(self, app_id: str, batch_id: str, employer: str, payload: Dict[str, Any], attempts: int = 0):
+        self._records[app_id] = {'id': app_id, 'batch_id': batch_id, 'employer': employer, 'payload': payload,
+                                 'status': 'queued', 'attempts': attempts}
+        self._batch_active[batch_id] = self._batch_active.get(batch_id, 0) + 1
+
+    def _limiter(self, employer: str) -> TokenBucket:
+        limiter = self._limiters.get(employer)
+        if limiter is None:
+            limit = self.employer_limits.get(employer, self.default_limit)
+            limiter = self._limiters[employer] = TokenBucket(limit['rate'], limit['burst'])
+        return limiter
+
+    def _enqueue(self, app_id: str):
+        record = self._records.get(app_id)
+        if record is None:
+            return
+        queue = self._queues.get(record['employer'])
+        if queue is None:
+            queue = self._queues[record['employer']] = deque()
+            self._ready.append(record['employer'])
+        queue.append(app_id)
+        self._wakeup.set()
+
+    def retry_after(self) -> float:
+        # Rough time for the backlog to drain to a point where a new bulk submission fits
+        throughput = max(1.0, min(len(self._limiters) or 1, self.max_concurrency) * self.default_limit['rate'])
+        return min(60.0, max(1.0, (len(self._records) - self.max_pending * 0.8) / throughput))
+
+    @instrumented('application_queue')
+    async def submit_many(self, applications: Iterable[Dict[str, Any]], batch_id: Optional[str] = None) -> Dict[str, Any]:
+        # Each application needs a user_id and a job_id, which together identify it; employer (or company)
+        # is used when present.
+        # Returns once the batch is durable; submission to employers happens in the background.
+        applications = list(applications)
+        if len(applications) > MAX_BULK:
+            raise ValueError(f"At most {MAX_BULK} applications per submission")
+        if any(application.get('job_id') is None for application in applications):
+            raise ValueError('Every application needs a job_id')
+        if any(application.get('user_id') is None for application in applications):
+            raise ValueError('Every application needs a user_id')
+        if len(self._records) + len(applications) > self.max_pending:
+            self.counters['rejected'] += len(applications)
+            raise QueueFull(len(self._records), self.retry_after())
+        await self.start()
+
+        batch_id = batch_id or f"batch_{secrets.token_hex(8)}"
+        now = time.time()
+        ids, rows, payloads = [], [], {}
+        for application in applications:
+            app_id = application_id(application.get('user_id'), application['job_id'])
+            ids.append(app_id)
+            if app_id in payloads or app_id in self._records:
+                continue
+            payloads[app_id] = application
+            employer = str(application.get('employer') or application.get('company') or 'unknown')
+            rows.append((app_id, batch_id, employer, _ENCODER.encode(application),
+                         'queued', now, now))
+        inserted = await asyncio.get_running_loop().run_in_executor(None, self._insert, rows)
+
+        for app_id, batch, employer, *_ in inserted:
+            self._track(app_id, batch, employer, payloads[app_id])
+            self._emit(app_id, batch, 'queued', 0)
+            self._enqueue(app_id)
+        self.counters['accepted'] += len(inserted)
+        self.counters['duplicates'] += len(ids) - len(inserted)
+        return {'batch_id': batch_id, 'ids': ids, 'accepted': len(inserted), 'duplicates': len(ids) - len(inserted),
+                'pending': len(self._records)}
+
+    def _insert(self, rows: List[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+        # Skips ids stored by an earlier submission, so their status is reported rather than reset
+        with self._lock:
+            existing = set()
+            for offset in range(0, len(rows), SQLITE_MAX_PARAMS):
+                chunk = [row[0] for row in rows[offset:offset + SQLITE_MAX_PARAMS]]
+                existing.update(app_id for app_id, in self.db.execute(
+                    f"SELECT id FROM applications WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            fresh = [row for row in rows if row[0] not in existing]
+            with self.db:
+                self.db.executemany(
+                    'INSERT INTO applications (id, batch_id, employer, payload, status, created_at, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)', fresh
+                )
+        return fresh
+
+    async def _dispatch(self):
+        # Starts an application whenever its employer has a token and a concurrency slot is free
+        while self._running:
+            if not self._ready:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            soonest = None
+            for _ in range(len(self._ready)):
+                employer = self._ready[0]
+                wait = self._limiter(employer).reserve()
+                if wait > 0:
+                    self._ready.rotate(-1)
+                    soonest = wait if soonest is None else min(soonest, wait)
+                    continue
+                await self._slots.acquire()
+                queue = self._queues[employer]
+                app_id = queue.popleft()
+                if queue:
+                    self._ready.rotate(-1)
+                else:
+                    self._ready.popleft()
+                    del self._queues[employer]
+                task = asyncio.create_task(self._process(app_id))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                break
+            else:
+                # Every employer with work is throttled: sleep until the first bucket refills
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), soonest)
+                except asyncio.TimeoutError:
+                    pass
+
+    @instrumented('application_queue')
+    async def _process(self, app_id: str):
+        record = self._records[app_id]
+        try:
+            self._set_status(record, 'processing')
+            try:
+                result = await self.submitter(record['payload'])
+            except EmployerRateLimited as e:
+                self._limiter(record['employer']).penalize(e.retry_after)
+                self._retry(record, e, delay=0.0)
+            except (EmployerUnavailable, *client_errors()) as e:
+                self._retry(record, e, delay=self._backoff_delay(record['attempts']))
+            except Exception as e:
+                record['attempts'] += 1
+                self._finish(record, 'failed', error=str(e))
+            else:
+                record['attempts'] += 1
+                if result.get('success', True):
+                    self._finish(record, 'submitted', result=result)
+                else:
+                    self._finish(record, 'failed', result=result, error=result.get('error'))
+        finally:
+            self._slots.release()
+
+    def _backoff_delay(self, attempt: int) -> float:
+        # Full jitter keeps retries from many workers from synchronising
+        return self._rng.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _retry(self, record: Dict[str, Any], error: Exception, delay: float):
+        record['attempts'] += 1
+        if record['attempts'] > self.max_retries:
+            self._finish(record, 'failed', error=str(error))
+            return
+        self.counters['retries'] += 1
+        self._set_status(record, 'retrying', error=str(error))
+        if delay <= 0:
+            # Throttled: back of the employer's queue, which waits on its penalized bucket anyway
+            self._enqueue(record['id'])
+            return
+        handle = asyncio.get_running_loop().call_later(delay, self._requeue, record['id'])
+        self._retry_handles.add(handle)
+        record['retry_handle'] = handle
+
+    def _requeue(self, app_id: str):
+        record = self._records.get(app_id)
+        if record is not None:
+            self._retry_handles.discard(record.pop('retry_handle', None))
+            self._enqueue(app_id)
+
+    def _set_status(self, record: Dict[str, Any], status: str, result: Optional[Dict[str, Any]] = None,
+                    error: Optional[str] = None):
+        record['status'] = status
+        self._dirty[record['id']] = (status, record['attempts'],
+                                     json.dumps(result, default=str) if result is not None else None,
+                                     error, time.time())
+        self._emit(record['id'], record['batch_id'], status, record['attempts'])
+
+    def _finish(self, record: Dict[str, Any], status: str, result: Optional[Dict[str, Any]] = None,
+                error: Optional[str] = None):
+        self._set_status(record, status, result, error)
+        self.counters[status] += 1
+        del self._records[record['id']]
+        remaining = self._batch_active[record['batch_id']] - 1
+        if remaining:
+            self._batch_active[record['batch_id']] = remaining
+        else:
+            del self._batch_active[record['batch_id']]
+
+    def _emit(self, app_id: str, batch_id: str, status: str, attempts: int):
+        self._seq += 1
+        self._changes.append((self._seq, app_id, batch_id, status, attempts))
+        if not self._notify_pending:
+            # One wakeup per loop iteration however many statuses changed in it
+            self._notify_pending = True
+            asyncio.get_running_loop().call_soon(self._notify)
+
+    def _notify(self):
+        self._notify_pending = False
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def _changes_since(self, since: int, batch_id: Optional[str], ids: Optional[Set[str]],
+                       limit: int) -> Tuple[int, List[Dict[str, Any]], bool]:
+        if since > self._seq:
+            # A sequence number from before a restart: the counter began again at 0, so nothing after it
+            # can be trusted and the client has to re-read status()
+            return self._seq, [], True
+        if not self._changes or since == self._seq:
+            return max(since, 0), [], False
+        oldest = self._changes[0][0]
+        resync = since + 1 < oldest
+        position, changes = since, []
+        for seq, app_id, batch, status, attempts in itertools.islice(self._changes, max(0, since + 1 - oldest), None):
+            position = seq
+            if (batch_id is None or batch == batch_id) and (ids is None or app_id in ids):
+                changes.append({'seq': seq, 'id': app_id, 'batch_id': batch, 'status': status, 'attempts': attempts})
+                if len(changes) >= limit:
+                    break
+        return position, changes, resync
+
+    async def wait(self, since: int = 0, batch_id: Optional[str] = None, ids: Optional[Iterable[str]] = None,
+                   timeout: float = 30.0, limit: int = 1000) -> Dict[str, Any]:
+        # Long-poll: returns status changes after `since` as soon as there are any, or none after `timeout`.
+        # 'resync' means changes were dropped from the buffer and status() should be re-read.
+        ids = set(ids) if ids is not None else None
+        deadline = time.monotonic() + timeout
+        while True:
+            position, changes, resync = self._changes_since(since, batch_id, ids, limit)
+            remaining = deadline - time.monotonic()
+            if changes or resync or remaining <= 0:
+                return {'seq': position, 'changes': changes, 'resync': resync,
+                        'pending': self._batch_active.get(batch_id, 0) if batch_id else len(self._records)}
+            since = position
+            changed = self._changed
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def events(self, since: int = 0, batch_id: Optional[str] = None,
+                     heartbeat: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        # For server-sent events: yields each long-poll result (empty ones act as heartbeats) and stops
+        # once a watched batch has nothing left in flight
+        while True:
+            update = await self.wait(since, batch_id, timeout=heartbeat)
+            since = update['seq']
+            yield update
+            if batch_id and not update['pending'] and not update['resync']:
+                return
+
+    def is_active(self, batch_id: str) -> bool:
+        return batch_id in self._batch_active
+
+    async def status(self, ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        await self.flush()
+        ids = list(dict.fromkeys(ids))
+        found = {}
+        for app_id in ids:
+            record = self._records.get(app_id)
+            if record is not None:
+                found[app_id] = {'status': record['status'], 'attempts': record['attempts'],
+                                 'employer': record['employer'], 'batch_id': record['batch_id']}
+        missing = [app_id for app_id in ids if app_id not in found]
+        found.update(await asyncio.get_running_loop().run_in_executor(None, self._stored_status, missing))
+        return found
+
+    def _stored_status(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        stored = {}
+        with self._lock:
+            for offset in range(0, len(ids), SQLITE_MAX_PARAMS):
+                chunk = ids[offset:offset + SQLITE_MAX_PARAMS]
+                for app_id, status, attempts, employer, batch_id, result, error in self.db.execute(
+                    f"SELECT id, status, attempts, employer, batch_id, result, error FROM applications "
+                    f"WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                ):
+                    stored[app_id] = {'status': status, 'attempts': attempts, 'employer': employer,
+                                      'batch_id': batch_id, 'result': json.loads(result) if result else None,
+                                      'error': error}
+        return stored
+
+    async def batch_summary(self, batch_id: str) -> Dict[str, int]:
+        await self.flush()
+        with self._lock:
+            rows = self.db.execute('SELECT status, COUNT(*) FROM applications WHERE batch_id = ? GROUP BY status',
+                                   (batch_id,)).fetchall()
+        return dict(rows)
+
+    async def _flush_periodically(self):
+        while self._running:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, {}
+        rows = [(*values, app_id) for app_id, values in dirty.items()]
+        await asyncio.get_running_loop().run_in_executor(None, self._write, rows)
+
+    def _write(self, rows: List[Tuple[Any, ...]]):
+        with self._lock, self.db:
+            self.db.executemany(
+                'UPDATE applications SET status = ?, attempts = ?, result = COALESCE(?, result), error = ?, '
+                'updated_at = ? WHERE id = ?', rows
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, 'pending': len(self._records), 'in_flight': len(self._tasks),
+                'employers_waiting': len(self._ready), 'batches_active': len(self._batch_active)}
+
+    async def close(self):
+        # In-flight submissions finish; queued and retrying ones stay in SQLite for the next start
+        self._running = False
+        self._wakeup.set()
+        for task in self._background:
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self._background = []
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.flush()
+        self.db.close()
@@ -0,0 +1,155 @@
+from datetime import date
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+
+# Same defaults as AnalyticsTracker.calculate_roi applies to a missing field
+CAMPAIGN_DEFAULTS = {'investment': 1000.0, 'conversions': 50.0, 'lifetime_value': 100.0}
+DATE_BUCKETS = ('day', 'week', 'month')
+MAX_DENSE_BUCKETS = 100000
+
+Campaigns = Union[Sequence[Mapping[str, Any]], Mapping[str, Any]]
+
+
+def campaign_metrics(investment: np.ndarray, conversions: np.ndarray, revenue: np.ndarray,
+                     lifetime_months: float = 12.0) -> Dict[str, np.ndarray]:
+    investment = np.asarray(investment, dtype=np.float64)
+    conversions = np.asarray(conversions, dtype=np.float64)
+    revenue = np.asarray(revenue, dtype=np.float64)
+    safe_investment = np.where(investment > 0, investment, 1.0)
+    monthly_revenue = revenue / lifetime_months
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'roi': np.round(np.maximum((revenue - investment) / safe_investment * 100, 0), 2),
+            'cac': np.round(np.where(conversions > 0, investment / conversions, np.nan), 2),
+            'payback_months': np.round(np.where(monthly_revenue > 0, investment / monthly_revenue, np.nan), 2)
+        }
+
+
+def _bucket_days(dates: np.ndarray, bucket: str) -> np.ndarray:
+    days = dates.astype('datetime64[D]')
+    if bucket == 'day':
+        return days
+    if bucket == 'week':
+        # Weeks start on Monday; 1970-01-01 was a Thursday
+        ordinal = days.astype(np.int64)
+        return (ordinal - (ordinal + 3) % 7).astype('datetime64[D]')
+    return days.astype('datetime64[M]').astype('datetime64[D]')
+
+
+class CampaignAnalytics:
+    def __init__(self, bucket: str = 'day', lifetime_months: float = 12.0):
+        if bucket not in DATE_BUCKETS:
+            raise ValueError(f"bucket must be one of {DATE_BUCKETS}")
+        self.bucket = bucket
+        self.lifetime_months = lifetime_months
+        # Running sums per (platform, bucket start) so appends only touch the groups they land in
+        self._sums: Dict[Tuple[str, str], np.ndarray] = {}
+        self._results: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._dirty = set()
+
+    def __len__(self) -> int:
+        return int(sum(sums[3] for sums in self._sums.values()))
+
+    @staticmethod
+    def to_columns(campaigns: Campaigns) -> Dict[str, np.ndarray]:
+        if isinstance(campaigns, Mapping):
+            rows = next((len(values) for values in campaigns.values() if not np.isscalar(values)), 1)
+            get = campaigns.get
+        else:
+            rows = len(campaigns)
+            columns = {key: [record.get(key, default) for record in campaigns]
+                       for key, default in (*CAMPAIGN_DEFAULTS.items(), ('platform', 'unknown'), ('date', None))}
+            get = columns.get
+        today = np.datetime64(date.today(), 'D')
+        dates = get('date')
+        if dates is None or np.isscalar(dates):
+            dates = np.full(rows, today if dates is None else np.datetime64(dates, 'D'))
+        else:
+            dates = np.array([today if value is None else value for value in dates], dtype='datetime64[D]') \
+                if isinstance(dates, list) else np.asarray(dates, dtype='datetime64[D]')
+        return {
+            'investment': np.broadcast_to(np.asarray(get('investment', CAMPAIGN_DEFAULTS['investment']), dtype=np.float64), (rows,)),
+            'conversions': np.broadcast_to(np.asarray(get('conversions', CAMPAIGN_DEFAULTS['conversions']), dtype=np.float64), (rows,)),
+            'lifetime_value': np.broadcast_to(np.asarray(get('lifetime_value', CAMPAIGN_DEFAULTS['lifetime_value']), dtype=np.float64), (rows,)),
+            'platform': np.broadcast_to(np.asarray(get('platform', 'unknown')).astype(str), (rows,)),
+            'date': dates
+        }
+
+    def append(self, campaigns: Campaigns) -> Dict[str, np.ndarray]:
+        columns = self.to_columns(campaigns)
+        revenue = columns['conversions'] * columns['lifetime_value']
+        per_campaign = campaign_metrics(columns['investment'], columns['conversions'], revenue, self.lifetime_months)
+        if not len(revenue):
+            return per_campaign
+
+        # Hash-based factorize is far cheaper than sorting millions of platform strings.
+        # pandas is only needed here and costs ~370 ms to import, so it loads on first append.
+        import pandas as pd
+
+        platform_codes, platforms = pd.factorize(columns['platform'])
+        bucket_days = _bucket_days(columns['date'], self.bucket).astype(np.int64)
+        first_day = bucket_days.min()
+        bucket_codes = bucket_days - first_day
+        if bucket_codes.max() < MAX_DENSE_BUCKETS:
+            buckets = np.arange(first_day, first_day + bucket_codes.max() + 1).astype('datetime64[D]')
+        else:
+            buckets, bucket_codes = np.unique(bucket_days.astype('datetime64[D]'), return_inverse=True)
+        group = platform_codes * len(buckets) + bucket_codes
+        size = len(platforms) * len(buckets)
+        sums = np.stack([
+            np.bincount(group, weights=columns['investment'], minlength=size),
+            np.bincount(group, weights=columns['conversions'], minlength=size),
+            np.bincount(group, weights=revenue, minlength=size),
+            np.bincount(group, minlength=size).astype(np.float64)
+        ], axis=1)
+
+        for index in np.flatnonzero(sums[:, 3]):
+            key = (str(platforms[index // len(buckets)]), str(buckets[index % len(buckets)]))
+            if key in self._sums:
+                self._sums[key] += sums[index]
+            else:
+                self._sums[key] = sums[index].copy()
+            self._dirty.add(key)
+        return per_campaign
+
+    def _refresh(self):
+        if not self._dirty:
+            return
+        keys = list(self._dirty)
+        sums = np.stack([self._sums[key] for key in keys])
+        metrics = campaign_metrics(sums[:, 0], sums[:, 1], sums[:, 2], self.lifetime_months)
+        for row, key in enumerate(keys):
+            self._results[key] = self._group_result(sums[row], metrics, row)
+        self._dirty.clear()
+
+    @staticmethod
+    def _group_result(sums: np.ndarray, metrics: Mapping[str, np.ndarray], row: int) -> Dict[str, float]:
+        result = {
+            'campaigns': int(sums[3]),
+            'investment': round(float(sums[0]), 2),
+            'conversions': float(sums[1]),
+            'revenue': round(float(sums[2]), 2)
+        }
+        result.update({name: (None if np.isnan(values[row]) else float(values[row])) for name, values in metrics.items()})
+        return result
+
+    def summary(self, by: Iterable[str] = ('platform', 'date')) -> Dict[Any, Dict[str, float]]:
+        by = tuple(by)
+        self._refresh()
+        if by == ('platform', 'date'):
+            return dict(self._results)
+
+        # Coarser rollups are recombined from the cached group sums, never from raw campaigns
+        positions = [('platform', 'date').index(dimension) for dimension in by]
+        rollup: Dict[Any, np.ndarray] = {}
+        for key, sums in self._sums.items():
+            rolled_key = tuple(key[position] for position in positions)
+            rolled_key = rolled_key[0] if len(rolled_key) == 1 else (rolled_key or 'all')
+            rollup[rolled_key] = rollup.get(rolled_key, 0) + sums
+        if not rollup:
+            return {}
+        keys: List[Any] = list(rollup)
+        stacked = np.stack([rollup[key] for key in keys])
+        metrics = campaign_metrics(stacked[:, 0], stacked[:, 1], stacked[:, 2], self.lifetime_months)
+        return {key: self._group_result(stacked[row], metrics, row) for row, key in enumerate(keys)}
@@ -1,94 +1,122 @@
+import random
+import secrets
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.instrumentation import instrumented, registry
+
+
 class ContentCreator:
+    metrics_component = 'content_creator'
+
     def __init__(self, platform_specialization: str):
         self.platform_specialization = platform_specialization
-        self.performance_metrics = {}
         self.content_history = []
+
+    @property
+    def performance_metrics(self) -> Dict[str, Dict[str, Any]]:
+        # Process-wide call counts and latency for this creator type, from the instrumentation registry
+        return registry.component(self.metrics_component)
         
     async def create_addictive_content(self, topic: str, target_audience: str) -> Dict[str, Any]:
         raise NotImplementedError
 
 class SocialMediaContentCreator(ContentCreator):
-    def __init__(self):
+    metrics_component = 'social_media_content'
+    PLATFORM_FORMATS = {
+        'tiktok': {'duration': '15-60s', 'format': 'vertical_video', 'addiction_factor': 9.5},
+        'instagram': {'reels': '90s', 'stories': '15s', 'format': 'reels', 'addiction_factor': 8.8},
+        'youtube': {'shorts': '60s', 'format': 'vertical_video', 'addiction_factor': 8.2},
+        'facebook': {'format': 'square_video', 'addiction_factor': 7.5},
+        'twitter': {'format': 'text_image', 'addiction_factor': 7.8},
+        'snapchat': {'format': 'vertical_video_10s', 'addiction_factor': 9.1}
+    }
+    CONTENT_TEMPLATES = {
+        'tiktok': "🚀 BREAKING: {topic} that will 10X your career! 👇 Watch till end for secret! #CareerHackSA",
+        'instagram': "🌟 Discover how {topic} got 5000+ South Africans hired! ✨ Double tap if you want this! 👇",
+        'youtube': "SHOCKING: The {topic} method that companies don't want you to know! 🎯",
+        'twitter': "URGENT: {topic} is changing SA job market forever. You won't believe what happens next 🧵",
+        'facebook': "🤫 Secret {topic} technique revealed! Limited spots available - comment 'ME' to learn more!",
+        'snapchat': "👀 Psst... {topic} hack that works in 24 hours! 👇 Swipe up before it's gone!"
+    }
+    DEFAULT_TEMPLATE = "🚀 Amazing {topic} content that will transform your career!"
+    OPTIMAL_TIMES = {
+        'tiktok': '19:00-23:00',
+        'instagram': '17:00-20:00',
+        'facebook': '13:00-16:00',
+        'twitter': '08:00-10:00',
+        'youtube': '20:00-22:00',
+        'snapchat': '15:00-18:00'
+    }
+    DEFAULT_TIME = '18:00-20:00'
+    ADDICTIVE_ELEMENTS = [
+        "curiosity_gaps", "emotional_triggers", "social_proof",
+        "urgency_mechanisms", "visual_hooks", "interactive_elements",
+        "fear_of_missing_out", "social_validation", "scarcity"
+    ]
+    BASE_HASHTAGS = ['#JobSearchSA', '#CareerHack', '#GetHiredSA', '#SouthAfricaJobs']
+    CTAS = [
+        "LIMITED SPOTS: Join now before registration closes! 🚨",
+        "Only 50 positions left - apply immediately! ⏰",
+        "Your dream job is waiting - click now! 👇",
+        "Don't miss out - companies are hiring TODAY! 🔥"
+    ]
+
+    def __init__(self, rng: Optional[random.Random] = None):
         super().__init__("social_media")
-        self.platform_formats = {
-            'tiktok': {'duration': '15-60s', 'format': 'vertical_video', 'addiction_factor': 9.5},
-            'instagram': {'reels': '90s', 'stories': '15s', 'addiction_factor': 8.8},
-            'youtube': {'shorts': '60s', 'format': 'vertical_video', 'addiction_factor': 8.2},
-            'facebook': {'format': 'square_video', 'addiction_factor': 7.5},
-            'twitter': {'format': 'text_image', 'addiction_factor': 7.8},
-            'snapchat': {'format': 'vertical_video_10s', 'addiction_factor': 9.1}
-        }
-    
+        self.platform_formats = {platform: dict(specs) for platform, specs in self.PLATFORM_FORMATS.items()}
+        # A seeded random.Random makes output reproducible; the default stays unpredictable
+        self._rng = rng or secrets.SystemRandom()
+        self.compile_templates()
+
+    def compile_templates(self):
+        # Everything that does not depend on the topic is resolved once, not per topic x platform
+        self._compiled: List[Tuple[str, str, Dict[str, Any]]] = []
+        for platform, specs in self.platform_formats.items():
+            addiction_factor = specs['addiction_factor']
+            self._compiled.append((platform, self.CONTENT_TEMPLATES.get(platform, self.DEFAULT_TEMPLATE), {
+                'content_type': specs.get('format', platform),
+                'addictive_elements': tuple(self.ADDICTIVE_ELEMENTS[:min(int(addiction_factor), len(self.ADDICTIVE_ELEMENTS))]),
+                'optimal_post_time': self.OPTIMAL_TIMES.get(platform, self.DEFAULT_TIME),
+                'addiction_score': addiction_factor
+            }))
+
+    @instrumented('social_media_content')
     async def create_addictive_content(self, topic: str, target_audience: str) -> Dict[str, Any]:
-        addictive_elements = [
-            "curiosity_gaps", "emotional_triggers", "social_proof", 
-            "urgency_mechanisms", "visual_hooks", "interactive_elements",
-            "fear_of_missing_out", "social_validation", "scarcity"
-        ]
-        
+        return self.render(topic)
+
+    def render(self, topic: str) -> Dict[str, Dict[str, Any]]:
+        rng = self._rng
+        compact = topic.replace(" ", "")
+        hashtags = self.BASE_HASHTAGS + [f'#{compact}', f'#{compact}Hack']
         content_batch = {}
-        for platform, specs in self.platform_formats.items():
+        for platform, template, static in self._compiled:
             content_batch[platform] = {
-                'content_type': specs['format'],
-                'content': await self._generate_platform_content(topic, platform),
-                'addictive_elements': self._select_addictive_elements(addictive_elements, specs['addiction_factor']),
-                'optimal_post_time': await self._calculate_optimal_time(platform),
-                'hashtags': await self._generate_viral_hashtags(topic),
-                'call_to_action': self._create_compelling_cta(),
-                'addiction_score': specs['addiction_factor'],
-                'viral_potential': await self._calculate_viral_potential(topic, platform)
+                'content_type': static['content_type'],
+                'content': template.format(topic=topic),
+                'addictive_elements': list(static['addictive_elements']),
+                'optimal_post_time': static['optimal_post_time'],
+                'hashtags': list(hashtags),
+                'call_to_action': rng.choice(self.CTAS),
+                'addiction_score': static['addiction_score'],
+                'viral_potential': min(9.8, 7.5 + rng.uniform(0, 2.5))
             }
-        
         return content_batch
-    
-    async def _generate_platform_content(self, topic: str, platform: str) -> str:
-        templates = {
-            'tiktok': f"🚀 BREAKING: {topic} that will 10X your career! 👇 Watch till end for secret! #CareerHackSA",
-            'instagram': f"🌟 Discover how {topic} got 5000+ South Africans hired! ✨ Double tap if you want this! 👇",
-            'youtube': f"SHOCKING: The {topic} method that companies don't want you to know! 🎯",
-            'twitter': f"URGENT: {topic} is changing SA job market forever. You won't believe what happens next 🧵",
-            'facebook': f"🤫 Secret {topic} technique revealed! Limited spots available - comment 'ME' to learn more!",
-            'snapchat': f"👀 Psst... {topic} hack that works in 24 hours! 👇 Swipe up before it's gone!"
-        }
-        return templates.get(platform, f"🚀 Amazing {topic} content that will transform your career!")
-    
-    def _select_addictive_elements(self, elements: List[str], addiction_factor: float) -> List[str]:
-        num_elements = min(int(addiction_factor), len(elements))
-        return elements[:num_elements]
-    
-    async def _calculate_optimal_time(self, platform: str) -> str:
-        optimal_times = {
-            'tiktok': '19:00-23:00',
-            'instagram': '17:00-20:00', 
-            'facebook': '13:00-16:00',
-            'twitter': '08:00-10:00',
-            'youtube': '20:00-22:00',
-            'snapchat': '15:00-18:00'
-        }
-        return optimal_times.get(platform, '18:00-20:00')
-    
-    async def _generate_viral_hashtags(self, topic: str) -> List[str]:
-        base_hashtags = ['#JobSearchSA', '#CareerHack', '#GetHiredSA', '#SouthAfricaJobs']
-        topic_hashtags = [f'#{topic.replace(" ", "")}', f'#{topic}Hack']
-        return base_hashtags + topic_hashtags
-    
-    def _create_compelling_cta(self) -> str:
-        ctas = [
-            "LIMITED SPOTS: Join now before registration closes! 🚨",
-            "Only 50 positions left - apply immediately! ⏰",
-            "Your dream job is waiting - click now! 👇",
-            "Don't miss out - companies are hiring TODAY! 🔥"
-        ]
-        return secrets.choice(ctas)
-    
-    async def _calculate_viral_potential(self, topic: str, platform: str) -> float:
-        # AI-powered virality prediction
-        return min(9.8, 7.5 + secrets.SystemRandom().uniform(0, 2.5))
+
+    def iter_batch(self, topics: Iterable[str]) -> Iterator[Tuple[str, Dict[str, Dict[str, Any]]]]:
+        for topic in topics:
+            yield topic, self.render(topic)
+
+    @instrumented('social_media_content')
+    def create_batch(self, topics: Iterable[str]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        return dict(self.iter_batch(topics))
 
 class EcommerceContentCreator(ContentCreator):
+    metrics_component = 'ecommerce_content'
+
     def __init__(self):
         super().__init__("ecommerce")
         
+    @instrumented('ecommerce_content')
     async def create_ongoing_content(self, job_market_data: Dict) -> Dict[str, Any]:
         return {
             'blog_posts': await self._generate_blog_content(job_market_data),
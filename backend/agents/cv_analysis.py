@@ -0,0 +1,328 @@
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.keyword_automaton import KeywordAutomaton
+from utils.stats import LatencyHistogram
+
+UPLOAD_CHUNK_SIZE = 1 << 20
+MAX_UPLOAD_BYTES = 20 << 20
+MAX_IMAGE_SIDE = 2000
+PIPELINE_STAGES = ('decode', 'deskew', 'ocr_prep', 'extract')
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.tif', '.tiff', '.bmp', '.webp'}
+
+CV_SKILL_KEYWORDS = [
+    'python', 'java', 'javascript', 'sql', 'excel', 'microsoft office', 'sap', 'pastel', 'autocad', 'aws',
+    'project management', 'customer service', 'sales', 'marketing', 'accounting', 'bookkeeping', 'payroll',
+    'data analysis', 'leadership', 'communication', 'teamwork', 'problem solving', 'negotiation', 'recruitment',
+    'logistics', 'nursing', 'teaching', 'welding', 'electrical', 'plumbing', "driver's licence", 'code 10', 'code 14'
+]
+CV_SECTIONS = {
+    'contact': ['contact', 'email', 'phone', 'cell'],
+    'summary': ['summary', 'profile', 'objective'],
+    'experience': ['experience', 'employment history', 'work history'],
+    'education': ['education', 'qualifications', 'matric', 'degree', 'diploma'],
+    'skills': ['skills', 'competencies'],
+    'references': ['references', 'referees']
+}
+SECTION_IMPROVEMENTS = {
+    'contact': ('high', "Add your contact details (email and cell number) at the top"),
+    'experience': ('high', "Add a work experience section with your roles and achievements"),
+    'skills': ('high', "List your key skills so ATS filters can find them"),
+    'education': ('medium', "Include your education and qualifications (e.g. Matric, diploma, degree)"),
+    'summary': ('medium', "Open with a short professional summary"),
+    'references': ('low', "Add references or note that they are available on request")
+}
+
+_EMAIL = re.compile(rb"[\w.+-]+@[\w-]+\.[\w.]+")
+_PDF_STREAM = re.compile(rb"<<(.*?)>>\s*stream\r?\n(.*?)\r?\nendstream", re.S)
+_PDF_TEXT = re.compile(rb"\((.*?)(?<!\\)\)\s*(?:Tj|'|\")|\[(.*?)\]\s*TJ", re.S)
+_PDF_STRING = re.compile(rb"\((.*?)(?<!\\)\)", re.S)
+
+_skill_automaton = KeywordAutomaton(CV_SKILL_KEYWORDS, whole_words=True)
+_section_automaton = KeywordAutomaton([keyword for keywords in CV_SECTIONS.values() for keyword in keywords],
+                                      whole_words=True)
+
+
+def _pdf_parts(data: bytes) -> Tuple[List[bytes], List[str]]:
+    # Scanned PDFs are mostly embedded JPEG (DCTDecode) pages; text PDFs carry Tj/TJ strings in content streams
+    images, texts = [], []
+    for header, stream in _PDF_STREAM.findall(data):
+        if b'/DCTDecode' in header:
+            images.append(stream)
+            continue
+        if b'/FlateDecode' in header:
+            try:
+                stream = zlib.decompress(stream)
+            except zlib.error:
+                continue
+        for single, array in _PDF_TEXT.findall(stream):
+            strings = [single] if single else _PDF_STRING.findall(array)
+            texts.append(''.join(string.decode('latin-1') for string in strings))
+    return images, texts
+
+
+def _docx_text(path: str) -> str:
+    with zipfile.ZipFile(path) as archive:
+        xml = archive.read('word/document.xml').decode('utf-8', errors='ignore')
+    return re.sub(r'<[^>]+>', ' ', xml.replace('</w:p>', '\n'))
+
+
+@lru_cache(maxsize=1)
+def _tesseract():
+    # OpenCV, Pillow and pytesseract load in the worker processes that decode, not in the API process
+    try:
+        import pytesseract
+    except ImportError:
+        return None
+    return pytesseract
+
+
+def _decode_image(data: bytes) -> Optional[np.ndarray]:
+    import cv2
+
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        # Pillow covers formats OpenCV was built without (e.g. some TIFF/WebP variants)
+        from PIL import Image
+
+        try:
+            image = np.asarray(Image.open(BytesIO(data)).convert('L'))
+        except OSError:
+            return None
+    scale = MAX_IMAGE_SIDE / max(image.shape)
+    if scale < 1:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return image
+
+
+def decode_document(path: str) -> Tuple[List[np.ndarray], List[str]]:
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.docx':
+        try:
+            return [], [_docx_text(path)]
+        except (zipfile.BadZipFile, KeyError):
+            # Not a zip, or a zip without a Word document inside: the upload's fault, not ours
+            raise ValueError('Unreadable CV file')
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if extension == '.pdf' or data[:5] == b'%PDF-':
+        page_images, texts = _pdf_parts(data)
+        return [image for image in map(_decode_image, page_images) if image is not None], texts
+    if extension in IMAGE_EXTENSIONS:
+        image = _decode_image(data)
+        return ([image] if image is not None else []), []
+    return [], [data.decode('utf-8', errors='ignore')]
+
+
+def deskew(image: np.ndarray) -> Tuple[np.ndarray, float]:
+    import cv2
+
+    _, ink = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    points = cv2.findNonZero(ink)
+    if points is None or len(points) < 50:
+        return image, 0.0
+    angle = cv2.minAreaRect(points)[-1]
+    # minAreaRect reports angles in [0, 90); map to the smallest rotation either way
+    if angle > 45:
+        angle -= 90
+    if abs(angle) < 0.5:
+        return image, 0.0
+    height, width = image.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    rotated = cv2.warpAffine(image, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                             borderMode=cv2.BORDER_REPLICATE)
+    return rotated, float(angle)
+
+
+def ocr_prep(image: np.ndarray) -> np.ndarray:
+    import cv2
+
+    image = cv2.medianBlur(image, 3)
+    return cv2.adaptiveThreshold(image, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 15)
+
+
+def score_cv(text: str, pages: int) -> Dict[str, Any]:
+    lowered = text.lower()
+    skills = _skill_automaton.matched_keywords(lowered)
+    found_keywords = set(_section_automaton.matched_keywords(lowered))
+    sections = {section for section, keywords in CV_SECTIONS.items() if found_keywords.intersection(keywords)}
+    if _EMAIL.search(text.encode('utf-8', errors='ignore')):
+        sections.add('contact')
+    words = len(lowered.split())
+
+    improvements = [{'priority': priority, 'message': message}
+                    for section, (priority, message) in SECTION_IMPROVEMENTS.items() if section not in sections]
+    if words < 150:
+        improvements.append({'priority': 'high', 'message': "Your CV is very short; describe your responsibilities and results"})
+    elif words > 1200:
+        improvements.append({'priority': 'medium', 'message': "Keep your CV to two pages by trimming older roles"})
+    if len(skills) < 5:
+        improvements.append({'priority': 'medium', 'message': "Mention more job-specific skills and tools"})
+
+    section_score = 60 * len(sections) / len(CV_SECTIONS)
+    skill_score = 25 * min(len(skills), 10) / 10
+    length_score = 15 if 150 <= words <= 1200 else 5
+    return {
+        'overall_score': int(round(section_score + skill_score + length_score)),
+        'improvements': sorted(improvements, key=lambda item: ('high', 'medium', 'low').index(item['priority'])),
+        'keywords': [{'word': keyword, 'matched': keyword in skills} for keyword in CV_SKILL_KEYWORDS[:12]] +
+                    [{'word': keyword, 'matched': True} for keyword in skills if keyword not in CV_SKILL_KEYWORDS[:12]],
+        'skills': skills,
+        'sections': sorted(sections),
+        'word_count': words,
+        'pages': pages
+    }
+
+
+def analyze_cv_file(path: str) -> Dict[str, Any]:
+    # Runs in a worker process: everything CPU-bound for one CV, with per-stage timings
+    timings = {}
+    start = time.perf_counter()
+    images, texts = decode_document(path)
+    timings['decode'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    angles = []
+    for index, image in enumerate(images):
+        images[index], angle = deskew(image)
+        angles.append(angle)
+    timings['deskew'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    images = [ocr_prep(image) for image in images]
+    timings['ocr_prep'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pytesseract = _tesseract()
+    if pytesseract is not None:
+        texts.extend(pytesseract.image_to_string(image) for image in images)
+    analysis = score_cv('\n'.join(texts), max(len(images), 1))
+    timings['extract'] = time.perf_counter() - start
+
+    analysis['deskew_angles'] = [round(angle, 2) for angle in angles]
+    analysis['ocr_available'] = pytesseract is not None or not images
+    analysis['timings'] = {stage: round(seconds, 6) for stage, seconds in timings.items()}
+    return analysis
+
+
+class CVAnalysisPipeline:
+    def __init__(self, upload_dir: Optional[str] = None, max_workers: Optional[int] = None,
+                 cache_size: int = 1024, max_upload_bytes: int = MAX_UPLOAD_BYTES,
+                 process_pool: Optional[Executor] = None):
+        self.upload_dir = upload_dir or os.path.join(tempfile.gettempdir(), 'jobplatform-cvs')
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.max_upload_bytes = max_upload_bytes
+        self._process_pool = process_pool
+        self._owns_pool = process_pool is None
+        # Results keyed by content hash, so re-uploads of the same CV skip the pool entirely
+        self._cache: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.stage_latency = {stage: LatencyHistogram() for stage in PIPELINE_STAGES + ('upload', 'total')}
+        self.counters = {'analyzed': 0, 'cache_hits': 0, 'deduplicated': 0, 'rejected': 0}
+
+    @property
+    def process_pool(self) -> Executor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._process_pool
+
+    def close(self):
+        if self._owns_pool and self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
+
+    async def save_upload(self, upload, filename: str = '') -> Tuple[str, str, int]:
+        # Streams chunks to a file of its own while hashing. The caller owns the file and deletes it;
+        # a CV is personal information and is kept only while it is being analysed.
+        loop = asyncio.get_running_loop()
+        extension = os.path.splitext(filename or getattr(upload, 'filename', '') or '')[1].lower()
+        digest = hashlib.sha256()
+        size = 0
+        handle = tempfile.NamedTemporaryFile(dir=self.upload_dir, suffix=extension, delete=False)
+        try:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_upload_bytes:
+                    self.counters['rejected'] += 1
+                    raise ValueError(f"CV exceeds the {self.max_upload_bytes // (1 << 20)} MB upload limit")
+                digest.update(chunk)
+                await loop.run_in_executor(None, handle.write, chunk)
+            handle.close()
+            return handle.name, digest.hexdigest(), size
+        except BaseException:
+            handle.close()
+            os.unlink(handle.name)
+            raise
+
+    async def analyze_upload(self, upload, filename: str = '') -> Dict[str, Any]:
+        start = time.perf_counter()
+        path, content_hash, size = await self.save_upload(upload, filename)
+        self.stage_latency['upload'].observe(time.perf_counter() - start)
+        try:
+            result = await self.analyze_path(path, content_hash)
+        finally:
+            # Only the result is cached; a concurrent upload of the same CV waits on this analysis
+            # rather than on this file
+            os.unlink(path)
+        self.stage_latency['total'].observe(time.perf_counter() - start)
+        return {**result, 'content_hash': content_hash, 'size_bytes': size}
+
+    async def analyze_path(self, path: str, content_hash: Optional[str] = None) -> Dict[str, Any]:
+        if content_hash is None:
+            content_hash = await asyncio.get_running_loop().run_in_executor(None, _hash_file, path)
+        cached = self._cache.get(content_hash)
+        if cached is not None:
+            self._cache.move_to_end(content_hash)
+            self.counters['cache_hits'] += 1
+            return {**cached, 'cached': True}
+        in_flight = self._in_flight.get(content_hash)
+        if in_flight is not None:
+            self.counters['deduplicated'] += 1
+            return {**await asyncio.shield(in_flight), 'cached': True}
+
+        future = asyncio.get_running_loop().run_in_executor(self.process_pool, analyze_cv_file, path)
+        self._in_flight[content_hash] = future
+        try:
+            result = await future
+        finally:
+            del self._in_flight[content_hash]
+        self.counters['analyzed'] += 1
+        for stage, seconds in result['timings'].items():
+            self.stage_latency[stage].observe(seconds)
+        self._cache[content_hash] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return {**result, 'cached': False}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            'cached_results': len(self._cache),
+            'stages': {stage: histogram.snapshot() for stage, histogram in self.stage_latency.items()}
+        }
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(UPLOAD_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
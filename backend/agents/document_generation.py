@@ -0,0 +1,137 @@
+import os
+import re
+from html import escape
+from typing import Any, Dict, List, Optional, Union
+
+from agents.cv_analysis import CV_SKILL_KEYWORDS
+from utils.generation_cache import GenerationCache, generation_key
+from utils.keyword_automaton import KeywordAutomaton
+
+# Bump when templates change so cached documents from older templates are not served
+TEMPLATE_VERSION = '1'
+
+# Analysis fields that differ between otherwise identical CVs and must not split the cache
+VOLATILE_CV_FIELDS = {'timings', 'cached', 'content_hash', 'size_bytes', 'deskew_angles', 'ocr_available'}
+CV_KEY_FIELDS = ('name', 'summary', 'experience', 'education', 'skills', 'sections', 'text')
+
+TONE_OPENINGS = {
+    'professional': "I am writing to apply for the {role} position{company}.",
+    'enthusiastic': "I was thrilled to see the {role} opening{company} and would love to join your team!",
+    'formal': "Please accept this letter as my formal application for the position of {role}{company}."
+}
+LENGTH_PARAGRAPHS = {'short': 2, 'medium': 4, 'long': 5}
+INDUSTRY_FOCUS = {
+    'technology': ['python', 'sql', 'aws', 'javascript', 'data analysis'],
+    'finance': ['excel', 'accounting', 'payroll', 'sap', 'pastel'],
+    'healthcare': ['nursing', 'communication', 'teamwork'],
+    'retail': ['customer service', 'sales', 'teamwork'],
+    'logistics': ['logistics', "driver's licence", 'project management']
+}
+
+_skill_automaton = KeywordAutomaton(CV_SKILL_KEYWORDS, whole_words=True)
+_ROLE = re.compile(r"(?:position|role|vacancy|hiring)(?: of| for)?:?\s+(?:an? )?([A-Z][\w&/ -]{2,40}?)(?:[.,\n]| at | in )")
+_COMPANY = re.compile(r"\bat ([A-Z][\w&. -]{1,40}?)(?:[.,\n]| in | is )")
+
+
+def cv_key_parts(cv_data: Union[Dict[str, Any], str, None]) -> Any:
+    if isinstance(cv_data, dict):
+        return {key: value for key, value in cv_data.items() if key not in VOLATILE_CV_FIELDS}
+    return cv_data
+
+
+def _cv_skills(cv_data: Union[Dict[str, Any], str, None]) -> List[str]:
+    if isinstance(cv_data, dict):
+        if cv_data.get('skills'):
+            skills = cv_data['skills']
+            return [skill.strip().lower() for skill in (skills.split(',') if isinstance(skills, str) else skills)]
+        cv_data = ' '.join(str(cv_data.get(field, '')) for field in CV_KEY_FIELDS)
+    return _skill_automaton.matched_keywords(cv_data or '')
+
+
+def _join(items: List[str]) -> str:
+    return items[0] if len(items) == 1 else f"{', '.join(items[:-1])} and {items[-1]}"
+
+
+class DocumentGenerator:
+    def __init__(self, cache: Optional[GenerationCache] = None):
+        self.cache = cache if cache is not None else GenerationCache(
+            max_entries=int(os.environ.get('GENERATION_CACHE_ENTRIES', 2048)),
+            ttl=float(os.environ.get('GENERATION_CACHE_TTL', 86400)),
+            disk_dir=os.environ.get('GENERATION_CACHE_DIR')
+        )
+
+    async def generate_cover_letter(self, job_description: str, cv_data: Union[Dict[str, Any], str, None],
+                                    tone: str = 'professional', length: str = 'medium') -> Dict[str, Any]:
+        key = generation_key('cover_letter', TEMPLATE_VERSION, job_description=job_description,
+                             cv=cv_key_parts(cv_data), tone=tone, length=length)
+        value, source = await self.cache.get_or_create(
+            key, lambda: self.render_cover_letter(job_description, cv_data, tone, length))
+        return {**value, 'cache': source}
+
+    async def optimize_cv(self, original_analysis: Optional[Dict[str, Any]], target_industry: Optional[str] = None,
+                          experience_level: Optional[str] = None) -> Dict[str, Any]:
+        key = generation_key('optimize_cv', TEMPLATE_VERSION, analysis=cv_key_parts(original_analysis or {}),
+                             industry=target_industry, level=experience_level)
+        value, source = await self.cache.get_or_create(
+            key, lambda: self.render_cv_optimization(original_analysis or {}, target_industry, experience_level))
+        return {**value, 'cache': source}
+
+    async def render_cover_letter(self, job_description: str, cv_data: Union[Dict[str, Any], str, None],
+                                  tone: str, length: str) -> Dict[str, Any]:
+        job_description = job_description or ''
+        role_match = _ROLE.search(job_description)
+        company_match = _COMPANY.search(job_description)
+        role = role_match.group(1).strip() if role_match else 'advertised'
+        company = f" at {company_match.group(1).strip()}" if company_match else ''
+        job_skills = _skill_automaton.matched_keywords(job_description.lower())
+        cv_skills = _cv_skills(cv_data)
+        shared = [skill for skill in job_skills if skill in cv_skills]
+        name = cv_data.get('name') if isinstance(cv_data, dict) else None
+
+        paragraphs = [TONE_OPENINGS.get(tone, TONE_OPENINGS['professional']).format(role=role, company=company)]
+        if shared:
+            paragraphs.append(f"My experience with {_join(shared)} matches what you are looking for, "
+                              f"and I have applied these skills to deliver measurable results.")
+        elif cv_skills:
+            paragraphs.append(f"I bring strengths in {_join(cv_skills[:3])} that I am keen to apply in this role.")
+        paragraphs.append("I am a reliable team member who learns quickly and takes ownership of my work.")
+        paragraphs.append("I would welcome the chance to contribute to your team's goals from my first day.")
+        paragraphs = paragraphs[:LENGTH_PARAGRAPHS.get(length, 3) - 1]
+        paragraphs.append("I am available for an interview at your convenience and can start on short notice.")
+
+        content = "Dear Hiring Manager,\n\n" + "\n\n".join(paragraphs) + f"\n\nKind regards,\n{name or '[Your Name]'}"
+        return {
+            'content': content,
+            'relevance_score': int(round(100 * len(shared) / len(job_skills))) if job_skills else 50,
+            'personalization_score': min(100, 40 + 10 * len(shared) + (20 if name else 0) + (10 if company else 0)),
+            'template_version': TEMPLATE_VERSION
+        }
+
+    async def render_cv_optimization(self, analysis: Dict[str, Any], target_industry: Optional[str],
+                                     experience_level: Optional[str]) -> Dict[str, Any]:
+        original = int(analysis.get('overall_score') or 50)
+        skills = _cv_skills(analysis)
+        focus = INDUSTRY_FOCUS.get((target_industry or '').lower(), [])
+        missing = [skill for skill in focus if skill not in skills]
+        fixes = [item['message'] for item in analysis.get('improvements', []) if isinstance(item, dict)]
+
+        ats_score = min(100, original + 5 * len(fixes) + 3 * (len(focus) - len(missing)))
+        readability_score = min(100, 60 + 5 * len(analysis.get('sections', [])) + (10 if experience_level else 0))
+        # The frontend renders preview as HTML, so everything user-supplied is escaped
+        summary = (f"{(experience_level or 'Experienced').title()} candidate"
+                   f"{' in ' + target_industry if target_industry else ''} with strengths in "
+                   f"{', '.join(skills[:4]) or 'communication and teamwork'}.")
+        preview_lines = [f"<p><strong>Professional summary:</strong> {escape(summary)}</p>"]
+        preview_lines += [f"<p>✓ {escape(fix)}</p>" for fix in fixes[:4]]
+        if missing:
+            preview_lines.append(f"<p>Suggested keywords: {escape(', '.join(missing))}</p>")
+        return {
+            'improvement_score': max(ats_score - original, 0),
+            'ats_score': ats_score,
+            'readability_score': readability_score,
+            'preview': ''.join(preview_lines),
+            'template_version': TEMPLATE_VERSION
+        }
+
+    def cache_stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
@@ -0,0 +1,166 @@
+import time
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+COUNT_COLUMNS = ('views', 'likes', 'shares', 'comments', 'click_throughs', 'conversions')
+DEFAULT_WINDOWS = {'1h': 3600, '24h': 86400, '7d': 7 * 86400}
+
+Samples = Union[Sequence[Mapping[str, Any]], Mapping[str, Any]]
+
+
+class EngagementStore:
+    def __init__(self, initial_capacity: int = 4096):
+        self._size = 0
+        self._timestamps = np.empty(initial_capacity, dtype=np.float64)
+        self._platforms = np.empty(initial_capacity, dtype=np.int32)
+        self._campaigns = np.empty(initial_capacity, dtype=np.int32)
+        self._counts = np.empty((initial_capacity, len(COUNT_COLUMNS)), dtype=np.int64)
+        self._spend = np.empty(initial_capacity, dtype=np.float64)
+        # Timestamps usually arrive in order; while they do, windows are a searchsorted slice
+        self._ordered = True
+        self.codes: Dict[str, Dict[str, int]] = {'platform': {}, 'campaign': {}}
+        self.names: Dict[str, List[str]] = {'platform': [], 'campaign': []}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        capacity = len(self._timestamps)
+        if needed <= capacity:
+            return
+        # Starts from 1 so a store created with initial_capacity=0 can still grow
+        capacity = max(capacity, 1)
+        while capacity < needed:
+            capacity *= 2
+        self._timestamps = np.resize(self._timestamps, capacity)
+        self._platforms = np.resize(self._platforms, capacity)
+        self._campaigns = np.resize(self._campaigns, capacity)
+        self._spend = np.resize(self._spend, capacity)
+        counts = np.empty((capacity, len(COUNT_COLUMNS)), dtype=np.int64)
+        counts[:self._size] = self._counts[:self._size]
+        self._counts = counts
+
+    def _encode(self, dimension: str, values: Any, rows: int) -> np.ndarray:
+        if np.isscalar(values):
+            values = [values] * rows
+        values = np.asarray(values)
+        if values.dtype.kind not in 'US':
+            values = values.astype(str)
+        uniques, inverse = np.unique(values, return_inverse=True)
+        codes, names = self.codes[dimension], self.names[dimension]
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for index, value in enumerate(uniques):
+            if value not in codes:
+                codes[value] = len(names)
+                names.append(value)
+            mapping[index] = codes[value]
+        return mapping[inverse]
+
+    @staticmethod
+    def _records_to_columns(records: Sequence[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+        return {
+            column: [record.get(column, default) for record in records]
+            for column, default in (
+                ('timestamp', None), ('platform', 'unknown'), ('campaign', 'organic'), ('spend', 0.0),
+                *((count_column, 0) for count_column in COUNT_COLUMNS)
+            )
+        }
+
+    def ingest(self, samples: Samples, now: Optional[float] = None) -> int:
+        columns = samples if isinstance(samples, Mapping) else self._records_to_columns(samples)
+        rows = next((len(values) for values in columns.values() if not np.isscalar(values) and values is not None), 1)
+        if rows == 0:
+            return 0
+        now = time.time() if now is None else now
+
+        timestamps = columns.get('timestamp')
+        if timestamps is None:
+            timestamps = now
+        elif isinstance(timestamps, list):
+            timestamps = [now if timestamp is None else timestamp for timestamp in timestamps]
+        timestamps = np.broadcast_to(np.asarray(timestamps, dtype=np.float64), (rows,))
+
+        self._reserve(rows)
+        start, end = self._size, self._size + rows
+        self._timestamps[start:end] = timestamps
+        self._platforms[start:end] = self._encode('platform', columns.get('platform', 'unknown'), rows)
+        self._campaigns[start:end] = self._encode('campaign', columns.get('campaign', 'organic'), rows)
+        self._spend[start:end] = columns.get('spend', 0.0)
+        for index, column in enumerate(COUNT_COLUMNS):
+            self._counts[start:end, index] = columns.get(column, 0)
+
+        if self._ordered:
+            previous = self._timestamps[start - 1] if start else -np.inf
+            self._ordered = bool(timestamps[0] >= previous and np.all(np.diff(timestamps) >= 0))
+        self._size = end
+        return rows
+
+    def _window(self, window_seconds: float, now: float) -> Union[slice, np.ndarray]:
+        timestamps = self._timestamps[:self._size]
+        since = now - window_seconds
+        if self._ordered:
+            return slice(np.searchsorted(timestamps, since, side='left'), np.searchsorted(timestamps, now, side='right'))
+        return (timestamps >= since) & (timestamps <= now)
+
+    def aggregate(self, window_seconds: float, now: Optional[float] = None,
+                  by: Tuple[str, ...] = ('platform',)) -> Dict[Any, Dict[str, float]]:
+        now = time.time() if now is None else now
+        selection = self._window(window_seconds, now)
+
+        dimensions = [getattr(self, f"_{dimension}s")[:self._size][selection] for dimension in by]
+        sizes = [max(len(self.names[dimension]), 1) for dimension in by]
+        group = np.zeros(len(dimensions[0]) if dimensions else 0, dtype=np.int64)
+        for codes, size in zip(dimensions, sizes):
+            group = group * size + codes
+        buckets = int(np.prod(sizes))
+
+        samples = np.bincount(group, minlength=buckets)
+        counts = self._counts[:self._size][selection]
+        totals = {
+            column: np.bincount(group, weights=counts[:, index], minlength=buckets)
+            for index, column in enumerate(COUNT_COLUMNS)
+        }
+        totals['spend'] = np.bincount(group, weights=self._spend[:self._size][selection], minlength=buckets)
+        derived = self._derive(totals)
+
+        results = {}
+        for bucket in np.flatnonzero(samples):
+            key, remainder = [], int(bucket)
+            for dimension, size in zip(reversed(by), reversed(sizes)):
+                key.append(self.names[dimension][remainder % size])
+                remainder //= size
+            key = key[0] if len(by) == 1 else tuple(reversed(key))
+            results[key] = {'samples': int(samples[bucket])}
+            results[key].update({name: round(float(values[bucket]), 4) for name, values in totals.items()})
+            results[key].update({name: round(float(values[bucket]), 4) for name, values in derived.items()})
+        return results
+
+    @staticmethod
+    def _derive(totals: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        views = np.maximum(totals['views'], 1)
+        clicks = np.maximum(totals['click_throughs'], 1)
+        conversions = totals['conversions']
+        return {
+            'engagement_rate': (totals['likes'] + totals['shares'] + totals['comments']) / views * 100,
+            'ctr': totals['click_throughs'] / views * 100,
+            'conversion_rate': conversions / clicks * 100,
+            'cost_per_conversion': np.where(conversions > 0, totals['spend'] / np.maximum(conversions, 1), 0.0)
+        }
+
+    def totals(self, window_seconds: float, now: Optional[float] = None) -> Dict[str, float]:
+        now = time.time() if now is None else now
+        selection = self._window(window_seconds, now)
+        counts = self._counts[:self._size][selection].sum(axis=0)
+        totals = {column: np.array([counts[index]]) for index, column in enumerate(COUNT_COLUMNS)}
+        totals['spend'] = np.array([self._spend[:self._size][selection].sum()])
+        summary = {name: float(values[0]) for name, values in totals.items()}
+        summary.update({name: round(float(values[0]), 4) for name, values in self._derive(totals).items()})
+        summary['samples'] = int(len(self._timestamps[:self._size][selection]))
+        return summary
+
+    def rolling(self, windows: Optional[Mapping[str, float]] = None, now: Optional[float] = None,
+                by: Tuple[str, ...] = ('platform',)) -> Dict[str, Dict[Any, Dict[str, float]]]:
+        now = time.time() if now is None else now
+        return {label: self.aggregate(seconds, now, by) for label, seconds in (windows or DEFAULT_WINDOWS).items()}
@@ -0,0 +1,241 @@
+import base64
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from agents.job_matching import resolve_province
+from utils.instrumentation import instrumented
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+MAX_STREAM_SIZE = 10000
+STREAM_CHUNK = 500
+
+_AMOUNT = re.compile(r"\d+(?:\.\d+)?")
+
+# Newest first. Every index ends in the sort key, so a filtered page is one index range scan that
+# stops after `limit` rows; salary_max rides along so the salary filter is checked without a table lookup.
+INDEXES = {
+    'idx_jobs_feed': '(posted_at DESC, id DESC, salary_max)',
+    'idx_jobs_province': '(province, posted_at DESC, id DESC, salary_max)',
+    'idx_jobs_type': '(job_type, posted_at DESC, id DESC, salary_max)',
+    'idx_jobs_province_type': '(province, job_type, posted_at DESC, id DESC, salary_max)'
+}
+
+
+@dataclass(frozen=True)
+class FeedQuery:
+    province: Optional[str] = None
+    job_type: Optional[str] = None
+    min_salary: Optional[float] = None
+    after: Optional[Tuple[float, str]] = None
+    limit: int = DEFAULT_PAGE_SIZE
+
+
+def normalize_job_type(value: Optional[str]) -> Optional[str]:
+    # 'Full-time', 'full time' and 'FULL_TIME' are the same filter
+    if not value:
+        return None
+    return re.sub(r"[\s_]+", '-', value.strip().lower())
+
+
+def salary_range(job: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    low, high = job.get('salary_min'), job.get('salary_max')
+    if low is None and high is None and job.get('salary') is not None:
+        # 'R85,000', 'R40 000 - R60 000'; 'Negotiable' has no range
+        amounts = [float(amount) for amount in _AMOUNT.findall(str(job['salary']).replace(',', '').replace(' ', ''))]
+        if amounts:
+            low, high = min(amounts), max(amounts)
+    low = float(low) if low is not None else None
+    high = float(high) if high is not None else low
+    return low, high
+
+
+def _posted_at(value: Any, now: float) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return now
+
+
+def encode_cursor(posted_at: float, job_id: str) -> str:
+    raw = json.dumps([posted_at, job_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str]:
+    try:
+        posted_at, job_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return float(posted_at), str(job_id)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor') from None
+
+
+class JobFeed:
+    def __init__(self, db_path: Optional[str] = None, max_page_size: int = MAX_PAGE_SIZE,
+                 max_stream_size: int = MAX_STREAM_SIZE):
+        self.max_page_size = max_page_size
+        self.max_stream_size = max_stream_size
+        # One connection shared by the event loop and threadpool handlers; queries are short, so a lock
+        # is cheaper than a connection per thread
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(db_path or os.environ.get('JOB_FEED_DB', ':memory:'), check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            'id TEXT PRIMARY KEY, posted_at REAL NOT NULL, province TEXT, job_type TEXT, '
+            'salary_min REAL, salary_max REAL, payload TEXT NOT NULL)'
+        )
+        for name, columns in INDEXES.items():
+            self.db.execute(f'CREATE INDEX IF NOT EXISTS {name} ON jobs {columns}')
+        # Bumped in the same transaction as every write; ETags derive from it, so a page never needs
+        # to be rendered to be revalidated. Kept in SQLite so workers sharing the file agree.
+        self.db.execute('CREATE TABLE IF NOT EXISTS feed_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+        self.db.execute("INSERT OR IGNORE INTO feed_meta (key, value) VALUES ('version', 0)")
+        self.db.commit()
+        self._normalize_provinces()
+
+    def _normalize_provinces(self):
+        # Feeds written before provinces were stored as slugs hold display names such as 'Gauteng'
+        stale = [(resolve_province(province), province) for province, in
+                 self.db.execute('SELECT DISTINCT province FROM jobs WHERE province IS NOT NULL')
+                 if resolve_province(province) != province]
+        if stale:
+            with self.db:
+                self.db.executemany('UPDATE jobs SET province = ? WHERE province = ?', stale)
+                self._bump_version()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.db.execute('SELECT COUNT(*) FROM jobs').fetchone()[0]
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self.db.execute("SELECT value FROM feed_meta WHERE key = 'version'").fetchone()[0]
+
+    def _bump_version(self):
+        self.db.execute("UPDATE feed_meta SET value = value + 1 WHERE key = 'version'")
+
+    @instrumented('job_feed')
+    def upsert_many(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        now = time.time()
+        rows = []
+        for job in jobs:
+            low, high = salary_range(job)
+            rows.append((
+                str(job['id']), _posted_at(job.get('posted_at'), now),
+                # Stored as the slug query() filters on: 'Western Cape' and 'Cape Town' both become 'western-cape'
+                resolve_province(job.get('province')) or resolve_province(job.get('location')),
+                normalize_job_type(job.get('job_type') or job.get('type')), low, high,
+                # Stored pre-serialized: a page is assembled by joining these strings
+                json.dumps(job, separators=(',', ':'), default=str)
+            ))
+        if not rows:
+            return 0
+        with self._lock, self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO jobs (id, posted_at, province, job_type, salary_min, salary_max, payload) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', rows
+            )
+            self._bump_version()
+        return len(rows)
+
+    def remove(self, job_id: str) -> bool:
+        with self._lock, self.db:
+            removed = self.db.execute('DELETE FROM jobs WHERE id = ?', (str(job_id),)).rowcount > 0
+            if removed:
+                self._bump_version()
+        return removed
+
+    def query(self, province: Optional[str] = None, job_type: Optional[str] = None,
+              min_salary: Optional[float] = None, cursor: Optional[str] = None,
+              limit: Optional[int] = None, stream: bool = False) -> FeedQuery:
+        if province and resolve_province(province) is None:
+            raise ValueError(f"Unknown province '{province}'")
+        if min_salary is not None and min_salary < 0:
+            raise ValueError('min_salary must not be negative')
+        ceiling = self.max_stream_size if stream else self.max_page_size
+        limit = ceiling if stream and limit is None else limit or DEFAULT_PAGE_SIZE
+        return FeedQuery(
+            province=resolve_province(province) if province else None,
+            job_type=normalize_job_type(job_type),
+            min_salary=min_salary or None,
+            after=decode_cursor(cursor) if cursor else None,
+            limit=max(1, min(limit, ceiling))
+        )
+
+    def etag(self, query: FeedQuery, variant: str = 'json') -> str:
+        key = json.dumps([self.version, variant, query.province, query.job_type, query.min_salary,
+                          query.after, query.limit], separators=(',', ':'))
+        return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+    def _rows(self, query: FeedQuery, after: Optional[Tuple[float, str]], limit: int) -> List[Tuple[float, str, str]]:
+        clauses, params = [], []
+        if query.province:
+            clauses.append('province = ?')
+            params.append(query.province)
+        if query.job_type:
+            clauses.append('job_type = ?')
+            params.append(query.job_type)
+        if query.min_salary:
+            clauses.append('salary_max >= ?')
+            params.append(query.min_salary)
+        if after:
+            # Keyset: continue strictly after the last row served, however deep the page is
+            clauses.append('(posted_at, id) < (?, ?)')
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self._lock:
+            return self.db.execute(
+                f'SELECT posted_at, id, payload FROM jobs {where} ORDER BY posted_at DESC, id DESC LIMIT ?',
+                (*params, limit)
+            ).fetchall()
+
+    def page(self, query: FeedQuery) -> Dict[str, Any]:
+        rows = self._rows(query, query.after, query.limit + 1)
+        next_cursor = encode_cursor(*rows[query.limit - 1][:2]) if len(rows) > query.limit else None
+        return {'jobs': [json.loads(row[2]) for row in rows[:query.limit]], 'next_cursor': next_cursor,
+                'has_more': next_cursor is not None}
+
+    @instrumented('job_feed')
+    def render_page(self, query: FeedQuery) -> bytes:
+        # Same shape as page() wrapped in the API envelope, without decoding and re-encoding each job
+        rows = self._rows(query, query.after, query.limit + 1)
+        next_cursor = encode_cursor(*rows[query.limit - 1][:2]) if len(rows) > query.limit else None
+        return ''.join((
+            '{"success":true,"data":{"jobs":[', ','.join(row[2] for row in rows[:query.limit]),
+            '],"next_cursor":', json.dumps(next_cursor), ',"has_more":', 'true' if next_cursor else 'false', '}}'
+        )).encode()
+
+    def iter_ndjson(self, query: FeedQuery) -> Iterator[bytes]:
+        # One job per line, read in keyset chunks so memory stays flat however many rows match.
+        # When rows remain past the limit, a final {"next_cursor": ...} line says where to resume.
+        after, remaining = query.after, query.limit
+        while remaining > 0:
+            rows = self._rows(query, after, min(STREAM_CHUNK, remaining) + 1)
+            served = rows[:min(STREAM_CHUNK, remaining)]
+            if served:
+                yield ('\n'.join(row[2] for row in served) + '\n').encode()
+                after = served[-1][:2]
+                remaining -= len(served)
+            if len(rows) <= len(served):
+                return
+        yield (json.dumps({'next_cursor': encode_cursor(*after)}) + '\n').encode()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,417 @@
+import math
+import re
+import threading
+import zlib
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+HASH_FEATURES = 1 << 18
+MAX_CANDIDATES = 20000
+
+PROVINCE_ALIASES = {
+    'gauteng': 'gauteng', 'gp': 'gauteng',
+    'western cape': 'western-cape', 'western-cape': 'western-cape', 'wc': 'western-cape',
+    'kwazulu-natal': 'kzn', 'kwazulu natal': 'kzn', 'kzn': 'kzn',
+    'eastern cape': 'eastern-cape', 'eastern-cape': 'eastern-cape',
+    'free state': 'free-state', 'free-state': 'free-state',
+    'mpumalanga': 'mpumalanga', 'limpopo': 'limpopo',
+    'north west': 'north-west', 'north-west': 'north-west',
+    'northern cape': 'northern-cape', 'northern-cape': 'northern-cape'
+}
+CITY_PROVINCES = {
+    'johannesburg': 'gauteng', 'pretoria': 'gauteng', 'sandton': 'gauteng', 'randburg': 'gauteng',
+    'centurion': 'gauteng', 'cape town': 'western-cape', 'stellenbosch': 'western-cape', 'paarl': 'western-cape',
+    'worcester': 'western-cape', 'durban': 'kzn', 'pietermaritzburg': 'kzn', 'ballito': 'kzn',
+    'richards bay': 'kzn', 'port elizabeth': 'eastern-cape', 'gqeberha': 'eastern-cape',
+    'east london': 'eastern-cape', 'grahamstown': 'eastern-cape', 'bloemfontein': 'free-state',
+    'welkom': 'free-state', 'bethlehem': 'free-state', 'nelspruit': 'mpumalanga', 'mbombela': 'mpumalanga',
+    'witbank': 'mpumalanga', 'middleburg': 'mpumalanga', 'polokwane': 'limpopo', 'modimolle': 'limpopo',
+    'phalaborwa': 'limpopo', 'mahikeng': 'north-west', 'rustenburg': 'north-west',
+    'potchefstroom': 'north-west', 'kimberley': 'northern-cape', 'upington': 'northern-cape',
+    'springbok': 'northern-cape'
+}
+EXPERIENCE_LEVELS = {'entry': 0, 'graduate': 0, 'junior': 1, 'intermediate': 3, 'mid': 3, 'senior': 5,
+                     'lead': 7, 'manager': 7, 'executive': 10}
+
+# Weights of each signal in match_score
+SCORE_WEIGHTS = {'skills': 0.45, 'text': 0.2, 'salary': 0.15, 'experience': 0.1, 'industry': 0.1}
+
+_TOKEN = re.compile(r"[a-z0-9+#.]+")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)?")
+
+
+def normalize_skills(skills: Union[str, Iterable[str], None]) -> List[str]:
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    return sorted({skill.strip().lower() for skill in skills if skill and skill.strip()})
+
+
+def resolve_province(location: Optional[str]) -> Optional[str]:
+    if not location:
+        return None
+    location = location.lower()
+    for part in [location] + [part.strip() for part in location.split(',')]:
+        if part in PROVINCE_ALIASES:
+            return PROVINCE_ALIASES[part]
+        if part in CITY_PROVINCES:
+            return CITY_PROVINCES[part]
+    return None
+
+
+def parse_amount(value: Any) -> Optional[float]:
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER.search(str(value).replace(' ', '').replace(',', ''))
+    return float(match.group()) if match else None
+
+
+def parse_experience(value: Any) -> Optional[float]:
+    if isinstance(value, str) and value.strip().lower() in EXPERIENCE_LEVELS:
+        return float(EXPERIENCE_LEVELS[value.strip().lower()])
+    return parse_amount(value)
+
+
+def format_salary(salary_min: float, salary_max: float) -> str:
+    if salary_min and salary_max > salary_min:
+        return f"R{salary_min:,.0f} - R{salary_max:,.0f}"
+    if salary_min or salary_max:
+        return f"R{max(salary_min, salary_max):,.0f}"
+    return 'Negotiable'
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature(token: str) -> int:
+    return zlib.crc32(token.encode()) & (HASH_FEATURES - 1)
+
+
+def hashed_features(text: str):
+    counts = Counter(map(_feature, _TOKEN.findall(text.lower())))
+    indices = np.fromiter(counts.keys(), dtype=np.int32, count=len(counts))
+    weights = np.fromiter((1.0 + math.log(count) for count in counts.values()), dtype=np.float32, count=len(counts))
+    return indices, weights
+
+
+class _Postings:
+    # Append-only slot list; entries whose slot generation has moved on are dead and get compacted lazily
+    __slots__ = ('slots', 'generations', 'size', 'dead')
+
+    def __init__(self):
+        self.slots = np.empty(8, dtype=np.int32)
+        self.generations = np.empty(8, dtype=np.int32)
+        self.size = 0
+        self.dead = 0
+
+    def __len__(self) -> int:
+        return self.size - self.dead
+
+    def append(self, slot: int, generation: int):
+        if self.size == len(self.slots):
+            self.slots = np.resize(self.slots, 2 * self.size)
+            self.generations = np.resize(self.generations, 2 * self.size)
+        self.slots[self.size] = slot
+        self.generations[self.size] = generation
+        self.size += 1
+
+    def live(self, current_generations: np.ndarray) -> np.ndarray:
+        slots = self.slots[:self.size]
+        if not self.dead:
+            return slots
+        keep = current_generations[slots] == self.generations[:self.size]
+        if self.dead * 2 < self.size:
+            return slots[keep]
+        size = int(keep.sum())
+        self.slots[:size] = slots[keep]
+        self.generations[:size] = self.generations[:self.size][keep]
+        self.size, self.dead = size, 0
+        return self.slots[:size]
+
+
+class JobMatchingEngine:
+    def __init__(self, initial_capacity: int = 1024, max_candidates: int = MAX_CANDIDATES):
+        self.max_candidates = max_candidates
+        self._lock = threading.RLock()
+        self._jobs: List[Optional[Dict[str, Any]]] = []
+        self._slot_by_id: Dict[str, int] = {}
+        self._free_slots: List[int] = []
+        self._capacity = 0
+        self._salary_min = np.zeros(0, dtype=np.float32)
+        self._salary_max = np.zeros(0, dtype=np.float32)
+        self._experience = np.zeros(0, dtype=np.float32)
+        self._province = np.zeros(0, dtype=np.int16)
+        self._industry = np.zeros(0, dtype=np.int32)
+        self._active = np.zeros(0, dtype=bool)
+        self._generation = np.zeros(0, dtype=np.int32)
+        # Order in which slots were (re)indexed; breaks overlap ties so truncation keeps the newest jobs
+        self._indexed_at = np.zeros(0, dtype=np.int64)
+        self._sequence = 0
+        # Inverted indexes from skill / province code to job slots
+        self._skill_index: Dict[str, _Postings] = {}
+        self._province_index: Dict[int, _Postings] = {}
+        self._province_codes: Dict[str, int] = {}
+        self._industry_codes: Dict[str, int] = {}
+        # Hashed TF features for every slot live in shared flat arrays (CSR without the matrix)
+        self._feature_start = np.zeros(0, dtype=np.int64)
+        self._feature_count = np.zeros(0, dtype=np.int32)
+        self._doc_norm = np.ones(0, dtype=np.float32)
+        self._feature_index = np.zeros(0, dtype=np.int32)
+        self._feature_weight = np.zeros(0, dtype=np.float32)
+        self._feature_used = 0
+        self._feature_live = 0
+        self._doc_freq = np.zeros(HASH_FEATURES, dtype=np.int32)
+        self._query_buffer = np.zeros(HASH_FEATURES, dtype=np.float32)
+        self._grow_slots(initial_capacity)
+
+    def __len__(self) -> int:
+        return len(self._slot_by_id)
+
+    def _grow_slots(self, capacity: int):
+        if capacity <= self._capacity:
+            return
+        for name in ('_salary_min', '_salary_max', '_experience', '_province', '_industry', '_active', '_generation',
+                     '_indexed_at', '_feature_start', '_feature_count', '_doc_norm'):
+            current = getattr(self, name)
+            grown = np.zeros(capacity, dtype=current.dtype)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
+        self._capacity = capacity
+
+    def _append_features(self, indices: np.ndarray, weights: np.ndarray) -> int:
+        needed = self._feature_used + len(indices)
+        if needed > len(self._feature_index):
+            size = max(needed, 2 * len(self._feature_index), 4096)
+            self._feature_index = np.resize(self._feature_index, size)
+            self._feature_weight = np.resize(self._feature_weight, size)
+        start = self._feature_used
+        self._feature_index[start:needed] = indices
+        self._feature_weight[start:needed] = weights
+        self._feature_used = needed
+        self._feature_live += len(indices)
+        return start
+
+    def _compact_features(self):
+        slots = np.flatnonzero(self._active)
+        counts = self._feature_count[slots].astype(np.int64)
+        positions = self._gather_positions(self._feature_start[slots], counts)
+        self._feature_index = self._feature_index[positions].copy()
+        self._feature_weight = self._feature_weight[positions].copy()
+        self._feature_start[slots] = np.cumsum(counts) - counts
+        self._feature_used = self._feature_live = len(positions)
+
+    @staticmethod
+    def _gather_positions(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        total = int(counts.sum())
+        offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.repeat(starts, counts) + offsets
+
+    def _code(self, table: Dict[str, int], value: Optional[str]) -> int:
+        if not value:
+            return -1
+        value = value.strip().lower()
+        if value not in table:
+            table[value] = len(table)
+        return table[value]
+
+    def add_job(self, job: Dict[str, Any]):
+        self.add_jobs([job])
+
+    def add_jobs(self, jobs: Iterable[Dict[str, Any]]) -> int:
+        added = 0
+        with self._lock:
+            for job in jobs:
+                job_id = str(job['id'])
+                if job_id in self._slot_by_id:
+                    self._remove_slot(self._slot_by_id.pop(job_id))
+                if self._free_slots:
+                    slot = self._free_slots.pop()
+                else:
+                    slot = len(self._jobs)
+                    self._jobs.append(None)
+                    if slot >= self._capacity:
+                        self._grow_slots(max(2 * self._capacity, 1024))
+
+                skills = normalize_skills(job.get('skills'))
+                province = resolve_province(job.get('province')) or resolve_province(job.get('location'))
+                province_code = self._code(self._province_codes, province)
+                stored = {**job, 'id': job_id, 'skills': skills, 'province': province}
+                self._jobs[slot] = stored
+                self._slot_by_id[job_id] = slot
+
+                salary_min = parse_amount(job.get('salary_min', job.get('salary')))
+                salary_max = parse_amount(job.get('salary_max')) or salary_min
+                self._salary_min[slot] = salary_min or 0.0
+                self._salary_max[slot] = salary_max or 0.0
+                self._experience[slot] = parse_experience(job.get('experience_min')) or 0.0
+                self._province[slot] = province_code
+                self._industry[slot] = self._code(self._industry_codes, job.get('industry'))
+                self._active[slot] = True
+                self._sequence += 1
+                self._indexed_at[slot] = self._sequence
+                generation = int(self._generation[slot])
+                for skill in skills:
+                    postings = self._skill_index.get(skill)
+                    if postings is None:
+                        postings = self._skill_index[skill] = _Postings()
+                    postings.append(slot, generation)
+                if province_code >= 0:
+                    postings = self._province_index.get(province_code)
+                    if postings is None:
+                        postings = self._province_index[province_code] = _Postings()
+                    postings.append(slot, generation)
+
+                text = ' '.join([str(job.get('title', '')), str(job.get('description', '')), ' '.join(skills)])
+                indices, weights = hashed_features(text)
+                self._feature_start[slot] = self._append_features(indices, weights)
+                self._feature_count[slot] = len(indices)
+                self._doc_norm[slot] = float(np.sqrt(np.dot(weights, weights))) or 1.0
+                self._doc_freq[indices] += 1
+                added += 1
+        return added
+
+    def remove_job(self, job_id: str) -> bool:
+        with self._lock:
+            slot = self._slot_by_id.pop(str(job_id), None)
+            if slot is None:
+                return False
+            self._remove_slot(slot)
+            if self._feature_used > 1024 and self._feature_live * 2 < self._feature_used:
+                self._compact_features()
+            return True
+
+    def _remove_slot(self, slot: int):
+        job = self._jobs[slot]
+        for skill in job['skills']:
+            postings = self._skill_index[skill]
+            postings.dead += 1
+            if not len(postings):
+                del self._skill_index[skill]
+        if self._province[slot] >= 0:
+            self._province_index[int(self._province[slot])].dead += 1
+        self._generation[slot] += 1
+        start, count = self._feature_start[slot], self._feature_count[slot]
+        self._doc_freq[self._feature_index[start:start + count]] -= 1
+        self._feature_live -= int(count)
+        self._feature_count[slot] = 0
+        self._active[slot] = False
+        self._jobs[slot] = None
+        self._free_slots.append(slot)
+
+    def _candidates(self, skills: List[str], province_code: Optional[int]):
+        generations = self._generation
+        postings = [self._skill_index[skill].live(generations) for skill in skills if skill in self._skill_index]
+        if postings:
+            # Overlap per slot is a bincount over the union of postings; no sort needed
+            overlap = np.bincount(np.concatenate(postings), minlength=len(self._jobs))
+            if province_code is not None:
+                overlap[self._province[:len(overlap)] != province_code] = 0
+            candidates = np.flatnonzero(overlap)
+            overlap = overlap[candidates]
+        else:
+            if province_code is not None:
+                candidates = self._province_index[province_code].live(generations).astype(np.int64)
+            else:
+                candidates = np.flatnonzero(self._active)
+            overlap = np.zeros(len(candidates), dtype=np.int64)
+
+        if len(candidates) > self.max_candidates:
+            # Highest overlap first, most recently indexed among equals. Without skills every overlap is 0,
+            # so the candidates kept are the newest listings rather than an arbitrary subset.
+            rank = (overlap.astype(np.int64) << 40) | self._indexed_at[candidates]
+            keep = np.argpartition(-rank, self.max_candidates - 1)[:self.max_candidates]
+            candidates, overlap = candidates[keep], overlap[keep]
+        return candidates, overlap
+
+    def _text_scores(self, candidates: np.ndarray, query_text: str) -> np.ndarray:
+        indices, weights = hashed_features(query_text)
+        if not len(indices) or not len(candidates):
+            return np.zeros(len(candidates), dtype=np.float32)
+        idf = np.log((1.0 + len(self)) / (1.0 + self._doc_freq[indices])) + 1.0
+        query_weights = (weights * idf).astype(np.float32)
+        query_norm = float(np.sqrt(np.dot(query_weights, query_weights))) or 1.0
+
+        counts = self._feature_count[candidates].astype(np.int64)
+        positions = self._gather_positions(self._feature_start[candidates], counts)
+        rows = np.repeat(np.arange(len(candidates)), counts)
+        buffer = self._query_buffer
+        buffer[indices] = query_weights
+        try:
+            contributions = self._feature_weight[positions] * buffer[self._feature_index[positions]]
+        finally:
+            buffer[indices] = 0.0
+        dots = np.bincount(rows, weights=contributions, minlength=len(candidates))
+        return (dots / (self._doc_norm[candidates] * query_norm)).astype(np.float32)
+
+    def search(self, query: Dict[str, Any], top_k: int = 20) -> List[Dict[str, Any]]:
+        skills = normalize_skills(query.get('skills'))
+        province = resolve_province(query.get('location'))
+        industry = (query.get('industry') or '').strip().lower()
+        salary = parse_amount(query.get('salary_expectation'))
+        experience = parse_experience(query.get('experience'))
+
+        with self._lock:
+            province_code = self._province_codes.get(province) if province else None
+            if province and province_code is None:
+                return []
+            candidates, overlap = self._candidates(skills, province_code)
+            if not len(candidates):
+                return []
+
+            skill_score = overlap / max(len(skills), 1)
+            text_score = self._text_scores(candidates, ' '.join(skills + [industry]))
+            salary_max = self._salary_max[candidates]
+            if salary:
+                salary_score = np.where(salary_max >= salary, 1.0, np.clip(salary_max / salary, 0.0, 1.0))
+                salary_score = np.where(salary_max > 0, salary_score, 0.5)
+            else:
+                salary_score = np.full(len(candidates), 0.5)
+            required = self._experience[candidates]
+            if experience is not None:
+                experience_score = np.where(required <= experience, 1.0, experience / np.maximum(required, 1.0))
+            else:
+                experience_score = np.full(len(candidates), 0.5)
+            industry_code = self._industry_codes.get(industry, -2) if industry else -2
+            industry_score = (self._industry[candidates] == industry_code).astype(np.float64)
+
+            scores = 100 * (SCORE_WEIGHTS['skills'] * skill_score + SCORE_WEIGHTS['text'] * text_score
+                            + SCORE_WEIGHTS['salary'] * salary_score + SCORE_WEIGHTS['experience'] * experience_score
+                            + SCORE_WEIGHTS['industry'] * industry_score)
+            top_k = min(top_k, len(candidates))
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+            best = best[np.argsort(-scores[best], kind='stable')]
+            return [self._describe(int(candidates[index]), float(scores[index]), skills, province,
+                                   industry_score[index] > 0, salary, salary_score[index], experience,
+                                   experience_score[index])
+                    for index in best]
+
+    def _describe(self, slot: int, score: float, skills: List[str], province: Optional[str], industry_match: bool,
+                  salary: Optional[float], salary_score: float, experience: Optional[float],
+                  experience_score: float) -> Dict[str, Any]:
+        job = self._jobs[slot]
+        reasons = []
+        matched = [skill for skill in skills if skill in job['skills']]
+        if matched:
+            reasons.append(f"Matches {len(matched)} of your skills: {', '.join(matched[:5])}")
+        if province:
+            reasons.append(f"Located in {job.get('location') or province}")
+        if salary and salary_score >= 1.0:
+            reasons.append("Salary meets your expectation")
+        if experience is not None and experience_score >= 1.0:
+            reasons.append("Your experience meets the requirement")
+        if industry_match:
+            reasons.append(f"{job.get('industry')} industry match")
+        salary_min, salary_max = self._salary_min[slot], self._salary_max[slot]
+        return {
+            'id': job['id'],
+            'title': job.get('title'),
+            'company': job.get('company'),
+            'location': job.get('location') or job.get('province'),
+            'salary': job.get('salary') or format_salary(salary_min, salary_max),
+            'match_score': int(round(min(score, 100.0))),
+            'match_reasons': reasons
+        }
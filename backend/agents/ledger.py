@@ -0,0 +1,303 @@
+import os
+import struct
+import threading
+import time
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+# Fixed-width little-endian record: timestamp, amount and fee in cents, kind, method/account code,
+# status, padding, reference. The numpy dtype mirrors the struct so the file can be mapped directly.
+RECORD = struct.Struct('<dqqBBB5x16s')
+LEDGER_DTYPE = np.dtype([('timestamp', '<f8'), ('amount', '<i8'), ('fee', '<i8'), ('kind', 'u1'),
+                         ('code', 'u1'), ('status', 'u1'), ('pad', 'V5'), ('reference', 'S16')])
+HEADER = b'JPLEDG01' + struct.pack('<II', RECORD.size, 0)
+
+KIND_PAYMENT = 1
+KIND_PAYOUT = 2
+KIND_REFUND = 3
+STATUS_FAILED = 0
+STATUS_OK = 1
+SCAN_CHUNK = 65536
+
+Timestamp = Union[float, date]
+
+
+def to_cents(amount: float) -> int:
+    return int(round(amount * 100))
+
+
+def _epoch(value: Optional[Timestamp]) -> Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return time.mktime(value.timetuple())
+
+
+def week_of(days: Union[int, np.ndarray]):
+    # Monday-start weeks counted from the week containing 1970-01-01 (a Thursday)
+    return (days + 3) // 7
+
+
+class WeeklyTotals:
+    __slots__ = ('index', 'weeks', 'amount', 'fees', 'count')
+
+    def __init__(self):
+        self.index: Dict[int, int] = {}
+        self.weeks = array('q')
+        self.amount = array('q')
+        self.fees = array('q')
+        self.count = array('q')
+
+    def _slot(self, week: int) -> int:
+        slot = self.index.get(week)
+        if slot is None:
+            slot = self.index[week] = len(self.weeks)
+            self.weeks.append(week)
+            self.amount.append(0)
+            self.fees.append(0)
+            self.count.append(0)
+        return slot
+
+    def add(self, week: int, amount: int, fee: int):
+        slot = self._slot(week)
+        self.amount[slot] += amount
+        self.fees[slot] += fee
+        self.count[slot] += 1
+
+    def add_many(self, weeks: np.ndarray, amounts: np.ndarray, fees: np.ndarray):
+        if not len(weeks):
+            return
+        # Week numbers span a small dense range, so bincount beats sorting for unique()
+        first = int(weeks.min())
+        offsets = weeks - first
+        amount_sums = np.bincount(offsets, weights=amounts)
+        fee_sums = np.bincount(offsets, weights=fees)
+        counts = np.bincount(offsets)
+        for position in np.flatnonzero(counts).tolist():
+            slot = self._slot(first + position)
+            self.amount[slot] += int(amount_sums[position])
+            self.fees[slot] += int(fee_sums[position])
+            self.count[slot] += int(counts[position])
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        epoch = date(1970, 1, 1)
+        return {
+            (epoch + timedelta(days=week * 7 - 3)).isoformat(): {
+                'amount': self.amount[slot] / 100,
+                'fees': self.fees[slot] / 100,
+                'count': self.count[slot]
+            }
+            for week, slot in sorted(self.index.items())
+        }
+
+
+class Ledger:
+    def __init__(self, path: str, flush_every: int = 1024, durable: bool = False):
+        self.path = path
+        self.flush_every = flush_every
+        self.durable = durable
+        self._lock = threading.Lock()
+        self._pending = bytearray()
+        self._pending_count = 0
+        self._map: Optional[np.memmap] = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a+b')
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        if size == 0:
+            self._file.write(HEADER)
+            self._file.flush()
+            size = len(HEADER)
+        else:
+            self._file.seek(0)
+            if self._file.read(len(HEADER)) != HEADER:
+                raise ValueError(f"{path} is not a ledger file")
+        # A torn final record from a crash mid-write is dropped
+        count = (size - len(HEADER)) // RECORD.size
+        if size != len(HEADER) + count * RECORD.size:
+            self._file.truncate(len(HEADER) + count * RECORD.size)
+        self._file.seek(0, os.SEEK_END)
+
+        # Count, ordering and weekly totals cover the file as far as this process has read it (_count records);
+        # records other processes append are folded in by _absorb as they are seen
+        self._count = 0
+        self._ordered = True
+        self._last_timestamp = float('-inf')
+        self.weekly: Dict[int, WeeklyTotals] = {KIND_PAYMENT: WeeklyTotals(), KIND_PAYOUT: WeeklyTotals(),
+                                               KIND_REFUND: WeeklyTotals()}
+        self._absorb(count)
+
+    def __len__(self) -> int:
+        return self._count + self._pending_count
+
+    def _summarise(self, records: np.ndarray):
+        if not len(records):
+            return
+        # Column views only; selecting whole 48-byte records would copy the file
+        weeks = week_of(np.floor(records['timestamp'] / 86400).astype(np.int64))
+        ok = records['status'] == STATUS_OK
+        kinds, amounts, fees = records['kind'], records['amount'], records['fee']
+        for kind, totals in self.weekly.items():
+            selected = ok & (kinds == kind)
+            totals.add_many(weeks[selected], amounts[selected], fees[selected])
+
+    def _view(self) -> np.ndarray:
+        if self._map is None or len(self._map) != self._count:
+            self._map = np.memmap(self.path, dtype=LEDGER_DTYPE, mode='r', offset=len(HEADER), shape=(self._count,))
+        return self._map
+
+    def _absorb(self, count: int):
+        # Folds in records [_count, count), written by other processes sharing the file
+        if count <= self._count:
+            return
+        start, self._count = self._count, count
+        records = self._view()[start:]
+        self._track(records['timestamp'])
+        self._summarise(records)
+
+    def _refresh_locked(self):
+        size = os.fstat(self._file.fileno()).st_size
+        self._absorb((size - len(HEADER)) // RECORD.size)
+
+    def _track(self, timestamps: np.ndarray):
+        if self._ordered:
+            self._ordered = bool(timestamps[0] >= self._last_timestamp and np.all(np.diff(timestamps) >= 0))
+        self._last_timestamp = max(self._last_timestamp, float(timestamps.max()))
+
+    def append(self, kind: int, amount: float, timestamp: Optional[float] = None, fee: float = 0.0,
+               code: int = 0, status: int = STATUS_OK, reference: bytes = b'') -> int:
+        timestamp = time.time() if timestamp is None else timestamp
+        amount_cents, fee_cents = to_cents(amount), to_cents(fee)
+        with self._lock:
+            self._pending += RECORD.pack(timestamp, amount_cents, fee_cents, kind, code, status, reference[:16])
+            self._pending_count += 1
+            position = len(self) - 1
+            if status == STATUS_OK and kind in self.weekly:
+                self.weekly[kind].add(week_of(int(timestamp // 86400)), amount_cents, fee_cents)
+            if self._pending_count >= self.flush_every:
+                self._flush_locked()
+        return position
+
+    def append_many(self, records: np.ndarray) -> int:
+        records = np.ascontiguousarray(records, dtype=LEDGER_DTYPE)
+        if not len(records):
+            return 0
+        with self._lock:
+            self._flush_locked()
+            self._write_locked(records.tobytes(), records)
+            self._summarise(records)
+        return len(records)
+
+    def _sync(self):
+        self._file.flush()
+        if self.durable:
+            os.fsync(self._file.fileno())
+
+    def _write_locked(self, data: bytes, records: np.ndarray):
+        self._file.write(data)
+        self._sync()
+        # The file is opened for append, so the write lands after anything other processes appended
+        # since we last looked; those records sit between _count and the start of ours
+        end = self._file.tell()
+        self._absorb((end - len(data) - len(HEADER)) // RECORD.size)
+        self._count += len(records)
+        self._track(records['timestamp'])
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        # Weekly totals already include these; append() counts them as they arrive
+        self._write_locked(self._pending, np.frombuffer(self._pending, dtype=LEDGER_DTYPE))
+        self._pending = bytearray()
+        self._pending_count = 0
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+            self._refresh_locked()
+
+    def records(self, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        # Read-only view over the mapped file; remapped only when it has grown
+        self.flush()
+        if not self._count:
+            return np.zeros(0, dtype=LEDGER_DTYPE)
+        return self._view()[start:end]
+
+    def between(self, since: Optional[Timestamp] = None, until: Optional[Timestamp] = None) -> np.ndarray:
+        records = self.records()
+        since, until = _epoch(since), _epoch(until)
+        timestamps = records['timestamp']
+        if self._ordered:
+            low = 0 if since is None else int(np.searchsorted(timestamps, since, side='left'))
+            high = len(records) if until is None else int(np.searchsorted(timestamps, until, side='left'))
+            return records[low:high]
+        mask = np.ones(len(records), dtype=bool)
+        if since is not None:
+            mask &= timestamps >= since
+        if until is not None:
+            mask &= timestamps < until
+        return records[mask]
+
+    def latest(self, kind: int, limit: int) -> np.ndarray:
+        # The last `limit` records of one kind, oldest first. Walks back from the end in chunks so rare
+        # kinds such as payouts cost a scan of the recent tail rather than of the whole file.
+        records = self.records()
+        found = []
+        remaining, end = limit, len(records)
+        while remaining > 0 and end > 0:
+            start = max(0, end - SCAN_CHUNK)
+            positions = np.flatnonzero(records['kind'][start:end] == kind)[-remaining:]
+            if len(positions):
+                found.append(positions + start)
+                remaining -= len(positions)
+            end = start
+        if not found:
+            return records[:0]
+        return records[np.concatenate(found[::-1])]
+
+    def totals(self, since: Optional[Timestamp] = None, until: Optional[Timestamp] = None,
+               kind: int = KIND_PAYMENT) -> Dict[str, Any]:
+        records = self.between(since, until)
+        selected = (records['kind'] == kind) & (records['status'] == STATUS_OK)
+        return {
+            'amount': int(records['amount'][selected].sum()) / 100,
+            'fees': int(records['fee'][selected].sum()) / 100,
+            'count': int(selected.sum()),
+            'failed': int(((records['kind'] == kind) & (records['status'] == STATUS_FAILED)).sum())
+        }
+
+    def weekly_totals(self, kind: int = KIND_PAYMENT) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            self._refresh_locked()
+        return self.weekly[kind].as_dict()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._map = None
+            self._file.close()
+
+
+_ledger: Optional[Ledger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_ledger() -> Ledger:
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                path = os.environ.get('JOBPLATFORM_LEDGER_PATH',
+                                      os.path.join(os.path.expanduser('~'), '.jobplatform', 'ledger.bin'))
+                # The process-wide ledger books real money, so every flush reaches the disk
+                _ledger = Ledger(path, durable=True)
+    return _ledger
+
+
+def set_ledger(ledger: Optional[Ledger]):
+    global _ledger
+    _ledger = ledger
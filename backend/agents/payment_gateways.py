@@ -0,0 +1,138 @@
+import asyncio
+import random
+import secrets
+import time
+from typing import Any, Dict, Optional
+
+from utils.http_pool import HttpPool, client_errors, get_http_pool
+from utils.rate_limit import parse_retry_after
+from utils.stats import LatencyHistogram
+
+GATEWAY_ENDPOINTS = {
+    'payfast': 'https://www.payfast.co.za/eng/process',
+    'eft': 'https://api.ozow.com/PostPaymentRequest',
+    'credit_card': 'https://api.peachpayments.com/v1/payments'
+}
+# Concurrent requests allowed per gateway
+GATEWAY_CONCURRENCY = {'payfast': 32, 'eft': 16, 'credit_card': 32}
+# Fee percentage charged by each gateway (see PaymentProcessor.get_payment_methods)
+GATEWAY_FEES = {'payfast': 3.5, 'eft': 0.0, 'credit_card': 2.9}
+
+class GatewayUnavailable(Exception):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class PaymentGateway:
+    name = 'gateway'
+
+    def __init__(self, endpoint: Optional[str] = None, http_pool: Optional[HttpPool] = None,
+                 max_concurrency: Optional[int] = None, simulate: bool = True, max_retries: int = 3,
+                 backoff_base: float = 0.2, backoff_cap: float = 10.0, rng: Optional[random.Random] = None):
+        self.endpoint = endpoint or GATEWAY_ENDPOINTS.get(self.name)
+        self.http_pool = http_pool or get_http_pool()
+        self.simulate = simulate
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.fee_percentage = GATEWAY_FEES.get(self.name, 0.0)
+        self._concurrency = asyncio.Semaphore(max_concurrency or GATEWAY_CONCURRENCY.get(self.name, 16))
+        self._rng = rng or secrets.SystemRandom()
+        self.latency = LatencyHistogram()
+        self.counters = {'charged': 0, 'declined': 0, 'errors': 0, 'retries': 0}
+
+    def build_request(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'amount_cents': int(round(payment['amount'] * 100)),
+            'currency': 'ZAR',
+            'reference': payment['idempotency_key']
+        }
+
+    def fee_for(self, amount: float) -> float:
+        return round(amount * self.fee_percentage / 100, 2)
+
+    async def charge(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        # Retries reuse the idempotency key, so a retried request can never charge twice
+        attempt = 0
+        started = time.perf_counter()
+        while True:
+            try:
+                async with self._concurrency:
+                    result = await self._send(payment)
+                break
+            except (GatewayUnavailable, *client_errors()) as e:
+                attempt += 1
+                if attempt > self.max_retries:
+                    self.counters['errors'] += 1
+                    return {'success': False, 'status': 'error', 'error': str(e) or type(e).__name__,
+                            'attempts': attempt, 'gateway': self.name}
+                self.counters['retries'] += 1
+                retry_after = getattr(e, 'retry_after', None)
+                await asyncio.sleep(retry_after if retry_after is not None else self._backoff_delay(attempt))
+        self.latency.observe(time.perf_counter() - started)
+        self.counters['charged' if result['success'] else 'declined'] += 1
+        return {**result, 'attempts': attempt + 1, 'gateway': self.name}
+
+    def _backoff_delay(self, attempt: int) -> float:
+        return self._rng.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    async def _send(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        if self.simulate:
+            # Simulated gateway - 95% of charges succeed
+            success = self._rng.random() >= 0.05
+            return {'success': success, 'status': 'approved' if success else 'declined',
+                    'gateway_reference': f"{self.name}_{secrets.token_hex(8)}"}
+
+        session = await self.http_pool.start()
+        headers = {'Idempotency-Key': payment['idempotency_key']}
+        async with session.post(self.endpoint, json=self.build_request(payment), headers=headers) as response:
+            if response.status == 429:
+                raise GatewayUnavailable(f"{self.name} rate limited",
+                                         parse_retry_after(response.headers.get('Retry-After')))
+            if response.status >= 500:
+                raise GatewayUnavailable(f"{self.name} returned HTTP {response.status}")
+            if response.status >= 400:
+                return {'success': False, 'status': 'declined', 'error': f"HTTP {response.status}"}
+            body = await response.json(content_type=None)
+        success = bool(body.get('success', True))
+        return {'success': success, 'status': 'approved' if success else 'declined',
+                'gateway_reference': body.get('id') or f"{self.name}_{secrets.token_hex(8)}"}
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, 'latency': self.latency.snapshot()}
+
+class PayFastGateway(PaymentGateway):
+    name = 'payfast'
+
+    def build_request(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'amount': f"{payment['amount']:.2f}",
+            'item_name': payment.get('description', 'JobConnect SA subscription'),
+            'm_payment_id': payment['idempotency_key']
+        }
+
+class EFTGateway(PaymentGateway):
+    name = 'eft'
+
+    def build_request(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'Amount': round(payment['amount'], 2),
+            'CurrencyCode': 'ZAR',
+            'CountryCode': 'ZA',
+            'TransactionReference': payment['idempotency_key'],
+            'BankReference': payment['idempotency_key'][:20]
+        }
+
+class CardGateway(PaymentGateway):
+    name = 'credit_card'
+
+    def build_request(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'amount': f"{payment['amount']:.2f}",
+            'currency': 'ZAR',
+            'paymentType': 'DB',
+            'merchantTransactionId': payment['idempotency_key']
+        }
+
+# Method name -> gateway class; bank transfers settle over EFT
+GATEWAYS = {'payfast': PayFastGateway, 'eft': EFTGateway, 'bank_transfer': EFTGateway, 'credit_card': CardGateway}
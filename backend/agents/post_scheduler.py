@@ -0,0 +1,293 @@
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+Timestamp = Union[float, datetime]
+SQLITE_MAX_PARAMS = 900
+
+
+@dataclass
+class ScheduledPost:
+    post_id: str
+    platform: str
+    content: Dict[str, Any]
+    due_at: float
+
+
+def _to_epoch(when: Timestamp) -> float:
+    return when.timestamp() if isinstance(when, datetime) else float(when)
+
+
+def next_window_start(window: Optional[str], now: Optional[datetime] = None) -> datetime:
+    # Turns an optimal-time window such as '19:00-23:00' into the next moment it opens
+    now = now or datetime.now()
+    if not window:
+        return now
+    start, _, end = window.partition('-')
+    start_hour, start_minute = (int(part) for part in start.split(':'))
+    opens = now.replace(hour=start_hour, minute=start_minute, second=0, microsecond=0)
+    if end:
+        end_hour, end_minute = (int(part) for part in end.split(':'))
+        closes = now.replace(hour=end_hour, minute=end_minute, second=0, microsecond=0)
+        if closes <= opens:
+            # Spans midnight, e.g. '22:00-02:00': open from opens until midnight and from midnight until closes
+            if now >= opens or now < closes:
+                return now
+        elif opens <= now < closes:
+            return now
+    return opens if opens > now else opens + timedelta(days=1)
+
+
+class PostScheduler:
+    def __init__(self, db_path: Optional[str] = None, dispatch_batch: int = 500, retry_delay: float = 60.0,
+                 claim_ttl: float = 300.0):
+        # On disk by default so scheduled posts survive a restart; ':memory:' is for benchmarks
+        db_path = db_path or os.environ.get(
+            'POST_SCHEDULER_DB', os.path.join(os.path.expanduser('~'), '.jobplatform', 'scheduled_posts.db')
+        )
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self.dispatch_batch = dispatch_batch
+        self.retry_delay = retry_delay
+        # How long a claimed row stays with its dispatcher before another scheduler may take it over
+        self.claim_ttl = claim_ttl
+        # Heap holds (due_at, seq, post_id); _live maps post_id to its current (due_at, seq).
+        # Cancelled or rescheduled entries stay in the heap and are skipped when they surface.
+        self._heap: List[Tuple[float, int, str]] = []
+        self._live: Dict[str, Tuple[float, int]] = {}
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._running = False
+        self._in_run = False
+        self._close_requested = False
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute(
+            'CREATE TABLE IF NOT EXISTS scheduled_posts ('
+            'post_id TEXT PRIMARY KEY, platform TEXT NOT NULL, due_at REAL NOT NULL, content TEXT NOT NULL, '
+            'claim TEXT, claimed_until REAL)'
+        )
+        columns = {row[1] for row in self.db.execute('PRAGMA table_info(scheduled_posts)')}
+        for column, kind in (('claim', 'TEXT'), ('claimed_until', 'REAL')):
+            if column not in columns:
+                self.db.execute(f'ALTER TABLE scheduled_posts ADD COLUMN {column} {kind}')
+        self.db.commit()
+        self._load()
+
+    def _load(self):
+        for post_id, due_at in self.db.execute(
+            'SELECT post_id, MAX(due_at, COALESCE(claimed_until, 0)) FROM scheduled_posts'
+        ):
+            seq = next(self._seq)
+            self._live[post_id] = (due_at, seq)
+            self._heap.append((due_at, seq, post_id))
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, post_id: str) -> bool:
+        return post_id in self._live
+
+    def _push(self, post_id: str, due_at: float):
+        seq = next(self._seq)
+        self._live[post_id] = (due_at, seq)
+        heapq.heappush(self._heap, (due_at, seq, post_id))
+
+    def _wake_if_earlier(self, due_at: float, previous_head: Optional[float]):
+        if previous_head is None or due_at < previous_head:
+            self._wakeup.set()
+
+    def schedule(self, post_id: str, platform: str, content: Dict[str, Any], due_at: Timestamp) -> str:
+        return self.schedule_many([(post_id, platform, content, due_at)])[0]
+
+    def schedule_many(self, posts: Iterable[Tuple[str, str, Dict[str, Any], Timestamp]]) -> List[str]:
+        rows = [(post_id, platform, _to_epoch(due_at), json.dumps(content, default=str))
+                for post_id, platform, content, due_at in posts]
+        if not rows:
+            return []
+        with self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO scheduled_posts (post_id, platform, due_at, content) VALUES (?, ?, ?, ?)',
+                rows
+            )
+        previous_head = self.next_due()
+        if len(rows) > len(self._heap):
+            # Bulk loads are cheaper as one O(n) heapify than n pushes
+            for post_id, _, due_at, _ in rows:
+                seq = next(self._seq)
+                self._live[post_id] = (due_at, seq)
+                self._heap.append((due_at, seq, post_id))
+            heapq.heapify(self._heap)
+        else:
+            for post_id, _, due_at, _ in rows:
+                self._push(post_id, due_at)
+        self._wake_if_earlier(min(row[2] for row in rows), previous_head)
+        return [row[0] for row in rows]
+
+    def cancel(self, post_id: str) -> bool:
+        if self._live.pop(post_id, None) is None:
+            return False
+        with self.db:
+            self.db.execute('DELETE FROM scheduled_posts WHERE post_id = ?', (post_id,))
+        self._maybe_compact()
+        return True
+
+    def reschedule(self, post_id: str, due_at: Timestamp) -> bool:
+        if post_id not in self._live:
+            return False
+        due_at = _to_epoch(due_at)
+        previous_head = self.next_due()
+        with self.db:
+            self.db.execute('UPDATE scheduled_posts SET due_at = ? WHERE post_id = ?', (due_at, post_id))
+        self._push(post_id, due_at)
+        self._wake_if_earlier(due_at, previous_head)
+        self._maybe_compact()
+        return True
+
+    def _maybe_compact(self):
+        if len(self._heap) > 1024 and len(self._heap) > 2 * len(self._live):
+            self._heap = [(due_at, seq, post_id) for post_id, (due_at, seq) in self._live.items()]
+            heapq.heapify(self._heap)
+
+    def _discard_stale(self):
+        heap = self._heap
+        while heap:
+            due_at, seq, post_id = heap[0]
+            if self._live.get(post_id) == (due_at, seq):
+                return
+            heapq.heappop(heap)
+
+    def next_due(self) -> Optional[float]:
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None, limit: Optional[int] = None) -> List[ScheduledPost]:
+        now = time.time() if now is None else now
+        limit = limit or self.dispatch_batch
+        due: List[Tuple[str, float]] = []
+        heap = self._heap
+        while heap and len(due) < limit:
+            due_at, seq, post_id = heap[0]
+            if self._live.get(post_id) != (due_at, seq):
+                heapq.heappop(heap)
+                continue
+            if due_at > now:
+                break
+            heapq.heappop(heap)
+            del self._live[post_id]
+            due.append((post_id, due_at))
+        if not due:
+            return []
+
+        # Several workers may share the database: a row is dispatched only by the scheduler whose conditional
+        # UPDATE claims it. Rows stay in SQLite until complete(), so if a dispatcher dies mid-batch its claim
+        # lapses after claim_ttl and the row is replayed.
+        claim = uuid.uuid4().hex
+        rows = {}
+        with self.db:
+            for offset in range(0, len(due), SQLITE_MAX_PARAMS - 4):
+                chunk = [post_id for post_id, _ in due[offset:offset + SQLITE_MAX_PARAMS - 4]]
+                placeholders = ','.join('?' * len(chunk))
+                self.db.execute(
+                    f'UPDATE scheduled_posts SET claim = ?, claimed_until = ? WHERE post_id IN ({placeholders}) '
+                    'AND due_at <= ? AND (claimed_until IS NULL OR claimed_until <= ?)',
+                    [claim, now + self.claim_ttl, *chunk, now, now]
+                )
+                for post_id, platform, content in self.db.execute(
+                    f'SELECT post_id, platform, content FROM scheduled_posts WHERE post_id IN ({placeholders}) '
+                    'AND claim = ?', [*chunk, claim]
+                ):
+                    rows[post_id] = (platform, content)
+        if len(rows) < len(due):
+            self._requeue_unclaimed([post_id for post_id, _ in due if post_id not in rows])
+        return [ScheduledPost(post_id, rows[post_id][0], json.loads(rows[post_id][1]), due_at)
+                for post_id, due_at in due if post_id in rows]
+
+    def _requeue_unclaimed(self, post_ids: List[str]):
+        # Claimed or rescheduled elsewhere: look again once that claim lapses or the new due time arrives.
+        # Rows another scheduler already completed are gone and are dropped here too.
+        for offset in range(0, len(post_ids), SQLITE_MAX_PARAMS):
+            chunk = post_ids[offset:offset + SQLITE_MAX_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            for post_id, due_at in self.db.execute(
+                f'SELECT post_id, MAX(due_at, COALESCE(claimed_until, 0)) FROM scheduled_posts '
+                f'WHERE post_id IN ({placeholders})', chunk
+            ):
+                if post_id not in self._live:
+                    self._push(post_id, due_at)
+
+    def complete(self, post_ids: Iterable[str]):
+        with self.db:
+            self.db.executemany('DELETE FROM scheduled_posts WHERE post_id = ?', ((post_id,) for post_id in post_ids))
+
+    def retry_later(self, posts: Iterable[ScheduledPost], delay: Optional[float] = None):
+        due_at = time.time() + (self.retry_delay if delay is None else delay)
+        posts = list(posts)
+        with self.db:
+            self.db.executemany('UPDATE scheduled_posts SET due_at = ?, claim = NULL, claimed_until = NULL '
+                                'WHERE post_id = ?',
+                                [(due_at, post.post_id) for post in posts])
+        for post in posts:
+            self._push(post.post_id, due_at)
+
+    async def run(self, dispatch: Callable[[List[ScheduledPost]], Awaitable[Optional[List[ScheduledPost]]]]):
+        # Sleeps until the head of the heap is due; schedule()/reschedule() wake it for earlier items.
+        # dispatch returns the posts it could not deliver; those are retried and the rest completed.
+        # If it raises, the whole batch is retried.
+        self._running = True
+        self._in_run = True
+        try:
+            await self._run(dispatch)
+        finally:
+            self._in_run = False
+            if self._close_requested:
+                self.db.close()
+
+    async def _run(self, dispatch: Callable[[List[ScheduledPost]], Awaitable[Optional[List[ScheduledPost]]]]):
+        while self._running:
+            next_due = self.next_due()
+            now = time.time()
+            if next_due is None or next_due > now:
+                self._wakeup.clear()
+                timeout = None if next_due is None else next_due - now
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            batch = self.pop_due(now)
+            if not batch:
+                # Everything due was claimed by another scheduler
+                continue
+            try:
+                failed = await dispatch(batch) or []
+            except Exception:
+                failed = batch
+            if failed:
+                self.retry_later(failed)
+            retried = {post.post_id for post in failed}
+            self.complete(post.post_id for post in batch if post.post_id not in retried)
+
+    def stop(self):
+        self._running = False
+        self._wakeup.set()
+
+    def close(self):
+        self.stop()
+        if self._in_run:
+            # run() still has to record the batch in flight; it closes the connection on its way out
+            self._close_requested = True
+        else:
+            self.db.close()
@@ -0,0 +1,85 @@
+import asyncio
+import importlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+Factory = Union[str, Callable[..., Any]]
+
+
+def resolve(factory: Factory) -> Callable[..., Any]:
+    # 'package.module:attribute' is imported only when the agent is first built
+    if isinstance(factory, str):
+        module_name, _, attribute = factory.partition(':')
+        return getattr(importlib.import_module(module_name), attribute)
+    return factory
+
+
+class AgentRegistry:
+    def __init__(self):
+        self._factories: Dict[str, Tuple[Factory, Dict[str, Any]]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._build_seconds: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Factory, **kwargs):
+        with self._lock:
+            if name in self._instances:
+                raise ValueError(f"Agent '{name}' is already built")
+            self._factories[name] = (factory, kwargs)
+
+    def set(self, name: str, instance: Any):
+        # Installs a prebuilt agent, e.g. one shared with another registry or a benchmark stand-in
+        with self._lock:
+            self._instances[name] = instance
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    if name not in self._factories:
+                        raise KeyError(f"Unknown agent '{name}'")
+                    factory, kwargs = self._factories[name]
+                    start = time.perf_counter()
+                    instance = resolve(factory)(**kwargs)
+                    self._build_seconds[name] = time.perf_counter() - start
+                    self._instances[name] = instance
+        return instance
+
+    async def aget(self, name: str) -> Any:
+        # For coroutines: a first build imports modules and holds the lock, so it runs in a worker
+        # thread rather than stalling the event loop
+        instance = self._instances.get(name)
+        if instance is None:
+            instance = await asyncio.get_running_loop().run_in_executor(None, self.get, name)
+        return instance
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories or name in self._instances
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._instances
+
+    def loaded(self) -> List[str]:
+        return sorted(self._instances)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'registered': sorted(set(self._factories) | set(self._instances)),
+            'loaded': {name: round(self._build_seconds.get(name, 0.0) * 1000, 3) for name in self.loaded()}
+        }
+
+    async def close(self):
+        # Only agents that were actually built are closed; unbuilt ones are never imported
+        with self._lock:
+            instances = list(self._instances.items())
+            self._instances.clear()
+        for _, instance in instances:
+            close = getattr(instance, 'close', None)
+            if close is None:
+                continue
+            result = close()
+            if asyncio.iscoroutine(result):
+                await result
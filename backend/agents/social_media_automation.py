@@ -1,50 +1,175 @@
-import aiohttp
 import asyncio
+import random
+import secrets
 from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from agents.campaign_analytics import CampaignAnalytics, Campaigns, campaign_metrics
+from agents.engagement_store import DEFAULT_WINDOWS, EngagementStore
+from agents.post_scheduler import PostScheduler, ScheduledPost, next_window_start
+from utils.http_pool import HttpPool, client_errors, get_http_pool
+from utils.instrumentation import instrumented
+from utils.rate_limit import TokenBucket, parse_retry_after
+
+PLATFORM_APIS = {
+    'tiktok': 'https://api.tiktok.com/video/upload',
+    'instagram': 'https://graph.instagram.com/me/media',
+    'facebook': 'https://graph.facebook.com/v12.0/me/feed',
+    'youtube': 'https://www.googleapis.com/upload/youtube/v3/videos',
+    'twitter': 'https://api.twitter.com/2/tweets',
+    'snapchat': 'https://adsapi.snapchat.com/v1/ads'
+}
+
+# Posts per second and burst size allowed per platform
+PLATFORM_RATE_LIMITS = {
+    'tiktok': {'rate': 0.5, 'burst': 2},
+    'instagram': {'rate': 0.5, 'burst': 2},
+    'facebook': {'rate': 1.0, 'burst': 4},
+    'youtube': {'rate': 0.2, 'burst': 1},
+    'twitter': {'rate': 1.0, 'burst': 5},
+    'snapchat': {'rate': 0.5, 'burst': 2}
+}
+
+REAL_TIME_WINDOW = 3600
+
+class PlatformRateLimited(Exception):
+    def __init__(self, platform: str, retry_after: float):
+        super().__init__(f"{platform} rate limited, retry after {retry_after:.1f}s")
+        self.platform = platform
+        self.retry_after = retry_after
+
+class PlatformUnavailable(Exception):
+    pass
 
 class AutoPoster:
-    def __init__(self):
+    def __init__(self, rate_limits: Optional[Dict[str, Dict[str, float]]] = None,
+                 api_endpoints: Optional[Dict[str, str]] = None, simulate: bool = True,
+                 max_concurrency: int = 6, max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_cap: float = 30.0, rng: Optional[random.Random] = None,
+                 http_pool: Optional[HttpPool] = None, scheduler_db: Optional[str] = None):
         self.platforms = ['tiktok', 'instagram', 'facebook', 'youtube', 'twitter', 'snapchat']
-        self.scheduled_posts = []
+        self.scheduled_posts = PostScheduler(scheduler_db)
         self.session = None
+        # One bounded keep-alive pool per process unless the caller brings its own
+        self.http_pool = http_pool or get_http_pool()
+        self.platform_apis = {**PLATFORM_APIS, **(api_endpoints or {})}
+        self.simulate = simulate
+        limits = {**PLATFORM_RATE_LIMITS, **(rate_limits or {})}
+        self.rate_limiters = {
+            platform: TokenBucket(limit['rate'], limit['burst']) for platform, limit in limits.items()
+        }
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._concurrency = asyncio.Semaphore(max_concurrency)
+        self._rng = rng or random.Random()
         
     async def initialize(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await self.http_pool.start()
+    
+    async def close(self):
+        # Sockets belong to the pool; whoever owns the pool closes it (see close_http_pool)
+        self.session = None
+        self.scheduled_posts.close()
+    
+    async def __aenter__(self) -> 'AutoPoster':
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        return self.http_pool.stats()
         
+    @instrumented('auto_poster')
     async def post_to_all_platforms(self, content_batch: Dict[str, Any]) -> Dict[str, Any]:
-        results = {}
+        # Platforms are independent: a throttled platform only delays its own posts
+        targets = [platform for platform in content_batch if platform in self.platforms]
+        outcomes = await asyncio.gather(*(
+            self._post_with_limits(platform, content_batch[platform]) for platform in targets
+        ))
+        return dict(zip(targets, outcomes))
+    
+    async def _post_with_limits(self, platform: str, content: Dict) -> Dict:
+        limiter = self.rate_limiters.get(platform)
+        attempt = 0
+        while True:
+            if limiter:
+                await limiter.acquire()
+            try:
+                async with self._concurrency:
+                    return await self._post_to_platform(platform, content)
+            except PlatformRateLimited as e:
+                if limiter:
+                    limiter.penalize(e.retry_after)
+                else:
+                    await asyncio.sleep(e.retry_after)
+                error = e
+            except (PlatformUnavailable, *client_errors()) as e:
+                error = e
+                await asyncio.sleep(self._backoff_delay(attempt))
+            except Exception as e:
+                return {'success': False, 'platform': platform, 'error': str(e), 'attempts': attempt + 1}
+            
+            attempt += 1
+            if attempt > self.max_retries:
+                return {'success': False, 'platform': platform, 'error': str(error), 'attempts': attempt}
+    
+    @instrumented('auto_poster')
+    def schedule_content(self, content_batch: Dict[str, Any], now: Optional[datetime] = None) -> List[str]:
+        posts = []
         for platform, content in content_batch.items():
             if platform in self.platforms:
-                try:
-                    result = await self._post_to_platform(platform, content)
-                    results[platform] = result
-                    await asyncio.sleep(2)  # Rate limiting
-                except Exception as e:
-                    results[platform] = {'success': False, 'error': str(e)}
-        return results
+                due_at = next_window_start(content.get('optimal_post_time'), now)
+                posts.append((f"{platform}_{secrets.token_hex(8)}", platform, content, due_at))
+        return self.scheduled_posts.schedule_many(posts)
+    
+    async def run_scheduler(self):
+        await self.scheduled_posts.run(self._dispatch_scheduled)
+    
+    @instrumented('auto_poster')
+    async def _dispatch_scheduled(self, posts: List[ScheduledPost]) -> List[ScheduledPost]:
+        # _post_with_limits reports exhausted retries as success=False; those posts go back on the schedule
+        outcomes = await asyncio.gather(*(self._post_with_limits(post.platform, post.content) for post in posts))
+        return [post for post, outcome in zip(posts, outcomes) if not outcome['success']]
     
+    def _backoff_delay(self, attempt: int) -> float:
+        # Full jitter keeps retries from many workers from synchronising
+        return self._rng.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+    
+    @instrumented('auto_poster')
     async def _post_to_platform(self, platform: str, content: Dict) -> Dict:
-        # Simulated API integration - in production, use actual platform APIs
-        platform_apis = {
-            'tiktok': 'https://api.tiktok.com/video/upload',
-            'instagram': 'https://graph.instagram.com/me/media',
-            'facebook': 'https://graph.facebook.com/v12.0/me/feed',
-            'youtube': 'https://www.googleapis.com/upload/youtube/v3/videos',
-            'twitter': 'https://api.twitter.com/2/tweets',
-            'snapchat': 'https://adsapi.snapchat.com/v1/ads'
-        }
+        if self.simulate:
+            # Simulated API integration - in production, use actual platform APIs
+            return {
+                'success': True,
+                'platform': platform,
+                'post_id': f"{platform}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}",
+                'engagement_metrics': await self._initialize_tracking(platform),
+                'posted_at': datetime.now().isoformat(),
+                'content_quality_score': content.get('addiction_score', 8.0)
+            }
+        
+        if self.session is None or self.session.closed:
+            await self.initialize()
+        async with self.session.post(self.platform_apis[platform], json=content) as response:
+            if response.status == 429:
+                raise PlatformRateLimited(platform, parse_retry_after(response.headers.get('Retry-After')))
+            if response.status >= 500:
+                raise PlatformUnavailable(f"{platform} returned HTTP {response.status}")
+            if response.status >= 400:
+                return {'success': False, 'platform': platform, 'error': f"HTTP {response.status}"}
+            body = await response.json(content_type=None)
         
-        # In production, this would make actual API calls
-        simulated_response = {
+        return {
             'success': True,
             'platform': platform,
-            'post_id': f"{platform}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}",
+            'post_id': body.get('id') or f"{platform}_{secrets.token_hex(8)}",
             'engagement_metrics': await self._initialize_tracking(platform),
             'posted_at': datetime.now().isoformat(),
             'content_quality_score': content.get('addiction_score', 8.0)
         }
-        
-        return simulated_response
     
     async def _initialize_tracking(self, platform: str) -> Dict[str, Any]:
         return {
@@ -57,31 +182,45 @@ class AutoPoster:
         }
 
 class AnalyticsTracker:
-    def __init__(self):
-        self.performance_data = {}
+    def __init__(self, rng: Optional[random.Random] = None):
+        self.performance_data = EngagementStore()
         self.real_time_metrics = {}
+        self.campaign_analytics = CampaignAnalytics()
+        self._rng = rng or secrets.SystemRandom()
         
-    async def track_engagement(self, platform: str, post_id: str) -> Dict[str, Any]:
+    @instrumented('analytics_tracker')
+    async def track_engagement(self, platform: str, post_id: str, campaign: str = 'organic') -> Dict[str, Any]:
         # Simulated real-time tracking
+        rng = self._rng
         base_metrics = {
-            'views': secrets.randbelow(10000),
-            'likes': secrets.randbelow(2000),
-            'shares': secrets.randbelow(500),
-            'comments': secrets.randbelow(300),
-            'click_throughs': secrets.randbelow(800)
+            'views': rng.randrange(10000),
+            'likes': rng.randrange(2000),
+            'shares': rng.randrange(500),
+            'comments': rng.randrange(300),
+            'click_throughs': rng.randrange(800)
         }
+        conversions = rng.randrange(100)
+        self.performance_data.ingest([{**base_metrics, 'platform': platform, 'campaign': campaign, 'conversions': conversions}])
         
         engagement_rate = (base_metrics['likes'] + base_metrics['shares'] + base_metrics['comments']) / max(base_metrics['views'], 1) * 100
         
         return {
             **base_metrics,
             'engagement_rate': round(engagement_rate, 2),
-            'conversions': secrets.randbelow(100),
-            'virality_score': min(9.9, engagement_rate / 10 + secrets.SystemRandom().uniform(0, 3)),
-            'addiction_metric': min(9.8, engagement_rate / 15 + secrets.SystemRandom().uniform(0, 4)),
+            'conversions': conversions,
+            'virality_score': min(9.9, engagement_rate / 10 + rng.uniform(0, 3)),
+            'addiction_metric': min(9.8, engagement_rate / 15 + rng.uniform(0, 4)),
             'tracking_timestamp': datetime.now().isoformat()
         }
     
+    @instrumented('analytics_tracker')
+    def ingest_samples(self, samples, now: Optional[float] = None) -> int:
+        # Accepts a list of sample dicts or a dict of equal-length columns (lists or NumPy arrays)
+        ingested = self.performance_data.ingest(samples, now)
+        self.real_time_metrics = self.performance_data.aggregate(REAL_TIME_WINDOW, now)
+        return ingested
+    
+    @instrumented('analytics_tracker')
     async def calculate_roi(self, campaign_data: Dict) -> float:
         # Advanced ROI calculation with machine learning
         investment = campaign_data.get('investment', 1000)
@@ -91,16 +230,54 @@ class AnalyticsTracker:
         roi = ((conversions * lifetime_value) - investment) / investment * 100
         return round(max(roi, 0), 2)
     
-    async def generate_performance_report(self) -> Dict[str, Any]:
+    @instrumented('analytics_tracker')
+    def calculate_roi_batch(self, campaigns: Campaigns, record: bool = True) -> Dict[str, Any]:
+        # Vectorized ROI/CAC/payback over many campaigns; recorded ones feed the grouped summary incrementally
+        if record:
+            return self.campaign_analytics.append(campaigns)
+        columns = CampaignAnalytics.to_columns(campaigns)
+        return campaign_metrics(columns['investment'], columns['conversions'],
+                                columns['conversions'] * columns['lifetime_value'],
+                                self.campaign_analytics.lifetime_months)
+    
+    @instrumented('analytics_tracker')
+    def campaign_summary(self, by=('platform', 'date')) -> Dict[Any, Dict[str, float]]:
+        return self.campaign_analytics.summary(by)
+    
+    @instrumented('analytics_tracker')
+    async def generate_performance_report(self, now: Optional[float] = None) -> Dict[str, Any]:
+        store = self.performance_data
+        windows = store.rolling(now=now)
+        self.real_time_metrics = store.aggregate(REAL_TIME_WINDOW, now)
+        by_platform = windows['24h']
+        overall = store.totals(DEFAULT_WINDOWS['24h'], now)
+        if not by_platform:
+            return {
+                'overall_performance': 0.0,
+                'top_performing_platform': None,
+                'conversion_rate': 0.0,
+                'customer_acquisition_cost': 0.0,
+                'addiction_effectiveness': 0.0,
+                'samples': 0,
+                'windows': windows,
+                'recommendations': ["Start tracking engagement to build a performance report"]
+            }
+        
+        top_platform = max(by_platform, key=lambda platform: by_platform[platform]['conversions'])
+        weakest_ctr = min(by_platform, key=lambda platform: by_platform[platform]['ctr'])
+        weakest_engagement = min(by_platform, key=lambda platform: by_platform[platform]['engagement_rate'])
         return {
-            'overall_performance': 87.5,
-            'top_performing_platform': 'tiktok',
-            'conversion_rate': 15.3,
-            'customer_acquisition_cost': 12.75,
-            'addiction_effectiveness': 8.9,
+            'overall_performance': round(overall['engagement_rate'], 2),
+            'top_performing_platform': top_platform,
+            'conversion_rate': round(overall['conversion_rate'], 2),
+            'customer_acquisition_cost': round(overall['cost_per_conversion'], 2),
+            'addiction_effectiveness': round(min(9.8, overall['engagement_rate'] / 15), 2),
+            'samples': overall['samples'],
+            'windows': windows,
             'recommendations': [
-                "Increase TikTok content frequency",
-                "Add more urgency to Instagram posts",
-                "Optimize YouTube Shorts for mobile"
+                f"Increase {top_platform} content frequency",
+                f"Strengthen calls to action on {weakest_ctr} (CTR {by_platform[weakest_ctr]['ctr']:.2f}%)",
+                f"Add more hooks to {weakest_engagement} posts "
+                f"(engagement {by_platform[weakest_engagement]['engagement_rate']:.2f}%)"
             ]
         }
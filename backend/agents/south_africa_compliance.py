@@ -1,12 +1,152 @@
+import asyncio
+import json
+import os
+import random
+import secrets
+import sqlite3
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, AsyncIterator, Iterable, Optional, Sequence, Tuple
+
+from agents.ledger import KIND_PAYMENT, KIND_PAYOUT, STATUS_FAILED, STATUS_OK, Ledger, get_ledger
+from agents.payment_gateways import GATEWAYS, PaymentGateway
+from utils.http_pool import HttpPool
+from utils.instrumentation import instrumented
+from utils.security import MilitaryGradeSecurity
+
+SQLITE_MAX_PARAMS = 900
+
+@dataclass(frozen=True)
+class ComplianceRule:
+    name: str
+    regulation: str
+    fields: Tuple[str, ...]
+    # 'present': the field only has to be supplied; 'truthy': it must also be set
+    check: str = 'truthy'
+
+COMPLIANCE_RULES = (
+    ComplianceRule('popi_compliant', 'popi_act',
+                   ('privacy_policy', 'data_processing_agreement', 'user_consent'), 'present'),
+    ComplianceRule('cpa_compliant', 'consumer_protection_act',
+                   ('clear_pricing', 'refund_policy', 'terms_conditions')),
+    ComplianceRule('tax_compliant', 'tax_regulations', ('tax_registered', 'vat_number')),
+    ComplianceRule('labor_law_compliant', 'labor_laws', ('employment_equity', 'fair_labor_practices')),
+    ComplianceRule('fica_compliant', 'financial_intelligence_centre_act', ('customer_verification', 'aml_policy'))
+)
+
+class ComplianceRuleTable:
+    # Rules are compiled to bitmasks over the distinct (field, check) pairs they read.
+    # A record's fingerprint is the mask of checks it satisfies; a rule passes when its mask is covered.
+    def __init__(self, rules: Sequence[ComplianceRule] = COMPLIANCE_RULES):
+        self.rules = tuple(rules)
+        self.rule_names = tuple(rule.name for rule in self.rules)
+        checks = []
+        for rule in self.rules:
+            for field in rule.fields:
+                if (field, rule.check) not in checks:
+                    checks.append((field, rule.check))
+        self.checks = tuple((1 << bit, field, check == 'present') for bit, (field, check) in enumerate(checks))
+        self.required_masks = tuple(
+            sum(1 << checks.index((field, rule.check)) for field in rule.fields) for rule in self.rules
+        )
+    
+    def fingerprint(self, record: Dict) -> int:
+        mask = 0
+        for bit, field, presence_only in self.checks:
+            if (field in record) if presence_only else record.get(field, False):
+                mask |= bit
+        return mask
+    
+    def evaluate_fingerprint(self, fingerprint: int) -> Tuple[Tuple[bool, ...], float]:
+        passed = tuple(fingerprint & required == required for required in self.required_masks)
+        return passed, round(sum(passed) / len(passed) * 100, 2)
+    
+    def evaluate(self, record: Dict) -> Dict[str, Any]:
+        passed, score = self.evaluate_fingerprint(self.fingerprint(record))
+        results = dict(zip(self.rule_names, passed))
+        results['overall_compliance_score'] = score
+        return results
+    
+    def evaluate_many(self, records: Iterable[Dict]) -> Dict[str, Any]:
+        if hasattr(records, 'columns'):
+            return self._evaluate_frame(records)
+        
+        evaluate, fingerprint = self.evaluate_fingerprint, self.fingerprint
+        failed_rows = [[] for _ in self.rules]
+        scores = []
+        for index, record in enumerate(records):
+            passed, score = evaluate(fingerprint(record))
+            scores.append(score)
+            if score < 100:
+                for rule_index, ok in enumerate(passed):
+                    if not ok:
+                        failed_rows[rule_index].append(index)
+        
+        # Setting bits in a bytearray keeps this linear; OR-ing into a growing int would not be
+        failures = []
+        for rows in failed_rows:
+            bitmap = bytearray((len(scores) + 7) // 8)
+            for row in rows:
+                bitmap[row >> 3] |= 1 << (row & 7)
+            failures.append(int.from_bytes(bitmap, 'little'))
+        return self._summarise(failures, scores)
+    
+    def _evaluate_frame(self, frame) -> Dict[str, Any]:
+        import numpy as np
+        
+        rows = len(frame)
+        satisfied = {}
+        for bit, field, presence_only in self.checks:
+            if field not in frame.columns:
+                satisfied[bit] = np.zeros(rows, dtype=bool)
+            elif presence_only:
+                # A frame cannot tell an absent field from a null one; both count as missing
+                satisfied[bit] = frame[field].notna().to_numpy()
+            else:
+                satisfied[bit] = frame[field].fillna(False).astype(bool).to_numpy()
+        
+        passed = []
+        for required in self.required_masks:
+            rule_passed = np.ones(rows, dtype=bool)
+            for bit, _, _ in self.checks:
+                if required & bit:
+                    rule_passed &= satisfied[bit]
+            passed.append(rule_passed)
+        
+        failures = [
+            int.from_bytes(np.packbits(~rule_passed, bitorder='little').tobytes(), 'little') for rule_passed in passed
+        ]
+        scores = np.round(np.sum(passed, axis=0) / len(passed) * 100, 2) if passed else np.zeros(rows)
+        return self._summarise(failures, scores.tolist())
+    
+    def _summarise(self, failures: List[int], scores: List[float]) -> Dict[str, Any]:
+        count = len(scores)
+        return {
+            'records': count,
+            # Bit i of a rule's bitmap is set when record i fails that rule
+            'failure_bitmaps': dict(zip(self.rule_names, failures)),
+            'failure_counts': {name: bin(bitmap).count('1') for name, bitmap in zip(self.rule_names, failures)},
+            'scores': scores,
+            'overall_compliance_score': round(sum(scores) / count, 2) if count else 0.0
+        }
+
 class SAComplianceAgent:
+    _regulations: Optional[Dict[str, Dict[str, Any]]] = None
+    rule_table = ComplianceRuleTable()
+    
     def __init__(self):
-        self.sa_regulations = {
-            'popi_act': self._load_popi_requirements(),
-            'consumer_protection_act': self._load_cpa_requirements(),
-            'labor_laws': self._load_labor_laws(),
-            'tax_regulations': self._load_tax_requirements(),
-            'financial_intelligence_centre_act': self._load_fica_requirements()
-        }
+        # Requirement tables are static; build them once and share them across agents
+        if SAComplianceAgent._regulations is None:
+            SAComplianceAgent._regulations = {
+                'popi_act': self._load_popi_requirements(),
+                'consumer_protection_act': self._load_cpa_requirements(),
+                'labor_laws': self._load_labor_laws(),
+                'tax_regulations': self._load_tax_requirements(),
+                'financial_intelligence_centre_act': self._load_fica_requirements()
+            }
+        self.sa_regulations = SAComplianceAgent._regulations
         self.compliance_status = {}
     
     def _load_popi_requirements(self) -> Dict[str, Any]:
@@ -53,66 +193,241 @@ class SAComplianceAgent:
             'internal_compliance_program': True
         }
     
+    @instrumented('compliance')
     async def validate_compliance(self, data: Dict) -> Dict[str, Any]:
-        compliance_results = {
-            'popi_compliant': await self._check_popi_compliance(data),
-            'cpa_compliant': await self._check_cpa_compliance(data),
-            'tax_compliant': await self._check_tax_compliance(data),
-            'labor_law_compliant': await self._check_labor_compliance(data),
-            'fica_compliant': await self._check_fica_compliance(data),
-            'overall_compliance_score': 0.0
-        }
-        
-        # Calculate overall score
-        compliant_count = sum(1 for key, value in compliance_results.items() 
-                            if key.endswith('_compliant') and value)
-        total_checks = len([key for key in compliance_results if key.endswith('_compliant')])
-        compliance_results['overall_compliance_score'] = round((compliant_count / total_checks) * 100, 2)
-        
-        return compliance_results
-    
-    async def _check_popi_compliance(self, data: Dict) -> bool:
-        required_fields = ['privacy_policy', 'data_processing_agreement', 'user_consent']
-        return all(field in data for field in required_fields)
-    
-    async def _check_cpa_compliance(self, data: Dict) -> bool:
-        return all([
-            data.get('clear_pricing', False),
-            data.get('refund_policy', False),
-            data.get('terms_conditions', False)
-        ])
-    
-    async def _check_tax_compliance(self, data: Dict) -> bool:
-        return data.get('tax_registered', False) and data.get('vat_number', False)
+        return self.rule_table.evaluate(data)
     
-    async def _check_labor_compliance(self, data: Dict) -> bool:
-        return data.get('employment_equity', False) and data.get('fair_labor_practices', False)
+    @instrumented('compliance')
+    def validate_many(self, records: Iterable[Dict]) -> Dict[str, Any]:
+        # Accepts a list of records or a pandas DataFrame with one column per field
+        return self.rule_table.evaluate_many(records)
     
-    async def _check_fica_compliance(self, data: Dict) -> bool:
-        return data.get('customer_verification', False) and data.get('aml_policy', False)
+    def rules_for(self, regulation: str) -> List[ComplianceRule]:
+        return [rule for rule in self.rule_table.rules if rule.regulation == regulation]
 
 class PaymentProcessor:
-    def __init__(self):
+    # Ledger method codes; the position in this tuple is what gets stored
+    PAYMENT_METHODS = ('unknown', 'payfast', 'eft', 'bank_transfer', 'credit_card')
+
+    def __init__(self, ledger: Optional[Ledger] = None, gateways: Optional[Dict[str, PaymentGateway]] = None,
+                 simulate: bool = True, http_pool: Optional[HttpPool] = None, idempotency_db: Optional[str] = None,
+                 encrypt_chunk: int = 500, max_in_flight: int = 64, rng: Optional[random.Random] = None):
         self.security = MilitaryGradeSecurity()
-        self.payment_methods = ['payfast', 'eft', 'bank_transfer', 'credit_card']
+        self.payment_methods = list(self.PAYMENT_METHODS[1:])
         self.sa_banks = ['fnb', 'standard_bank', 'absa', 'nedbank', 'capitec']
-        
-    async def process_payment(self, amount: float, method: str, user_data: Dict) -> Dict[str, Any]:
+        self.ledger = ledger if ledger is not None else get_ledger()
+        if gateways is None:
+            # Methods settled by the same gateway class share one instance and its concurrency limit
+            instances: Dict[type, PaymentGateway] = {}
+            for cls in GATEWAYS.values():
+                if cls not in instances:
+                    instances[cls] = cls(http_pool=http_pool, simulate=simulate, rng=rng)
+            gateways = {method: instances[cls] for method, cls in GATEWAYS.items()}
+        self.gateways = gateways
+        self.encrypt_chunk = encrypt_chunk
+        self.max_in_flight = max_in_flight
+        # Idempotency index: key -> stored result, shared by every worker and kept across restarts.
+        # Each result is committed as soon as its charge settles, before anyone sees it.
+        idempotency_db = idempotency_db or os.environ.get(
+            'PAYMENT_IDEMPOTENCY_DB', os.path.join(os.path.expanduser('~'), '.jobplatform', 'idempotency.db')
+        )
+        if idempotency_db != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(idempotency_db)), exist_ok=True)
+        self.db = sqlite3.connect(idempotency_db, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS payment_results (idempotency_key TEXT PRIMARY KEY, result TEXT NOT NULL)')
+        self.db.commit()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    @instrumented('payment_processor')
+    async def process_payment(self, amount: float, method: str, user_data: Dict,
+                              idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        payment = self._prepare({'amount': amount, 'method': method, 'user_data': user_data,
+                                 'idempotency_key': idempotency_key})
+        stored = self._lookup([payment['idempotency_key']])
+        if stored:
+            return {**stored[payment['idempotency_key']], 'replayed': True}
         encrypted_data = self.security.secure_api_call('payment', user_data)
-        
-        # Simulate payment processing
-        payment_success = secrets.randbelow(100) > 5  # 95% success rate
-        
-        return {
-            'success': payment_success,
-            'transaction_id': f"txn_{datetime.now().strftime('%Y%m%d')}_{secrets.token_hex(8)}",
+        result = await self._settle(payment, encrypted_data)
+        self.flush()
+        return result
+
+    @instrumented('payment_processor')
+    async def process_batch(self, payments: Iterable[Dict[str, Any]]) -> AsyncIterator[Dict[str, Any]]:
+        # Each payment is a dict with amount, method, user_data and an optional idempotency_key.
+        # Results are yielded in completion order; keys already processed are replayed without a charge.
+        loop = asyncio.get_running_loop()
+        batch = [self._prepare(payment) for payment in payments]
+        stored = self._lookup([payment['idempotency_key'] for payment in batch])
+        fresh: List[Dict[str, Any]] = []
+        duplicates: Dict[str, int] = {}
+        for payment in batch:
+            key = payment['idempotency_key']
+            if key in stored:
+                yield {**stored[key], 'replayed': True}
+            elif key in duplicates:
+                duplicates[key] += 1
+            else:
+                duplicates[key] = 0
+                fresh.append(payment)
+
+        done: deque = deque()
+        ready = asyncio.Event()
+        keys: Dict[asyncio.Task, str] = {}
+
+        def finished(task: asyncio.Task):
+            done.append(task)
+            ready.set()
+
+        active = 0
+
+        def drain() -> List[Dict[str, Any]]:
+            nonlocal active
+            results = []
+            while done:
+                active -= 1
+                task = done.popleft()
+                key = keys.pop(task)
+                try:
+                    result = task.result()
+                except Exception as e:
+                    # One bad payment must not abort the batch; nothing was stored for it, so it can be resubmitted
+                    result = {'success': False, 'status': 'error', 'idempotency_key': key, 'error': str(e)}
+                results.append(result)
+                results.extend({**result, 'replayed': True} for _ in range(duplicates[result['idempotency_key']]))
+            return results
+
+        chunks = [fresh[start:start + self.encrypt_chunk] for start in range(0, len(fresh), self.encrypt_chunk)]
+        encrypting = None
+        try:
+            # The next chunk is encrypted in a worker thread while the current one is being charged
+            encrypting = loop.run_in_executor(None, self._encrypt_chunk, chunks[0]) if chunks else None
+            for index, chunk in enumerate(chunks):
+                envelope = await encrypting
+                if index + 1 < len(chunks):
+                    encrypting = loop.run_in_executor(None, self._encrypt_chunk, chunks[index + 1])
+                for position, payment in enumerate(chunk):
+                    while active >= self.max_in_flight:
+                        await ready.wait()
+                        ready.clear()
+                        for result in drain():
+                            yield result
+                    task = asyncio.ensure_future(self._settle(payment, {**envelope, 'batch_index': position}))
+                    keys[task] = payment['idempotency_key']
+                    task.add_done_callback(finished)
+                    active += 1
+            while active:
+                await ready.wait()
+                ready.clear()
+                for result in drain():
+                    yield result
+        finally:
+            # Reached early when the consumer stops iterating or something above raised
+            for task in keys:
+                task.cancel()
+            await asyncio.gather(*keys, return_exceptions=True)
+            if encrypting is not None and not encrypting.done():
+                encrypting.cancel()
+            self.flush()
+
+    def _prepare(self, payment: Dict[str, Any]) -> Dict[str, Any]:
+        return {**payment, 'amount': float(payment['amount']),
+                'idempotency_key': payment.get('idempotency_key') or secrets.token_hex(16)}
+
+    @instrumented('payment_processor')
+    def _encrypt_chunk(self, chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+        # One Fernet token per chunk instead of one per payment; results point into it by batch_index
+        return self.security.secure_api_call('payment_batch', [payment.get('user_data', {}) for payment in chunk])
+
+    async def _settle(self, payment: Dict[str, Any], encrypted_reference: Dict[str, Any]) -> Dict[str, Any]:
+        key = payment['idempotency_key']
+        waiting = self._in_flight.get(key)
+        if waiting is not None:
+            return {**(await asyncio.shield(waiting)), 'replayed': True}
+        stored = self._lookup([key])
+        if stored:
+            return {**stored[key], 'replayed': True}
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._charge(payment, encrypted_reference)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    @instrumented('payment_processor')
+    async def _charge(self, payment: Dict[str, Any], encrypted_reference: Dict[str, Any]) -> Dict[str, Any]:
+        started = time.perf_counter()
+        method, amount = payment['method'], payment['amount']
+        gateway = self.gateways.get(method)
+        if gateway is None:
+            charge = {'success': False, 'status': 'unsupported_method', 'gateway': None, 'attempts': 0}
+        else:
+            charge = await gateway.charge(payment)
+        fee = gateway.fee_for(amount) if gateway is not None and charge['success'] else 0.0
+        processed_at = datetime.now()
+        token = secrets.token_hex(8)
+        result = {
+            'success': charge['success'],
+            'status': charge['status'],
+            'transaction_id': f"txn_{processed_at.strftime('%Y%m%d')}_{token}",
+            'idempotency_key': payment['idempotency_key'],
             'amount': amount,
+            'fee': fee,
             'method': method,
-            'encrypted_reference': encrypted_data,
-            'processed_at': datetime.now().isoformat(),
+            'gateway': charge['gateway'],
+            'gateway_reference': charge.get('gateway_reference'),
+            'attempts': charge['attempts'],
+            'encrypted_reference': encrypted_reference,
+            'processed_at': processed_at.isoformat(),
             'currency': 'ZAR',
-            'exchange_rate': 1.0
+            'exchange_rate': 1.0,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 3)
         }
+        if charge.get('error'):
+            result['error'] = charge['error']
+        # Transport errors never reached a decision, so they are neither booked nor remembered and can be retried
+        if charge['status'] != 'error':
+            self.ledger.append(KIND_PAYMENT, amount, processed_at.timestamp(), fee=fee, code=self._method_code(method),
+                               status=STATUS_OK if charge['success'] else STATUS_FAILED,
+                               reference=bytes.fromhex(token))
+            self._remember(result)
+        return result
+
+    def _lookup(self, keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        found = {}
+        for start in range(0, len(keys), SQLITE_MAX_PARAMS):
+            chunk = list(keys[start:start + SQLITE_MAX_PARAMS])
+            rows = self.db.execute(
+                f"SELECT idempotency_key, result FROM payment_results WHERE idempotency_key IN ({','.join('?' * len(chunk))})",
+                chunk
+            )
+            found.update((key, json.loads(result)) for key, result in rows)
+        return found
+
+    def _remember(self, result: Dict[str, Any]):
+        # The per-chunk encryption envelope is not kept; a replay returns the charge outcome only
+        stored = {k: v for k, v in result.items() if k != 'encrypted_reference'}
+        with self.db:
+            self.db.execute('INSERT OR REPLACE INTO payment_results (idempotency_key, result) VALUES (?, ?)',
+                            (result['idempotency_key'], json.dumps(stored)))
+
+    @instrumented('payment_processor')
+    def flush(self):
+        self.ledger.flush()
+
+    def _method_code(self, method: str) -> int:
+        return self.PAYMENT_METHODS.index(method) if method in self.PAYMENT_METHODS else 0
+
+    def close(self):
+        self.flush()
+        self.db.close()
     
     async def get_payment_methods(self) -> List[Dict[str, Any]]:
         return [
@@ -140,36 +455,70 @@ class PaymentProcessor:
         ]
 
 class PayoutAgent:
-    def __init__(self):
+    PAYOUT_ACCOUNTS = ('unknown', 'owner', 'ai_fund')
+
+    def __init__(self, ledger: Optional[Ledger] = None, history_limit: int = 52):
         self.security = MilitaryGradeSecurity()
-        self.owner_account = self.security.encrypt_sensitive_data("FNB_ACCOUNT_OWNER_12345")
-        self.ai_fund_account = self.security.encrypt_sensitive_data("FNB_ACCOUNT_AI_FUND_67890")
-        self.payout_history = []
-        
-    async def weekly_payout(self, total_revenue: float) -> Dict[str, Any]:
+        self.ledger = ledger if ledger is not None else get_ledger()
+        self.history_limit = history_limit
+        self._masked_accounts: Dict[str, Tuple[str, str]] = {}
+        self.owner_account = self._load_account('owner', "FNB_ACCOUNT_OWNER_12345")
+        self.ai_fund_account = self._load_account('ai_fund', "FNB_ACCOUNT_AI_FUND_67890")
+
+    def _load_account(self, name: str, account_number: str) -> str:
+        # The masked suffix is derived once here so payouts never decrypt the account
+        encrypted = self.security.encrypt_sensitive_data(account_number)
+        self._masked_accounts[encrypted] = (name, '***' + account_number[-4:])
+        return encrypted
+
+    @property
+    def payout_history(self) -> List[Dict[str, Any]]:
+        payouts = self.ledger.latest(KIND_PAYOUT, self.history_limit)
+        return [{
+            'account': self.PAYOUT_ACCOUNTS[record['code']] if record['code'] < len(self.PAYOUT_ACCOUNTS) else 'unknown',
+            'amount': int(record['amount']) / 100,
+            'fee': int(record['fee']) / 100,
+            'paid_at': datetime.fromtimestamp(record['timestamp']).isoformat()
+        } for record in payouts]
+
+    @instrumented('payout_agent')
+    async def weekly_payout(self, total_revenue: Optional[float] = None, now: Optional[datetime] = None) -> Dict[str, Any]:
+        now = now or datetime.now()
+        if total_revenue is None:
+            # Revenue for the trailing week is a range scan over the mapped ledger
+            total_revenue = self.ledger.totals(now - timedelta(days=7), now, kind=KIND_PAYMENT)['amount']
         owner_share = total_revenue * 0.60
         ai_fund_share = total_revenue * 0.20
         operational_costs = total_revenue * 0.20
         
         payout_result = {
-            'owner_payout': await self._process_payout(self.owner_account, owner_share),
-            'ai_fund_payout': await self._process_payout(self.ai_fund_account, ai_fund_share),
+            'owner_payout': await self._process_payout(self.owner_account, owner_share, now),
+            'ai_fund_payout': await self._process_payout(self.ai_fund_account, ai_fund_share, now),
             'reinvestment': operational_costs,
-            'payout_date': datetime.now().isoformat(),
+            'payout_date': now.isoformat(),
             'total_revenue': total_revenue,
-            'next_payout_date': (datetime.now() + timedelta(days=7)).isoformat()
+            'next_payout_date': (now + timedelta(days=7)).isoformat()
         }
-        
-        self.payout_history.append(payout_result)
+        self.ledger.flush()
         return payout_result
     
-    async def _process_payout(self, encrypted_account: str, amount: float) -> Dict:
+    @instrumented('payout_agent')
+    async def _process_payout(self, encrypted_account: str, amount: float, now: Optional[datetime] = None) -> Dict:
         # Simulate bank payout processing
+        now = now or datetime.now()
+        account = self._masked_accounts.get(encrypted_account)
+        if account is None:
+            # An account not set up through _load_account: decrypted once, then served from the cache
+            account_number = self.security.decrypt_sensitive_data(encrypted_account)
+            account = self._masked_accounts[encrypted_account] = ('unknown', '***' + account_number[-4:])
+        name, masked = account
+        fee = max(amount * 0.015, 5.0)  # 1.5% or R5 minimum
+        self.ledger.append(KIND_PAYOUT, amount, now.timestamp(), fee=fee, code=self.PAYOUT_ACCOUNTS.index(name))
         return {
             'status': 'processed',
             'amount': round(amount, 2),
-            'to_account': '***' + self.security.decrypt_sensitive_data(encrypted_account)[-4:],
-            'reference': f"PAYOUT_{datetime.now().strftime('%Y%m%d')}",
-            'fee': max(amount * 0.015, 5.0),  # 1.5% or R5 minimum
-            'net_amount': round(amount - max(amount * 0.015, 5.0), 2)
+            'to_account': masked,
+            'reference': f"PAYOUT_{now.strftime('%Y%m%d')}",
+            'fee': fee,
+            'net_amount': round(amount - fee, 2)
         }
@@ -1,12 +1,35 @@
 import json
 import asyncio
+import time
+from collections import defaultdict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
 import hashlib
 import secrets
 
+from utils.instrumentation import instrumented, registry
+from utils.keyword_automaton import KeywordClassifier
+
+COMPLEXITY_KEYWORDS = {
+    'high': ['complex', 'strategic', 'multiple', 'integrate', 'analyze'],
+    'medium': ['create', 'generate', 'process', 'manage'],
+    'low': ['simple', 'basic', 'single', 'update']
+}
+COMPLEXITY_WEIGHTS = {'high': 1.0, 'medium': 0.5, 'low': 0.2}
+
+CAPABILITY_KEYWORDS = {
+    'data_analysis': ['analyze', 'process', 'statistics', 'trends'],
+    'content_creation': ['create', 'write', 'generate', 'content'],
+    'social_media': ['post', 'social', 'tiktok', 'instagram', 'facebook'],
+    'web_development': ['website', 'responsive', 'frontend', 'backend'],
+    'payment_processing': ['payment', 'transaction', 'money', 'payout'],
+    'compliance': ['compliance', 'legal', 'regulation', 'popi'],
+    'security': ['security', 'encrypt', 'secure', 'protect']
+}
+
 @dataclass
 class Task:
     id: str
@@ -16,60 +39,316 @@ class Task:
     required_capabilities: List[str]
     created_at: datetime
 
+@dataclass
+class TaskResult:
+    task_id: str
+    status: str  # completed, failed, skipped, cancelled
+    result: Any = None
+    error: Optional[str] = None
+    agent: Optional[str] = None
+    capability: Optional[str] = None
+    started_at: float = 0.0
+    finished_at: float = 0.0
+    
+    @property
+    def duration(self) -> float:
+        return max(self.finished_at - self.started_at, 0.0)
+
 class AICapability(ABC):
+    # Capabilities this agent serves; agents without any are indexed under their registry name
+    capabilities: List[str] = []
+    cpu_bound: bool = False
+    
     @abstractmethod
     async def execute(self, task: Task) -> Any:
         pass
 
+class CPUBoundCapability(AICapability):
+    # compute() runs in a worker process, so the agent and its task must be picklable
+    cpu_bound = True
+    
+    @abstractmethod
+    def compute(self, task: Task) -> Any:
+        pass
+    
+    async def execute(self, task: Task) -> Any:
+        return self.compute(task)
+
+DEFAULT_WORKER_LIMIT = 4
+
+class TaskExecutor:
+    def __init__(self, agent_registry: Dict[str, AICapability], worker_limits: Optional[Dict[str, int]] = None,
+                 default_limit: int = DEFAULT_WORKER_LIMIT, process_pool: Optional[Executor] = None,
+                 max_process_workers: Optional[int] = None):
+        self.agent_registry = agent_registry
+        self.worker_limits = worker_limits or {}
+        self.default_limit = default_limit
+        self.capability_index: Dict[str, List[str]] = defaultdict(list)
+        for name, agent in agent_registry.items():
+            for capability in (agent.capabilities or [name]):
+                self.capability_index[capability].append(name)
+        self._next_agent: Dict[str, int] = defaultdict(int)
+        self._process_pool = process_pool
+        self._owns_pool = process_pool is None
+        self._max_process_workers = max_process_workers
+        self.stats: Dict[str, Any] = {}
+    
+    def _route(self, task: Task) -> Optional[Tuple[str, str]]:
+        for capability in task.required_capabilities:
+            agents = self.capability_index.get(capability)
+            if agents:
+                index = self._next_agent[capability]
+                self._next_agent[capability] = index + 1
+                return capability, agents[index % len(agents)]
+        return None
+    
+    def _pool(self) -> Executor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self._max_process_workers)
+        return self._process_pool
+    
+    def close(self):
+        if self._owns_pool and self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
+    
+    async def _execute(self, task: Task, capability: str, agent_name: str) -> TaskResult:
+        agent = self.agent_registry[agent_name]
+        started_at = time.perf_counter()
+        try:
+            if agent.cpu_bound:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self._pool(), agent.compute, task)
+            else:
+                result = await agent.execute(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return TaskResult(task.id, 'failed', error=f"{type(e).__name__}: {e}", agent=agent_name,
+                              capability=capability, started_at=started_at, finished_at=time.perf_counter())
+        return TaskResult(task.id, 'completed', result=result, agent=agent_name, capability=capability,
+                          started_at=started_at, finished_at=time.perf_counter())
+    
+    async def run(self, tasks: List[Task]) -> Dict[str, TaskResult]:
+        # Kahn's algorithm driven by completions: a task is launched only once its dependencies
+        # have completed and its capability has a free worker slot.
+        by_id = {task.id: task for task in tasks}
+        results: Dict[str, TaskResult] = {}
+        waiting_on: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        ready: Dict[str, deque] = defaultdict(deque)
+        in_flight: Dict[str, int] = defaultdict(int)
+        running: Dict[asyncio.Task, str] = {}
+        started = time.perf_counter()
+        
+        def settle(task_id: str, result: TaskResult):
+            results[task_id] = result
+            if result.status != 'completed':
+                # Failures propagate to every downstream task without running it
+                pending = deque(dependents.get(task_id, ()))
+                while pending:
+                    dependent = pending.popleft()
+                    if dependent not in results:
+                        results[dependent] = TaskResult(dependent, 'skipped', error=f"upstream {task_id} {result.status}")
+                        pending.extend(dependents.get(dependent, ()))
+                return
+            for dependent in dependents.get(task_id, ()):
+                waiting_on[dependent] -= 1
+                if waiting_on[dependent] == 0 and dependent not in results:
+                    enqueue(by_id[dependent])
+        
+        def enqueue(task: Task):
+            route = self._route(task)
+            if route is None:
+                settle(task.id, TaskResult(task.id, 'failed', error=f"no agent for {task.required_capabilities}"))
+            else:
+                ready[route[0]].append((task, route[1]))
+        
+        for task in tasks:
+            unknown = [dependency for dependency in task.dependencies if dependency not in by_id]
+            waiting_on[task.id] = len(task.dependencies)
+            for dependency in task.dependencies:
+                dependents[dependency].append(task.id)
+            if unknown:
+                results[task.id] = TaskResult(task.id, 'failed', error=f"unknown dependencies {unknown}")
+        for task in tasks:
+            if task.id in results:
+                settle(task.id, results[task.id])
+            elif waiting_on[task.id] == 0:
+                enqueue(task)
+        
+        # Completions are pushed by callbacks instead of re-scanning every running future with asyncio.wait
+        completed: deque = deque()
+        wakeup = asyncio.Event()
+        
+        def on_done(future: asyncio.Future):
+            completed.append(future)
+            wakeup.set()
+        
+        try:
+            while True:
+                for capability, queue in ready.items():
+                    limit = self.worker_limits.get(capability, self.default_limit)
+                    while queue and in_flight[capability] < limit:
+                        task, agent_name = queue.popleft()
+                        in_flight[capability] += 1
+                        future = asyncio.ensure_future(self._execute(task, capability, agent_name))
+                        future.add_done_callback(on_done)
+                        running[future] = capability
+                if not running:
+                    break
+                if not completed:
+                    wakeup.clear()
+                    await wakeup.wait()
+                while completed:
+                    finished = completed.popleft()
+                    in_flight[running.pop(finished)] -= 1
+                    result = finished.result()
+                    settle(result.task_id, result)
+        except asyncio.CancelledError:
+            for pending in running:
+                pending.cancel()
+            for task in tasks:
+                if task.id not in results:
+                    results[task.id] = TaskResult(task.id, 'cancelled', error='execution cancelled')
+            self._record_stats(tasks, results, started)
+            raise
+        
+        # Whatever never became ready is stuck behind a dependency cycle
+        for task in tasks:
+            if task.id not in results:
+                results[task.id] = TaskResult(task.id, 'failed', error='dependency cycle')
+        self._record_stats(tasks, results, started)
+        return results
+    
+    def _record_stats(self, tasks: List[Task], results: Dict[str, TaskResult], started: float):
+        statuses = defaultdict(int)
+        for result in results.values():
+            statuses[result.status] += 1
+        # Longest chain of measured durations through the DAG
+        path = {}
+        for task in self._topological_order(tasks):
+            upstream = max((path.get(dependency, 0.0) for dependency in task.dependencies), default=0.0)
+            result = results.get(task.id)
+            path[task.id] = upstream + (result.duration if result else 0.0)
+        self.stats = {
+            'tasks': len(tasks),
+            **statuses,
+            'wall_time_s': time.perf_counter() - started,
+            'critical_path_s': max(path.values(), default=0.0)
+        }
+    
+    @staticmethod
+    def _topological_order(tasks: List[Task]) -> List[Task]:
+        by_id = {task.id: task for task in tasks}
+        remaining = {task.id: sum(dependency in by_id for dependency in task.dependencies) for task in tasks}
+        dependents = defaultdict(list)
+        for task in tasks:
+            for dependency in task.dependencies:
+                dependents[dependency].append(task.id)
+        queue = deque(task_id for task_id, count in remaining.items() if count == 0)
+        order = []
+        while queue:
+            task_id = queue.popleft()
+            order.append(by_id[task_id])
+            for dependent in dependents[task_id]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    queue.append(dependent)
+        return order
+
+class TaskClassifier:
+    def __init__(self, complexity_keywords: Dict[str, List[str]] = COMPLEXITY_KEYWORDS,
+                 capability_keywords: Dict[str, List[str]] = CAPABILITY_KEYWORDS,
+                 complexity_weights: Dict[str, float] = COMPLEXITY_WEIGHTS):
+        # Both keyword tables compile into one automaton, so a description is scanned once
+        self.keywords = KeywordClassifier({'complexity': complexity_keywords, 'capability': capability_keywords})
+        self.complexity_weights = complexity_weights
+        self.capability_order = {capability: index for index, capability in enumerate(capability_keywords)}
+    
+    def classify(self, task: str) -> Tuple[str, List[str]]:
+        hits = self.keywords.classify(task)
+        score = sum(self.complexity_weights[level] * len(keywords) for level, keywords in hits['complexity'].items())
+        complexity = 'high' if score > 2 else 'medium' if score > 1 else 'low'
+        capabilities = sorted(hits['capability'], key=self.capability_order.__getitem__)
+        return complexity, capabilities or ['general_ai']
+
 class StrategicIntelligence:
-    def __init__(self):
+    classifier: Optional[TaskClassifier] = None
+    
+    def __init__(self, classifier: Optional[TaskClassifier] = None, process_pool: Optional[Executor] = None,
+                 max_process_workers: Optional[int] = None):
         self.agent_registry = {}
         self.task_queue = []
         self.knowledge_base = {}
-        self.performance_metrics = {}
+        self.worker_limits: Dict[str, int] = {}
+        self.execution_stats: Dict[str, Any] = {}
+        # One process pool for every execute_tasks() call, started on first CPU-bound task; close() stops it
+        self.max_process_workers = max_process_workers
+        self._process_pool = process_pool
+        self._owns_pool = process_pool is None
+        if classifier is not None:
+            self.classifier = classifier
+        elif StrategicIntelligence.classifier is None:
+            StrategicIntelligence.classifier = TaskClassifier()
         
+    @property
+    def process_pool(self) -> Executor:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.max_process_workers)
+        return self._process_pool
+    
+    def close(self):
+        if self._owns_pool and self._process_pool is not None:
+            self._process_pool.shutdown(cancel_futures=True)
+            self._process_pool = None
+    
+    @property
+    def performance_metrics(self) -> Dict[str, Any]:
+        return {**registry.component('strategic_intelligence'), 'last_execution': self.execution_stats}
+    
+    @instrumented('strategic_intelligence')
     async def analyze_task(self, task_description: str) -> Task:
-        task = Task(
+        return self._build_task(task_description)
+    
+    @instrumented('strategic_intelligence')
+    async def analyze_tasks(self, task_descriptions: List[str]) -> List[Task]:
+        return [self._build_task(description) for description in task_descriptions]
+    
+    def _build_task(self, task_description: str) -> Task:
+        complexity, capabilities = self.classifier.classify(task_description)
+        return Task(
             id=f"task_{len(self.task_queue)}_{secrets.token_hex(4)}",
             description=task_description,
-            complexity=self._assess_complexity(task_description),
+            complexity=complexity,
             dependencies=[],
-            required_capabilities=await self._determine_required_capabilities(task_description),
+            required_capabilities=capabilities,
             created_at=datetime.now()
         )
-        return task
     
     def _assess_complexity(self, task: str) -> str:
-        complexity_keywords = {
-            'high': ['complex', 'strategic', 'multiple', 'integrate', 'analyze'],
-            'medium': ['create', 'generate', 'process', 'manage'],
-            'low': ['simple', 'basic', 'single', 'update']
-        }
-        
-        task_lower = task.lower()
-        score = 0
-        for level, keywords in complexity_keywords.items():
-            for keyword in keywords:
-                if keyword in task_lower:
-                    score += 1 if level == 'high' else 0.5 if level == 'medium' else 0.2
-        
-        return 'high' if score > 2 else 'medium' if score > 1 else 'low'
+        return self.classifier.classify(task)[0]
     
     async def _determine_required_capabilities(self, task: str) -> List[str]:
-        capabilities_mapping = {
-            'data_analysis': ['analyze', 'process', 'statistics', 'trends'],
-            'content_creation': ['create', 'write', 'generate', 'content'],
-            'social_media': ['post', 'social', 'tiktok', 'instagram', 'facebook'],
-            'web_development': ['website', 'responsive', 'frontend', 'backend'],
-            'payment_processing': ['payment', 'transaction', 'money', 'payout'],
-            'compliance': ['compliance', 'legal', 'regulation', 'popi'],
-            'security': ['security', 'encrypt', 'secure', 'protect']
-        }
-        
-        required = []
-        task_lower = task.lower()
-        for capability, keywords in capabilities_mapping.items():
-            if any(keyword in task_lower for keyword in keywords):
-                required.append(capability)
-                
-        return required if required else ['general_ai']
+        return self.classifier.classify(task)[1]
+    
+    def register_agent(self, name: str, agent: AICapability, worker_limit: Optional[int] = None):
+        self.agent_registry[name] = agent
+        if worker_limit is not None:
+            for capability in (agent.capabilities or [name]):
+                self.worker_limits[capability] = worker_limit
+    
+    def enqueue_task(self, task: Task):
+        self.task_queue.append(task)
+    
+    @instrumented('strategic_intelligence')
+    async def execute_tasks(self, tasks: Optional[List[Task]] = None,
+                            process_pool: Optional[Executor] = None) -> Dict[str, TaskResult]:
+        tasks = self.task_queue if tasks is None else tasks
+        if process_pool is None and any(agent.cpu_bound for agent in self.agent_registry.values()):
+            process_pool = self.process_pool
+        executor = TaskExecutor(self.agent_registry, self.worker_limits, process_pool=process_pool)
+        results = await executor.run(tasks)
+        self.execution_stats = executor.stats
+        self.task_queue = [task for task in self.task_queue if task.id not in results]
+        return results
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from agents.social_media_automation import AnalyticsTracker
+from benchmarks.common import run_cli, stopwatch
+
+SAMPLES = {'small': 200000, 'medium': 2000000, 'large': 10000000}
+BATCH = 100000
+PLATFORMS = np.array(['tiktok', 'instagram', 'facebook', 'youtube', 'twitter', 'snapchat'])
+CAMPAIGNS = np.array([f"campaign_{i}" for i in range(50)])
+
+
+def _batch(rng: np.random.Generator, size: int, start: float, span: float) -> Dict[str, Any]:
+    views = rng.integers(0, 10000, size)
+    return {
+        'timestamp': np.sort(rng.uniform(start, start + span, size)),
+        'platform': PLATFORMS[rng.integers(0, len(PLATFORMS), size)],
+        'campaign': CAMPAIGNS[rng.integers(0, len(CAMPAIGNS), size)],
+        'views': views,
+        'likes': rng.integers(0, 2000, size),
+        'shares': rng.integers(0, 500, size),
+        'comments': rng.integers(0, 300, size),
+        'click_throughs': rng.integers(0, 800, size),
+        'conversions': rng.integers(0, 100, size),
+        'spend': rng.uniform(0, 50, size)
+    }
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    count = SAMPLES[scale]
+    now = time.time()
+    span = 7 * 86400 / (count // BATCH or 1)
+    batches = [_batch(rng, min(BATCH, count - offset), now - 7 * 86400 + index * span, span)
+               for index, offset in enumerate(range(0, count, BATCH))]
+    tracker = AnalyticsTracker()
+    timings = {}
+
+    with stopwatch(timings, 'ingest'):
+        for batch in batches:
+            tracker.ingest_samples(batch, now=now)
+    with stopwatch(timings, 'report'):
+        report = asyncio.run(tracker.generate_performance_report(now=now))
+    with stopwatch(timings, 'campaign_windows'):
+        tracker.performance_data.rolling(now=now, by=('platform', 'campaign'))
+
+    per_post = AnalyticsTracker()
+    loop_samples = min(20000, count)
+
+    async def track_one_by_one():
+        for index in range(loop_samples):
+            await per_post.track_engagement(str(PLATFORMS[index % len(PLATFORMS)]), f"post_{index}")
+
+    with stopwatch(timings, 'per_post'):
+        asyncio.run(track_one_by_one())
+
+    return {
+        'benchmark': 'analytics',
+        'scale': scale,
+        'cpu_bound': True,
+        'samples': count,
+        'ingest_samples_per_sec': round(count / timings['ingest']),
+        'report_ms': round(timings['report'] * 1000, 2),
+        'platform_campaign_windows_ms': round(timings['campaign_windows'] * 1000, 2),
+        'per_post_track_samples_per_sec': round(loop_samples / timings['per_post']),
+        'top_performing_platform': report['top_performing_platform']
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,138 @@
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from agents.application_queue import ApplicationQueue, EmployerRateLimited, EmployerUnavailable, QueueFull
+from benchmarks.common import percentile, run_cli
+
+BURST = {'small': 20000, 'medium': 100000, 'large': 300000}
+BULK_SIZE = 1000
+CLIENTS = 50
+EMPLOYERS = 2000
+EMPLOYER_LIMIT = {'rate': 200.0, 'burst': 20}
+MAX_CONCURRENCY = 256
+# Employer portal behaviour of the simulated submitter
+SUBMIT_LATENCY = 0.005
+UNAVAILABLE_RATE = 0.01
+THROTTLED_RATE = 0.005
+SEQUENTIAL_SAMPLE = 200
+BACKPRESSURE_LIMIT = 5000
+
+
+def _submitter(rng: random.Random):
+    async def submit(application: Dict[str, Any]) -> Dict[str, Any]:
+        await asyncio.sleep(SUBMIT_LATENCY)
+        roll = rng.random()
+        if roll < UNAVAILABLE_RATE:
+            raise EmployerUnavailable('HTTP 503')
+        if roll < UNAVAILABLE_RATE + THROTTLED_RATE:
+            raise EmployerRateLimited(application['employer'], 0.05)
+        return {'success': True, 'reference': f"ref_{application['job_id']}"}
+    return submit
+
+
+def _applications(rng: random.Random, count: int, prefix: str) -> List[Dict[str, Any]]:
+    # Skewed towards low-numbered employers, as popular listings draw more applications
+    return [{'job_id': f"{prefix}-{index}", 'user_id': f"user-{rng.randrange(count // 10 + 1)}",
+             'employer': f"employer-{int(EMPLOYERS * rng.random() ** 1.5)}"}
+            for index in range(count)]
+
+
+async def _burst(queue: ApplicationQueue, applications: List[Dict[str, Any]]) -> Dict[str, Any]:
+    bulks = [applications[offset:offset + BULK_SIZE] for offset in range(0, len(applications), BULK_SIZE)]
+    pending = iter(bulks)
+    accept_latencies = []
+    delivered = 0
+
+    async def client():
+        for bulk in pending:
+            start = time.perf_counter()
+            await queue.submit_many(bulk)
+            accept_latencies.append(time.perf_counter() - start)
+
+    async def watcher():
+        # One long-poll client following every status change until the queue drains
+        nonlocal delivered
+        since = 0
+        while True:
+            update = await queue.wait(since, timeout=1.0, limit=100000)
+            since = update['seq']
+            delivered += len(update['changes'])
+            if not update['pending'] and queue.counters['accepted'] + queue.counters['duplicates'] >= len(applications):
+                return
+
+    start = time.perf_counter()
+    watching = asyncio.create_task(watcher())
+    await asyncio.gather(*(client() for _ in range(CLIENTS)))
+    accepted = time.perf_counter() - start
+    await watching
+    drained = time.perf_counter() - start
+    return {'accepted_s': accepted, 'drained_s': drained, 'accept_latencies': accept_latencies,
+            'events_delivered': delivered}
+
+
+async def _run(scale: str, seed: int, directory: str) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    applications = _applications(rng, BURST[scale], 'job')
+
+    # The previous client flow: one awaited submission after another
+    submit = _submitter(random.Random(seed))
+    start = time.perf_counter()
+    for application in applications[:SEQUENTIAL_SAMPLE]:
+        try:
+            await submit(application)
+        except (EmployerUnavailable, EmployerRateLimited):
+            pass
+    sequential_rate = SEQUENTIAL_SAMPLE / (time.perf_counter() - start)
+
+    queue = ApplicationQueue(os.path.join(directory, 'applications.db'), submitter=_submitter(random.Random(seed)),
+                             default_limit=EMPLOYER_LIMIT, max_concurrency=MAX_CONCURRENCY, backoff_base=0.05,
+                             max_pending=len(applications), rng=random.Random(seed))
+    burst = await _burst(queue, applications)
+    stats = queue.stats()
+    await queue.close()
+
+    # Backpressure: a bounded queue turns an oversized burst away instead of growing without limit
+    bounded = ApplicationQueue(os.path.join(directory, 'bounded.db'), submitter=_submitter(random.Random(seed)),
+                               default_limit=EMPLOYER_LIMIT, max_pending=BACKPRESSURE_LIMIT)
+    rejected, retry_after = 0, 0.0
+    for offset in range(0, 4 * BACKPRESSURE_LIMIT, BULK_SIZE):
+        try:
+            await bounded.submit_many(_applications(rng, BULK_SIZE, f"bp{offset}"))
+        except QueueFull as e:
+            rejected += BULK_SIZE
+            retry_after = e.retry_after
+    await bounded.close()
+
+    return {
+        'benchmark': 'application_queue',
+        'scale': scale,
+        'reference': ['sequential_per_sec'],
+        'applications': len(applications),
+        'max_concurrency': MAX_CONCURRENCY,
+        'sequential_per_sec': round(sequential_rate),
+        'accepted_per_sec': round(len(applications) / burst['accepted_s']),
+        'accept_p50_ms': round(percentile(burst['accept_latencies'], 50) * 1000, 2),
+        'accept_p99_ms': round(percentile(burst['accept_latencies'], 99) * 1000, 2),
+        'processed_per_sec': round((stats['submitted'] + stats['failed']) / burst['drained_s']),
+        'drain_s': round(burst['drained_s'], 3),
+        'submitted': stats['submitted'],
+        'failed': stats['failed'],
+        'retries': stats['retries'],
+        'duplicates': stats['duplicates'],
+        'events_delivered': burst['events_delivered'],
+        'backpressure_rejected': rejected,
+        'backpressure_retry_after_s': round(retry_after, 2)
+    }
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        return asyncio.run(_run(scale, seed, directory))
+
+
+if __name__ == '__main__':
+    run_cli(run)
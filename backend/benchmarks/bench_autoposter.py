@@ -0,0 +1,62 @@
+import asyncio
+import random
+import time
+from typing import Any, Dict
+
+from agents.social_media_automation import AutoPoster
+from benchmarks.common import run_cli
+from benchmarks.stub_server import StubServer
+from utils.http_pool import HttpPool
+
+BATCHES = {'small': 1, 'medium': 5, 'large': 20}
+LEGACY_SLEEP = 2.0
+
+
+async def _run(scale: str, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    platforms = ['tiktok', 'instagram', 'facebook', 'youtube', 'twitter', 'snapchat']
+    delays = {platform: round(rng.uniform(0.05, 0.4), 3) for platform in platforms}
+    # twitter answers 429 once per run, so the batch also exercises Retry-After handling
+    async with StubServer(delays=delays, throttle={'twitter': 1}, retry_after=0.2) as stub, HttpPool() as pool:
+        unlimited = {platform: {'rate': 1000.0, 'burst': 1000} for platform in platforms}
+        poster = AutoPoster(rate_limits=unlimited, simulate=False, rng=rng, http_pool=pool,
+                            api_endpoints={platform: stub.url(platform) for platform in platforms},
+                            scheduler_db=':memory:')
+        await poster.initialize()
+        content = {platform: {'content': f"post for {platform}", 'addiction_score': 8.0} for platform in platforms}
+
+        batch_times = []
+        for _ in range(BATCHES[scale]):
+            start = time.perf_counter()
+            results = await poster.post_to_all_platforms(content)
+            batch_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for platform in platforms:
+            await poster._post_to_platform(platform, content[platform])
+        sequential = time.perf_counter() - start
+        await poster.close()
+
+    slowest = max(delays.values())
+    return {
+        'benchmark': 'autoposter',
+        'scale': scale,
+        'reference': ['sum_of_platforms_s', 'sequential_no_sleep_s', 'legacy_estimate_s'],
+        'platforms': len(platforms),
+        'all_succeeded': all(result['success'] for result in results.values()),
+        'slowest_platform_s': slowest,
+        'sum_of_platforms_s': round(sum(delays.values()), 3),
+        'first_batch_s': round(batch_times[0], 3),
+        'steady_batch_s': round(min(batch_times), 3),
+        'sequential_no_sleep_s': round(sequential, 3),
+        'legacy_estimate_s': round(sequential + LEGACY_SLEEP * len(platforms), 3),
+        'throttled_requests': stub.hits['twitter'] - BATCHES[scale] - 1
+    }
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    return asyncio.run(_run(scale, seed))
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Any, Dict
+
+import numpy as np
+
+from agents.social_media_automation import AnalyticsTracker
+from benchmarks.common import run_cli, stopwatch
+
+CAMPAIGNS = {'small': 100000, 'medium': 1000000, 'large': 5000000}
+PLATFORMS = np.array(['tiktok', 'instagram', 'facebook', 'youtube', 'twitter', 'snapchat'])
+
+
+def _campaign_columns(rng: np.random.Generator, count: int) -> Dict[str, np.ndarray]:
+    return {
+        'investment': rng.uniform(100, 20000, count),
+        'conversions': rng.integers(0, 500, count).astype(np.float64),
+        'lifetime_value': rng.uniform(20, 400, count),
+        'platform': PLATFORMS[rng.integers(0, len(PLATFORMS), count)],
+        'date': np.datetime64('2023-01-01') + rng.integers(0, 730, count).astype('timedelta64[D]')
+    }
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    count = CAMPAIGNS[scale]
+    columns = _campaign_columns(rng, count)
+    records = [{'investment': float(columns['investment'][i]), 'conversions': float(columns['conversions'][i]),
+                'lifetime_value': float(columns['lifetime_value'][i])} for i in range(count)]
+    tracker = AnalyticsTracker()
+    timings = {}
+
+    async def per_call():
+        return [await tracker.calculate_roi(record) for record in records]
+
+    with stopwatch(timings, 'per_call'):
+        expected = asyncio.run(per_call())
+    with stopwatch(timings, 'batch'):
+        batch = tracker.calculate_roi_batch(columns)
+    with stopwatch(timings, 'summary'):
+        summary = tracker.campaign_summary()
+
+    appended = 1000
+    tail = _campaign_columns(rng, appended)
+    tail['date'] = np.full(appended, np.datetime64('2024-12-31'))
+    with stopwatch(timings, 'append'):
+        tracker.calculate_roi_batch(tail)
+        tracker.campaign_summary()
+
+    return {
+        'benchmark': 'campaign_roi',
+        'scale': scale,
+        'cpu_bound': True,
+        'campaigns': count,
+        'per_call_campaigns_per_sec': round(count / timings['per_call']),
+        'batch_campaigns_per_sec': round(count / timings['batch']),
+        'speedup': round(timings['per_call'] / timings['batch'], 1),
+        'matches_per_call': bool(np.allclose(batch['roi'], expected)),
+        'groups': len(summary),
+        'summary_ms': round(timings['summary'] * 1000, 2),
+        'incremental_append_ms': round(timings['append'] * 1000, 2)
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,81 @@
+import asyncio
+import random
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from agents.south_africa_compliance import COMPLIANCE_RULES, SAComplianceAgent
+from benchmarks.common import run_cli, stopwatch
+
+RECORDS = {'small': 20000, 'medium': 200000, 'large': 1000000}
+EMPLOYERS = 500
+
+
+def _employer_records(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    fields = sorted({field for rule in COMPLIANCE_RULES for field in rule.fields})
+    # Transactions repeat a limited set of employers, each with a stable compliance profile
+    employers = [{field: True for field in fields if rng.random() < 0.85} for _ in range(EMPLOYERS)]
+    return [dict(employers[rng.randrange(EMPLOYERS)], transaction_id=i) for i in range(count)]
+
+
+async def _legacy_validate(data: Dict) -> Dict[str, Any]:
+    async def popi():
+        return all(field in data for field in ['privacy_policy', 'data_processing_agreement', 'user_consent'])
+
+    async def cpa():
+        return all([data.get('clear_pricing', False), data.get('refund_policy', False), data.get('terms_conditions', False)])
+
+    async def tax():
+        return data.get('tax_registered', False) and data.get('vat_number', False)
+
+    async def labor():
+        return data.get('employment_equity', False) and data.get('fair_labor_practices', False)
+
+    async def fica():
+        return data.get('customer_verification', False) and data.get('aml_policy', False)
+
+    results = {'popi_compliant': await popi(), 'cpa_compliant': await cpa(), 'tax_compliant': await tax(),
+               'labor_law_compliant': await labor(), 'fica_compliant': await fica()}
+    results['overall_compliance_score'] = round(sum(1 for value in results.values() if value) / 5 * 100, 2)
+    return results
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    count = RECORDS[scale]
+    records = _employer_records(rng, count)
+    frame = pd.DataFrame(records)
+    agent = SAComplianceAgent()
+    timings = {}
+
+    async def legacy():
+        return [await _legacy_validate(record) for record in records]
+
+    async def per_record():
+        return [await agent.validate_compliance(record) for record in records]
+
+    with stopwatch(timings, 'legacy'):
+        expected = asyncio.run(legacy())
+    with stopwatch(timings, 'per_record'):
+        asyncio.run(per_record())
+    with stopwatch(timings, 'validate_many'):
+        batch = agent.validate_many(records)
+    with stopwatch(timings, 'validate_frame'):
+        agent.validate_many(frame)
+
+    return {
+        'benchmark': 'compliance',
+        'scale': scale,
+        'cpu_bound': True,
+        'reference': ['legacy_records_per_sec'],
+        'records': count,
+        'legacy_records_per_sec': round(count / timings['legacy']),
+        'compiled_per_record_records_per_sec': round(count / timings['per_record']),
+        'validate_many_records_per_sec': round(count / timings['validate_many']),
+        'validate_frame_records_per_sec': round(count / timings['validate_frame']),
+        'scores_match_legacy': batch['scores'] == [result['overall_compliance_score'] for result in expected]
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
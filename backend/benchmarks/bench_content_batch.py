@@ -0,0 +1,95 @@
+import asyncio
+import random
+import secrets
+import time
+from typing import Any, Dict
+
+from agents.content_creation_agents import SocialMediaContentCreator
+from benchmarks.common import run_cli
+
+BATCH_SIZES = {'small': (1, 10, 100, 1000), 'medium': (1, 10, 100, 1000, 10000), 'large': (1, 100, 10000, 100000)}
+ROLES = ['Data Analyst', 'Nurse', 'Electrician', 'Accountant', 'Call Centre Agent', 'Software Developer', 'Teacher']
+CITIES = ['Johannesburg', 'Cape Town', 'Durban', 'Pretoria', 'Gqeberha', 'Bloemfontein']
+
+
+async def _previous_create_content(topic: str) -> Dict[str, Any]:
+    # The per-call implementation create_batch replaced: tables rebuilt and several awaits per platform,
+    # plus a fresh SystemRandom per virality estimate
+    async def content(platform):
+        return {platform_name: template.format(topic=topic)
+                for platform_name, template in SocialMediaContentCreator.CONTENT_TEMPLATES.items()}.get(platform)
+
+    async def optimal_time(platform):
+        return dict(SocialMediaContentCreator.OPTIMAL_TIMES).get(platform, '18:00-20:00')
+
+    async def hashtags():
+        return ['#JobSearchSA', '#CareerHack', '#GetHiredSA', '#SouthAfricaJobs'] + \
+            [f'#{topic.replace(" ", "")}', f'#{topic}Hack']
+
+    async def viral_potential():
+        return min(9.8, 7.5 + secrets.SystemRandom().uniform(0, 2.5))
+
+    elements = list(SocialMediaContentCreator.ADDICTIVE_ELEMENTS)
+    batch = {}
+    for platform, specs in SocialMediaContentCreator.PLATFORM_FORMATS.items():
+        batch[platform] = {
+            'content_type': specs['format'],
+            'content': await content(platform),
+            'addictive_elements': elements[:min(int(specs['addiction_factor']), len(elements))],
+            'optimal_post_time': await optimal_time(platform),
+            'hashtags': await hashtags(),
+            'call_to_action': secrets.choice(list(SocialMediaContentCreator.CTAS)),
+            'addiction_score': specs['addiction_factor'],
+            'viral_potential': await viral_potential()
+        }
+    return batch
+
+
+def _topics(count: int):
+    return [f"{ROLES[index % len(ROLES)]} Jobs in {CITIES[index % len(CITIES)]} {index}" for index in range(count)]
+
+
+def _rate(count: int, seconds: float) -> int:
+    return round(count / seconds) if seconds else 0
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    results: Dict[str, Any] = {'benchmark': 'content_batch', 'scale': scale, 'cpu_bound': True,
+                               'reference': ['previous_per_topic_topics_per_sec'],
+                               'platforms': len(SocialMediaContentCreator.PLATFORM_FORMATS)}
+    for size in BATCH_SIZES[scale]:
+        topics = _topics(size)
+        row = {}
+
+        async def previous():
+            for topic in topics:
+                await _previous_create_content(topic)
+
+        start = time.perf_counter()
+        asyncio.run(previous())
+        row['previous_per_topic_topics_per_sec'] = _rate(size, time.perf_counter() - start)
+
+        creator = SocialMediaContentCreator(rng=random.Random(seed))
+        start = time.perf_counter()
+        creator.create_batch(topics)
+        row['batch_topics_per_sec'] = _rate(size, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for _ in creator.iter_batch(topics):
+            pass
+        row['streamed_topics_per_sec'] = _rate(size, time.perf_counter() - start)
+
+        creator = SocialMediaContentCreator()
+        start = time.perf_counter()
+        creator.create_batch(topics)
+        row['batch_system_random_topics_per_sec'] = _rate(size, time.perf_counter() - start)
+        results[f'batch_{size}'] = row
+
+    first = SocialMediaContentCreator(rng=random.Random(seed)).create_batch(_topics(10))
+    second = SocialMediaContentCreator(rng=random.Random(seed)).create_batch(_topics(10))
+    results['seeded_reproducible'] = first == second
+    return results
+
+
+if __name__ == '__main__':
+    run_cli(run)
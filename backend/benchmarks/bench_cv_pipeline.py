@@ -0,0 +1,90 @@
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import cv2
+import numpy as np
+
+from agents.cv_analysis import CVAnalysisPipeline
+from benchmarks.common import run_cli
+
+CVS = {'small': 24, 'medium': 96, 'large': 400}
+LINES = ['Contact: thandi@example.co.za  Cell 082 555 0101', 'Professional Summary', 'Work Experience',
+         'Senior Accountant, Pretoria 2018 - 2024', 'Payroll, SAP, Pastel, Excel and bookkeeping',
+         'Education: BCom Accounting, Matric', 'Skills: leadership, communication, data analysis', 'References']
+
+
+def _scan(rng: np.random.Generator, index: int) -> np.ndarray:
+    # A4 page at ~150 dpi with slightly rotated text, like a phone or flatbed scan
+    page = np.full((1754, 1240), 255, dtype=np.uint8)
+    for line in range(40):
+        cv2.putText(page, f"{LINES[line % len(LINES)]} {index}-{line}", (80, 100 + line * 40),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, 0, 2)
+    matrix = cv2.getRotationMatrix2D((620, 877), float(rng.uniform(-4, 4)), 1.0)
+    page = cv2.warpAffine(page, matrix, (1240, 1754), borderValue=255)
+    noise = rng.integers(0, 40, page.shape, dtype=np.uint8)
+    return cv2.subtract(page, noise)
+
+
+def _pdf_with_jpeg(jpeg: bytes) -> bytes:
+    return (b"%PDF-1.4\n1 0 obj\n<< /Type /XObject /Subtype /Image /Width 1240 /Height 1754 "
+            b"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /DCTDecode /Length "
+            + str(len(jpeg)).encode() + b" >>\nstream\n" + jpeg + b"\nendstream\nendobj\n%%EOF\n")
+
+
+def _write_cvs(rng: np.random.Generator, directory: str, count: int) -> List[str]:
+    paths = []
+    for index in range(count):
+        kind = index % 4
+        if kind == 3:
+            path = os.path.join(directory, f'cv{index}.txt')
+            with open(path, 'w') as handle:
+                handle.write('\n'.join(LINES * 20) + f'\n{index}')
+        elif kind == 2:
+            path = os.path.join(directory, f'cv{index}.pdf')
+            with open(path, 'wb') as handle:
+                handle.write(_pdf_with_jpeg(cv2.imencode('.jpg', _scan(rng, index))[1].tobytes()))
+        else:
+            path = os.path.join(directory, f'cv{index}.png')
+            cv2.imwrite(path, _scan(rng, index))
+        paths.append(path)
+    return paths
+
+
+async def _analyze_all(pipeline: CVAnalysisPipeline, paths: List[str]):
+    return await asyncio.gather(*(pipeline.analyze_path(path) for path in paths))
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    count = CVS[scale]
+    cores = os.cpu_count() or 1
+    results: Dict[str, Any] = {'benchmark': 'cv_pipeline', 'scale': scale, 'cpu_bound': True, 'cvs': count,
+                               'cpu_count': cores}
+    with tempfile.TemporaryDirectory() as directory:
+        paths = _write_cvs(rng, directory, count)
+        for workers in sorted({1, 4, cores}):
+            pipeline = CVAnalysisPipeline(upload_dir=directory, max_workers=workers)
+            # Warm the pool so process start-up is not billed to the first batch
+            asyncio.run(pipeline.analyze_path(paths[-1]))
+            pipeline._cache.clear()
+            start = time.perf_counter()
+            analyses = asyncio.run(_analyze_all(pipeline, paths))
+            elapsed = time.perf_counter() - start
+            results[f'cvs_per_sec_{workers}_workers'] = round(count / elapsed, 2)
+
+            start = time.perf_counter()
+            asyncio.run(_analyze_all(pipeline, paths))
+            results[f'cached_cvs_per_sec_{workers}_workers'] = round(count / (time.perf_counter() - start))
+            stats = pipeline.stats()
+            pipeline.close()
+        results['stage_mean_ms'] = {stage: round(stats['stages'][stage]['mean'] * 1000, 2)
+                                    for stage in ('decode', 'deskew', 'ocr_prep', 'extract')}
+        results['mean_overall_score'] = round(float(np.mean([analysis['overall_score'] for analysis in analyses])), 1)
+    return results
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,100 @@
+import asyncio
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from agents.document_generation import DocumentGenerator
+from benchmarks.common import percentile, run_cli
+from utils.generation_cache import GenerationCache
+
+REQUESTS = {'small': 5000, 'medium': 50000, 'large': 200000}
+LISTINGS = 300
+CV_VARIANTS = 8
+CONCURRENCY = 64
+# Stand-in for model latency; the template renderer itself takes microseconds
+GENERATION_SECONDS = 0.02
+SKILLS = ['python', 'sql', 'excel', 'sap', 'payroll', 'sales', 'nursing', 'logistics', 'aws', 'marketing']
+
+
+class SlowGenerator(DocumentGenerator):
+    def __init__(self, cache: GenerationCache):
+        super().__init__(cache)
+        self.generations = 0
+
+    async def render_cover_letter(self, *args, **kwargs) -> Dict[str, Any]:
+        self.generations += 1
+        await asyncio.sleep(GENERATION_SECONDS)
+        return await super().render_cover_letter(*args, **kwargs)
+
+
+def _workload(rng: np.random.Generator, count: int) -> List[Tuple[str, Dict[str, Any]]]:
+    # Popular listings get most applications (Zipf), and descriptions differ only in whitespace noise
+    listing_weights = 1.0 / np.arange(1, LISTINGS + 1) ** 1.1
+    listings = rng.choice(LISTINGS, size=count, p=listing_weights / listing_weights.sum())
+    variants = rng.integers(0, CV_VARIANTS, count)
+    noise = rng.random(count)
+    workload = []
+    for listing, variant, jitter in zip(listings, variants, noise):
+        description = (f"We are hiring for the position of Analyst {listing} at Company {listing % 50}. "
+                       f"Requires {SKILLS[listing % 10]} and {SKILLS[(listing + 3) % 10]}.")
+        if jitter < 0.3:
+            description = description.replace(' ', '  ')
+        cv = {'name': f'Candidate {variant}', 'skills': [SKILLS[variant % 10], SKILLS[(variant * 7) % 10]],
+              'timings': {'decode': float(jitter)}}
+        workload.append((description, cv))
+    return workload
+
+
+async def _replay(generator: DocumentGenerator, workload, cached: bool) -> List[float]:
+    latencies = []
+    queue = iter(workload)
+
+    async def client():
+        for description, cv in queue:
+            start = time.perf_counter()
+            if cached:
+                await generator.generate_cover_letter(description, cv)
+            else:
+                await generator.render_cover_letter(description, cv, 'professional', 'medium')
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(client() for _ in range(CONCURRENCY)))
+    await generator.cache.flush()
+    return latencies
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    workload = _workload(rng, REQUESTS[scale])
+    results: Dict[str, Any] = {'benchmark': 'generation_cache', 'scale': scale, 'reference': ['uncached'],
+                               'requests': len(workload), 'concurrency': CONCURRENCY}
+    with tempfile.TemporaryDirectory() as directory:
+        generator = SlowGenerator(GenerationCache(max_entries=2048, disk_dir=directory))
+        # Cold replays start from an empty cache; the warm replay is a fresh draw from the same traffic
+        for mode, cached, requests in (('uncached', False, workload), ('cached_cold', True, workload),
+                                       ('cached_warm', True, _workload(rng, len(workload)))):
+            generations = generator.generations
+            start = time.perf_counter()
+            latencies = asyncio.run(_replay(generator, requests, cached=cached))
+            elapsed = time.perf_counter() - start
+            results[mode] = {
+                'generations': generator.generations - generations,
+                'requests_per_sec': round(len(requests) / elapsed),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 3)
+            }
+        results['cache_stats'] = generator.cache_stats()
+
+        # A fresh process with an empty memory tier is served from disk
+        restarted = SlowGenerator(GenerationCache(max_entries=2048, disk_dir=directory))
+        asyncio.run(_replay(restarted, workload[:1000], cached=True))
+        results['after_restart'] = {'generations': restarted.generations,
+                                    'disk_hits': restarted.cache_stats()['disk_hits']}
+    return results
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,87 @@
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import aiohttp
+
+from benchmarks.common import percentile, run_cli
+from benchmarks.stub_server import StubServer
+from utils.http_pool import HttpPool
+
+REQUESTS = {'small': 500, 'medium': 5000, 'large': 20000}
+CONCURRENCY = 50
+BATCH = 100
+
+
+async def _unpooled(url: str, count: int) -> List[float]:
+    # The old pattern: a throwaway session, so every request pays a fresh TCP handshake
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            async with aiohttp.ClientSession() as session:
+                async with session.post(url, json={'n': 1}) as response:
+                    await response.read()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies
+
+
+async def _pooled(pool: HttpPool, url: str, count: int) -> List[float]:
+    session = await pool.start()
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            async with session.post(url, json={'n': 1}) as response:
+                await response.read()
+            latencies.append(time.perf_counter() - start)
+
+    # Several batches so connections are reused across them, like AutoPoster batches
+    for offset in range(0, count, BATCH):
+        await asyncio.gather(*(one() for _ in range(min(BATCH, count - offset))))
+    return latencies
+
+
+async def _run(scale: str) -> Dict[str, Any]:
+    count = REQUESTS[scale]
+    async with StubServer(default_delay=0.002) as stub:
+        url = stub.url('post')
+
+        start = time.perf_counter()
+        unpooled = await _unpooled(url, count)
+        unpooled_elapsed = time.perf_counter() - start
+
+        async with HttpPool(limit=CONCURRENCY, limit_per_host=CONCURRENCY) as pool:
+            start = time.perf_counter()
+            pooled = await _pooled(pool, url, count)
+            pooled_elapsed = time.perf_counter() - start
+            stats = pool.stats()
+
+    return {
+        'benchmark': 'http_pool',
+        'scale': scale,
+        'reference': ['unpooled_requests_per_sec', 'unpooled_p99_ms'],
+        'requests': count,
+        'unpooled_requests_per_sec': round(count / unpooled_elapsed),
+        'unpooled_p99_ms': round(percentile(unpooled, 99) * 1000, 2),
+        'pooled_requests_per_sec': round(count / pooled_elapsed),
+        'pooled_p99_ms': round(percentile(pooled, 99) * 1000, 2),
+        'pool_connections_created': stats['connections_created'],
+        'pool_connections_reused': stats['connections_reused'],
+        'pool_idle_connections': stats['idle_connections'],
+        'pool_latency': stats['latency']
+    }
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    return asyncio.run(_run(scale))
+
+
+if __name__ == '__main__':
+    run_cli(run)
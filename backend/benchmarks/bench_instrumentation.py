@@ -0,0 +1,78 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+from benchmarks.common import run_cli
+from utils import instrumentation
+from utils.instrumentation import SamplingProfiler, instrumented, registry
+
+CALLS = {'small': 200000, 'medium': 1000000, 'large': 5000000}
+SPIN = 20000
+
+
+def _plain(value: int) -> int:
+    return value + 1
+
+
+async def _plain_async(value: int) -> int:
+    return value + 1
+
+
+_measured = instrumented('benchmark', 'sync')(_plain)
+_measured_async = instrumented('benchmark', 'async')(_plain_async)
+
+
+def _per_call_ns(func, calls: int) -> float:
+    start = time.perf_counter()
+    for value in range(calls):
+        func(value)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+async def _per_await_ns(func, calls: int) -> float:
+    start = time.perf_counter()
+    for value in range(calls):
+        await func(value)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def _spin() -> float:
+    start = time.perf_counter()
+    total = 0
+    for value in range(SPIN * 50):
+        total += value * value
+    return time.perf_counter() - start
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    calls = CALLS[scale]
+    results: Dict[str, Any] = {'benchmark': 'instrumentation', 'scale': scale, 'cpu_bound': True,
+                               'reference': ['sync_raw_ns', 'async_raw_ns'], 'calls': calls}
+    was_enabled = instrumentation.is_enabled()
+    try:
+        results['sync_raw_ns'] = round(_per_call_ns(_plain, calls), 1)
+        instrumentation.disable()
+        results['sync_disabled_ns'] = round(_per_call_ns(_measured, calls), 1)
+        results['async_disabled_ns'] = round(asyncio.run(_per_await_ns(_measured_async, calls)), 1)
+        instrumentation.enable()
+        results['sync_enabled_ns'] = round(_per_call_ns(_measured, calls), 1)
+        results['async_raw_ns'] = round(asyncio.run(_per_await_ns(_plain_async, calls)), 1)
+        results['async_enabled_ns'] = round(asyncio.run(_per_await_ns(_measured_async, calls)), 1)
+    finally:
+        (instrumentation.enable if was_enabled else instrumentation.disable)()
+
+    start = time.perf_counter()
+    registry.prometheus()
+    results['prometheus_export_ms'] = round((time.perf_counter() - start) * 1000, 3)
+
+    # CPU-bound work slowed by the sampler thread taking the GIL every interval
+    baseline = min(_spin() for _ in range(3))
+    with SamplingProfiler() as profiler:
+        profiled = min(_spin() for _ in range(3))
+    results['profiler_samples'] = profiler.samples
+    results['profiler_slowdown_pct'] = round((profiled / baseline - 1) * 100, 2)
+    return results
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+import main
+from agents.job_feed import JobFeed, encode_cursor
+from benchmarks.common import percentile, run_cli, stopwatch
+from benchmarks.datasets import jobs as generate_jobs
+from utils.http_cache import EncodedBodyCache
+
+JOBS = {'small': 20000, 'medium': 200000, 'large': 1000000}
+CLIENTS = {'small': 16, 'medium': 32, 'large': 64}
+PAGES_PER_CLIENT = {'small': 10, 'medium': 20, 'large': 20}
+PAGE_SIZE = 20
+STREAM_JOBS = 5000
+DEEP_PAGE_PROBES = 50
+# Filter mix of a browsing session: unfiltered, by province, province + type, minimum salary
+FILTERS = [{}, {'province': 'gauteng'}, {'province': 'western-cape', 'type': 'full-time'},
+           {'min_salary': 50000}, {'province': 'gauteng', 'type': 'contract', 'min_salary': 30000}]
+
+
+async def _walk(client: httpx.AsyncClient, filters: Dict[str, Any], pages: int, headers: Dict[str, str],
+                latencies: List[float], etags: List[Tuple[str, str]]) -> Tuple[int, int]:
+    # One client paging forward with next_cursor; returns (requests, body bytes on the wire)
+    requests = wire = 0
+    cursor = None
+    for _ in range(pages):
+        params = {**filters, 'limit': PAGE_SIZE, **({'cursor': cursor} if cursor else {})}
+        start = time.perf_counter()
+        response = await client.get('/api/v1/jobs', params=params, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        requests += 1
+        wire += int(response.headers.get('content-length', len(response.content)))
+        etags.append((str(response.request.url), response.headers['etag']))
+        cursor = response.json()['data']['next_cursor']
+        if not cursor:
+            break
+    return requests, wire
+
+
+async def _load(clients: int, pages: int, headers: Dict[str, str]) -> Dict[str, Any]:
+    latencies: List[float] = []
+    etags: List[Tuple[str, str]] = []
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://feed') as client:
+        start = time.perf_counter()
+        walked = await asyncio.gather(*(_walk(client, FILTERS[index % len(FILTERS)], pages, headers, latencies, etags)
+                                        for index in range(clients)))
+        elapsed = time.perf_counter() - start
+
+        # Revisits: every page again with its ETag, as a browser revalidating would
+        revalidations = []
+        start = time.perf_counter()
+        for url, etag in etags:
+            response = await client.get(url, headers={**headers, 'If-None-Match': etag})
+            revalidations.append(response.status_code)
+        revalidate_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        streamed = 0
+        async with client.stream('GET', '/api/v1/jobs', params={'format': 'ndjson', 'limit': STREAM_JOBS},
+                                 headers=headers) as response:
+            async for line in response.aiter_lines():
+                streamed += bool(line)
+        stream_elapsed = time.perf_counter() - start
+
+    requests = sum(count for count, _ in walked)
+    return {
+        'requests': requests,
+        'requests_per_sec': round(requests / elapsed),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'bytes_per_page': round(sum(wire for _, wire in walked) / requests),
+        'revalidate_per_sec': round(len(revalidations) / revalidate_elapsed),
+        'revalidation_hit_ratio': round(revalidations.count(304) / len(revalidations), 3),
+        'ndjson_jobs_per_sec': round(streamed / stream_elapsed)
+    }
+
+
+def _page_ms(feed: JobFeed, query_args: Dict[str, Any]) -> float:
+    samples = []
+    for _ in range(DEEP_PAGE_PROBES):
+        start = time.perf_counter()
+        feed.render_page(feed.query(**query_args))
+        samples.append(time.perf_counter() - start)
+    return round(percentile(samples, 50) * 1000, 3)
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    end = time.time()
+    listings = generate_jobs(rng, JOBS[scale], end - 60 * 86400, end)
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        feed = JobFeed(os.path.join(directory, 'feed.db'))
+        with stopwatch(timings, 'load'):
+            for offset in range(0, len(listings), 10000):
+                feed.upsert_many(listings[offset:offset + 10000])
+        main.agent_registry.set('job_feed', feed)
+
+        # What the client used to fetch and hold: every listing in one array
+        full_list = json.dumps({'success': True, 'data': listings}, separators=(',', ':')).encode()
+        with stopwatch(timings, 'full_list'):
+            json.dumps({'success': True, 'data': listings}, separators=(',', ':'))
+
+        # Keyset pages cost the same at any depth: first page vs one ~90% of the way down
+        oldest = sorted(listings, key=lambda job: (job['posted_at'], job['id']))[len(listings) // 10]
+        first_page_ms = _page_ms(feed, {})
+        deep_page_ms = _page_ms(feed, {'cursor': encode_cursor(oldest['posted_at'], oldest['id'])})
+
+        identity = asyncio.run(_load(CLIENTS[scale], PAGES_PER_CLIENT[scale], {'Accept-Encoding': 'identity'}))
+        main.feed_bodies = EncodedBodyCache()
+        compressed = asyncio.run(_load(CLIENTS[scale], PAGES_PER_CLIENT[scale], {'Accept-Encoding': 'gzip'}))
+        cache = main.feed_bodies.stats()
+        feed.close()
+
+    return {
+        'benchmark': 'job_feed',
+        'scale': scale,
+        'cpu_bound': ['first_page_ms', 'deep_page_ms'],
+        'reference': ['full_list_serialize_ms'],
+        'jobs': len(listings),
+        'load_jobs_per_sec': round(len(listings) / timings['load']),
+        'full_list_bytes': len(full_list),
+        'full_list_serialize_ms': round(timings['full_list'] * 1000, 1),
+        'first_page_ms': first_page_ms,
+        'deep_page_ms': deep_page_ms,
+        'identity': identity,
+        'gzip': compressed,
+        'gzip_compression_ratio': round(identity['bytes_per_page'] / compressed['bytes_per_page'], 2),
+        'body_cache': cache
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
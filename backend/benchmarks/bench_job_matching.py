@@ -0,0 +1,98 @@
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from agents.job_matching import CITY_PROVINCES, JobMatchingEngine
+from benchmarks.common import percentile, run_cli, stopwatch
+
+LISTINGS = {'small': 50000, 'medium': 1000000, 'large': 2000000}
+QUERIES = 500
+SKILLS = ['python', 'java', 'javascript', 'sql', 'excel', 'sales', 'marketing', 'accounting', 'nursing', 'welding',
+          'driving', 'project management', 'customer service', 'react', 'aws', 'data analysis', 'teaching',
+          'bookkeeping', 'electrical', 'plumbing', 'logistics', 'recruitment', 'payroll', 'autocad', 'sap'] + \
+         [f'skill{index}' for index in range(975)]
+INDUSTRIES = ['technology', 'finance', 'healthcare', 'retail', 'mining', 'manufacturing', 'education', 'logistics']
+TITLES = ['Developer', 'Analyst', 'Manager', 'Consultant', 'Technician', 'Officer', 'Specialist', 'Coordinator']
+CITIES = list(CITY_PROVINCES)
+
+
+def _jobs(rng: np.random.Generator, count: int, offset: int = 0):
+    # Skill popularity is Zipf-like, as in real listings
+    weights = 1.0 / np.arange(1, len(SKILLS) + 1)
+    weights /= weights.sum()
+    skill_ids = rng.choice(len(SKILLS), size=(count, 5), p=weights)
+    cities = rng.integers(0, len(CITIES), count)
+    industries = rng.integers(0, len(INDUSTRIES), count)
+    titles = rng.integers(0, len(TITLES), count)
+    salaries = rng.integers(8, 120, count) * 1000
+    experience = rng.integers(0, 10, count)
+    for index in range(count):
+        skills = [SKILLS[skill] for skill in set(skill_ids[index])]
+        yield {
+            'id': f'job-{offset + index}',
+            'title': f'{skills[0].title()} {TITLES[titles[index]]}',
+            'company': f'Company {index % 5000}',
+            'location': CITIES[cities[index]].title(),
+            'industry': INDUSTRIES[industries[index]],
+            'salary_min': int(salaries[index]),
+            'salary_max': int(salaries[index] * 1.3),
+            'experience_min': int(experience[index]),
+            'skills': skills,
+            'description': f"{TITLES[titles[index]]} role using {' and '.join(skills)}"
+        }
+
+
+def _queries(rng: np.random.Generator, count: int) -> List[Dict[str, Any]]:
+    queries = []
+    for _ in range(count):
+        skills = [SKILLS[skill] for skill in rng.integers(0, 40, rng.integers(1, 6))]
+        queries.append({
+            'skills': skills,
+            'experience': int(rng.integers(0, 12)),
+            'location': CITIES[rng.integers(0, len(CITIES))].title() if rng.random() < 0.7 else None,
+            'salary_expectation': int(rng.integers(10, 100)) * 1000,
+            'industry': INDUSTRIES[rng.integers(0, len(INDUSTRIES))]
+        })
+    return queries
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    count = LISTINGS[scale]
+    engine = JobMatchingEngine(initial_capacity=count)
+    timings = {}
+    with stopwatch(timings, 'build'):
+        engine.add_jobs(_jobs(rng, count))
+
+    latencies = []
+    for query in _queries(rng, QUERIES):
+        start = time.perf_counter()
+        engine.search(query, top_k=20)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    churn = 1000
+    with stopwatch(timings, 'remove'):
+        for index in rng.choice(count, churn, replace=False):
+            engine.remove_job(f'job-{index}')
+    with stopwatch(timings, 'add'):
+        engine.add_jobs(_jobs(rng, churn, offset=count))
+
+    return {
+        'benchmark': 'job_matching',
+        'scale': scale,
+        'cpu_bound': True,
+        'listings': count,
+        'queries': QUERIES,
+        'index_jobs_per_sec': round(count / timings['build']),
+        'search_p50_ms': round(percentile(latencies, 50), 2),
+        'search_p95_ms': round(percentile(latencies, 95), 2),
+        'search_p99_ms': round(percentile(latencies, 99), 2),
+        'incremental_remove_us': round(timings['remove'] / churn * 1e6, 1),
+        'incremental_add_us': round(timings['add'] / churn * 1e6, 1),
+        'listings_after_churn': len(engine)
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+import numpy as np
+
+from agents.ledger import KIND_PAYMENT, KIND_PAYOUT, LEDGER_DTYPE, STATUS_OK, Ledger
+from benchmarks.common import run_cli, stopwatch
+
+TRANSACTIONS = {'small': 1000000, 'medium': 10000000, 'large': 20000000}
+CHUNK = 1000000
+LIST_SAMPLE = 1000000
+YEAR_SECONDS = 365 * 86400
+START = 1700000000.0
+
+
+def _chunk(rng: np.random.Generator, start: int, count: int, total: int) -> np.ndarray:
+    records = np.zeros(count, dtype=LEDGER_DTYPE)
+    # Evenly spread over a year in arrival order, with jitter that keeps timestamps sorted
+    records['timestamp'] = START + (np.arange(start, start + count) + rng.random(count) * 0.5) * (YEAR_SECONDS / total)
+    records['amount'] = rng.integers(2000, 500000, count)
+    records['kind'] = np.where(rng.random(count) < 0.98, KIND_PAYMENT, KIND_PAYOUT)
+    records['code'] = rng.integers(1, 5, count)
+    records['status'] = (rng.random(count) < 0.95).astype(np.uint8) * STATUS_OK
+    records['reference'] = np.frombuffer(rng.bytes(16 * count), dtype='S16')
+    return records
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = np.random.default_rng(seed)
+    count = TRANSACTIONS[scale]
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'ledger.bin')
+        ledger = Ledger(path)
+        sample = None
+        with stopwatch(timings, 'load'):
+            for start in range(0, count, CHUNK):
+                chunk = _chunk(rng, start, min(CHUNK, count - start), count)
+                ledger.append_many(chunk)
+                if sample is None:
+                    sample = chunk[:LIST_SAMPLE]
+
+        with stopwatch(timings, 'append'):
+            for index in range(10000):
+                ledger.append(KIND_PAYMENT, 149.0, START + YEAR_SECONDS + index)
+            ledger.flush()
+
+        week_end = START + YEAR_SECONDS
+        scans = []
+        for week in range(20):
+            start = time.perf_counter()
+            ledger.totals(week_end - (week + 1) * 7 * 86400, week_end - week * 7 * 86400)
+            scans.append(time.perf_counter() - start)
+        with stopwatch(timings, 'weekly_totals'):
+            weekly = ledger.weekly_totals()
+        ledger.close()
+
+        with stopwatch(timings, 'reopen'):
+            reopened = Ledger(path)
+        reopened.close()
+        file_bytes = os.path.getsize(path)
+
+    # The previous payout_history shape: one dict per transaction, walked to total a week
+    history = [{'amount': int(record['amount']) / 100, 'timestamp': float(record['timestamp']),
+                'kind': int(record['kind']), 'status': int(record['status'])} for record in sample]
+    since = float(sample['timestamp'][-1]) - 7 * 86400
+    with stopwatch(timings, 'list_walk'):
+        sum(entry['amount'] for entry in history
+            if entry['timestamp'] >= since and entry['kind'] == KIND_PAYMENT and entry['status'] == STATUS_OK)
+    list_walk_ms = timings['list_walk'] * 1000 * count / len(history)
+
+    return {
+        'benchmark': 'ledger',
+        'scale': scale,
+        'cpu_bound': ['single_append_us', 'weekly_range_scan_ms', 'weekly_totals_ms'],
+        'reference': ['list_walk_ms_extrapolated'],
+        'transactions': count,
+        'bulk_load_records_per_sec': round(count / timings['load']),
+        'single_append_us': round(timings['append'] / 10000 * 1e6, 2),
+        'weekly_range_scan_ms': round(float(np.median(scans)) * 1000, 3),
+        'weekly_totals_ms': round(timings['weekly_totals'] * 1000, 3),
+        'weeks': len(weekly),
+        'list_walk_ms_extrapolated': round(list_walk_ms, 1),
+        'reopen_s': round(timings['reopen'], 3),
+        'bytes_per_record': round(file_bytes / (count + 10000), 1)
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
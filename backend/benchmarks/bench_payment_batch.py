@@ -0,0 +1,99 @@
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict
+
+from agents.ledger import Ledger
+from agents.payment_gateways import CardGateway, EFTGateway, PayFastGateway
+from agents.south_africa_compliance import PaymentProcessor
+from benchmarks.common import percentile, run_cli
+from benchmarks.datasets import payments as generate_payments
+from benchmarks.stub_server import StubServer
+from utils.http_pool import HttpPool
+
+PAYMENTS = {'small': 5000, 'medium': 50000, 'large': 200000}
+SEQUENTIAL_SAMPLE = 200
+# Gateway response times of the local stub
+DELAYS = {'payfast': 0.005, 'eft': 0.012, 'credit_card': 0.008}
+DUPLICATE_RATE = 0.02
+POOL_LIMIT = 128
+
+
+def _processor(stub: StubServer, pool: HttpPool, ledger: Ledger) -> PaymentProcessor:
+    instances = {
+        'payfast': PayFastGateway(endpoint=stub.url('payfast'), http_pool=pool, simulate=False),
+        'eft': EFTGateway(endpoint=stub.url('eft'), http_pool=pool, simulate=False),
+        'credit_card': CardGateway(endpoint=stub.url('credit_card'), http_pool=pool, simulate=False)
+    }
+    return PaymentProcessor(ledger=ledger, gateways={**instances, 'bank_transfer': instances['eft']},
+                            idempotency_db=':memory:')
+
+
+async def _run(scale: str, seed: int, directory: str) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    payments = generate_payments(rng, PAYMENTS[scale], DUPLICATE_RATE)
+    unique = len({payment['idempotency_key'] for payment in payments})
+    ledger = Ledger(os.path.join(directory, 'ledger.bin'))
+    async with StubServer(delays=DELAYS) as stub, HttpPool(limit=POOL_LIMIT, limit_per_host=POOL_LIMIT) as pool:
+        # The previous shape: one awaited process_payment call per payment
+        sequential = _processor(stub, pool, ledger)
+        start = time.perf_counter()
+        for payment in payments[:SEQUENTIAL_SAMPLE]:
+            await sequential.process_payment(payment['amount'], payment['method'], payment['user_data'],
+                                             idempotency_key=f"seq-{payment['idempotency_key']}")
+        sequential_rate = SEQUENTIAL_SAMPLE / (time.perf_counter() - start)
+        sequential.close()
+
+        processor = _processor(stub, pool, ledger)
+        hits_before = sum(stub.hits.values())
+        latencies = []
+        replayed = 0
+        first_result = None
+        start = time.perf_counter()
+        async for result in processor.process_batch(payments):
+            if first_result is None:
+                first_result = time.perf_counter() - start
+            if result.get('replayed'):
+                replayed += 1
+            else:
+                latencies.append(result['duration_ms'])
+        elapsed = time.perf_counter() - start
+        charges = sum(stub.hits.values()) - hits_before
+
+        # Re-submitting the whole run must not reach a gateway again
+        hits_before = sum(stub.hits.values())
+        start = time.perf_counter()
+        resubmitted = [result async for result in processor.process_batch(payments)]
+        replay_elapsed = time.perf_counter() - start
+        replay_charges = sum(stub.hits.values()) - hits_before
+        processor.close()
+    ledger.close()
+
+    return {
+        'benchmark': 'payment_batch',
+        'scale': scale,
+        'reference': ['sequential_payments_per_sec'],
+        'payments': len(payments),
+        'unique_keys': unique,
+        'max_in_flight': processor.max_in_flight,
+        'sequential_payments_per_sec': round(sequential_rate),
+        'batch_payments_per_sec': round(len(payments) / elapsed),
+        'first_result_ms': round(first_result * 1000, 2),
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'gateway_charges': charges,
+        'duplicates_replayed': replayed,
+        'resubmit_payments_per_sec': round(len(resubmitted) / replay_elapsed),
+        'resubmit_gateway_charges': replay_charges
+    }
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        return asyncio.run(_run(scale, seed, directory))
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,77 @@
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+import numpy as np
+
+from agents.ledger import Ledger
+from agents.south_africa_compliance import PaymentProcessor, PayoutAgent
+from benchmarks.common import percentile, run_cli, stopwatch
+from benchmarks.datasets import ledger_history, payments as generate_payments
+
+PAYMENTS = {'small': 2000, 'medium': 20000, 'large': 100000}
+HISTORY = {'small': 100000, 'medium': 1000000, 'large': 10000000}
+PAYOUT_RUNS = 20
+HISTORY_DAYS = 365
+
+
+async def _flow(processor: PaymentProcessor, payouts: PayoutAgent, payments, timings: Dict[str, float]):
+    sample = payments[:len(payments) // 10]
+    with stopwatch(timings, 'process_payment'):
+        for payment in sample:
+            await processor.process_payment(payment['amount'], payment['method'], payment['user_data'],
+                                            idempotency_key=f"single-{payment['idempotency_key']}")
+    with stopwatch(timings, 'process_batch'):
+        async for _ in processor.process_batch(payments):
+            pass
+
+    latencies = []
+    now = datetime.now()
+    for _ in range(PAYOUT_RUNS):
+        start = time.perf_counter()
+        result = await payouts.weekly_payout(now=now)
+        latencies.append(time.perf_counter() - start)
+    return len(sample), result, latencies
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    payments = generate_payments(rng, PAYMENTS[scale])
+    timings = {}
+    with tempfile.TemporaryDirectory() as directory:
+        ledger = Ledger(os.path.join(directory, 'ledger.bin'))
+        end = time.time() - 60
+        with stopwatch(timings, 'history'):
+            ledger.append_many(ledger_history(np.random.default_rng(seed), HISTORY[scale],
+                                              end - HISTORY_DAYS * 86400, end))
+        # Simulated gateways with a seeded RNG, so the approval pattern repeats run to run
+        processor = PaymentProcessor(ledger=ledger, rng=random.Random(seed),
+                                     idempotency_db=os.path.join(directory, 'idempotency.db'))
+        payouts = PayoutAgent(ledger=ledger)
+        single, result, latencies = asyncio.run(_flow(processor, payouts, payments, timings))
+        with stopwatch(timings, 'payout_history'):
+            history = payouts.payout_history
+        processor.close()
+        ledger.close()
+
+    return {
+        'benchmark': 'payouts',
+        'scale': scale,
+        'payments': len(payments),
+        'history_records': HISTORY[scale],
+        'process_payment_per_sec': round(single / timings['process_payment']),
+        'process_batch_per_sec': round(len(payments) / timings['process_batch']),
+        'weekly_payout_p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'weekly_payout_p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'payout_history_ms': round(timings['payout_history'] * 1000, 3),
+        'payout_history_entries': len(history),
+        'weekly_revenue': result['total_revenue']
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,71 @@
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict
+
+from agents.post_scheduler import PostScheduler
+from benchmarks.common import run_cli, stopwatch
+
+ITEMS = {'small': 100000, 'medium': 1000000, 'large': 3000000}
+ENQUEUE_CHUNK = 50000
+DISPATCH_CHUNK = 5000
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    count = ITEMS[scale]
+    platforms = ['tiktok', 'instagram', 'facebook', 'youtube', 'twitter', 'snapchat']
+    base = time.time() - 3600
+    content = {'content': 'Scheduled job alert', 'addiction_score': 8.0}
+    timings = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'scheduled_posts.db')
+        scheduler = PostScheduler(db_path)
+
+        with stopwatch(timings, 'enqueue'):
+            for offset in range(0, count, ENQUEUE_CHUNK):
+                scheduler.schedule_many(
+                    (f"post_{i}", platforms[i % len(platforms)], content, base + rng.uniform(0, 3000))
+                    for i in range(offset, min(count, offset + ENQUEUE_CHUNK))
+                )
+
+        sample = [f"post_{rng.randrange(count)}" for _ in range(min(10000, count // 10))]
+        with stopwatch(timings, 'reschedule'):
+            for post_id in sample:
+                scheduler.reschedule(post_id, base + rng.uniform(0, 3000))
+        with stopwatch(timings, 'cancel'):
+            cancelled = sum(scheduler.cancel(post_id) for post_id in sample[:len(sample) // 2])
+        scheduler.db.close()
+
+        with stopwatch(timings, 'restart'):
+            scheduler = PostScheduler(db_path)
+        remaining = len(scheduler)
+
+        dispatched = 0
+        with stopwatch(timings, 'dispatch'):
+            while True:
+                batch = scheduler.pop_due(limit=DISPATCH_CHUNK)
+                if not batch:
+                    break
+                scheduler.complete(post.post_id for post in batch)
+                dispatched += len(batch)
+        scheduler.close()
+
+    return {
+        'benchmark': 'post_scheduler',
+        'scale': scale,
+        'items': count,
+        'enqueue_per_sec': round(count / timings['enqueue']),
+        'reschedule_per_sec': round(len(sample) / timings['reschedule']),
+        'cancel_per_sec': round(cancelled / max(timings['cancel'], 1e-9)),
+        'restart_load_s': round(timings['restart'], 3),
+        'recovered_after_restart': remaining,
+        'dispatched': dispatched,
+        'dispatch_per_sec': round(dispatched / timings['dispatch'])
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,55 @@
+import os
+import secrets
+import tempfile
+from typing import Any, Dict
+
+from cryptography.fernet import Fernet
+
+from benchmarks.common import run_cli, stopwatch
+from utils.key_manager import KeyManager, derive_key, set_key_manager
+from utils.security import MilitaryGradeSecurity
+
+CONSTRUCTIONS = {'small': 5, 'medium': 20, 'large': 100}
+
+
+def _legacy_construction():
+    # What every MilitaryGradeSecurity() used to pay: a fresh 100k-iteration PBKDF2 run
+    return Fernet(derive_key(secrets.token_bytes(32), secrets.token_bytes(16)))
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    count = CONSTRUCTIONS[scale]
+    timings = {}
+
+    with stopwatch(timings, 'legacy'):
+        for _ in range(count):
+            _legacy_construction()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        keyring_path = os.path.join(tmp, 'keyring.json')
+        with stopwatch(timings, 'key_manager_generate'):
+            set_key_manager(KeyManager(keyring_path=keyring_path))
+        with stopwatch(timings, 'shared'):
+            for _ in range(count):
+                # Keys resolve on first use, so touch them to time a ready-to-use instance
+                MilitaryGradeSecurity().fernet
+        with stopwatch(timings, 'key_manager_reload'):
+            KeyManager(keyring_path=keyring_path)
+        set_key_manager(None)
+
+    return {
+        'benchmark': 'security_startup',
+        'scale': scale,
+        'cpu_bound': True,
+        'reference': ['legacy_ms_per_instance'],
+        'constructions': count,
+        'legacy_ms_per_instance': round(timings['legacy'] / count * 1000, 3),
+        'shared_ms_per_instance': round(timings['shared'] / count * 1000, 4),
+        'key_manager_generate_ms': round(timings['key_manager_generate'] * 1000, 3),
+        'key_manager_reload_ms': round(timings['key_manager_reload'] * 1000, 3),
+        'speedup': round(timings['legacy'] / max(timings['shared'], 1e-9), 1)
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,71 @@
+import io
+import os
+import random
+import tempfile
+from typing import Any, Dict, List
+
+from benchmarks.common import run_cli, stopwatch
+from utils.key_manager import KeyManager
+from utils.security import MilitaryGradeSecurity, canonical_bytes
+
+RECORDS = {'small': 1000, 'medium': 10000, 'large': 100000}
+BLOB_MB = {'small': 8, 'medium': 64, 'large': 256}
+
+
+def _payout_records(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    banks = ['fnb', 'standard_bank', 'absa', 'nedbank', 'capitec']
+    return [{
+        'user_id': f"user_{rng.randrange(10 ** 8)}",
+        'account_number': str(rng.randrange(10 ** 10, 10 ** 11)),
+        'bank': rng.choice(banks),
+        'amount': round(rng.uniform(50, 50000), 2),
+        'reference': f"PAY_{i:08d}",
+        'email': f"user{i}@example.co.za"
+    } for i in range(count)]
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    records = _payout_records(RECORDS[scale], rng)
+    plaintext_mb = len(canonical_bytes(records)) / 1e6
+    blob = rng.randbytes(BLOB_MB[scale] * 1024 * 1024)
+    timings = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        security = MilitaryGradeSecurity(KeyManager(keyring_path=os.path.join(tmp, 'keyring.json')))
+
+        with stopwatch(timings, 'per_field'):
+            legacy = [{k: security.encrypt_sensitive_data(str(v)) for k, v in record.items()} for record in records]
+        with stopwatch(timings, 'batch_encrypt'):
+            token = security.encrypt_batch(records)
+        with stopwatch(timings, 'batch_decrypt'):
+            security.decrypt_batch(token)
+
+        sink = io.BytesIO()
+        with stopwatch(timings, 'stream_encrypt'):
+            security.encrypt_stream(io.BytesIO(blob), sink)
+        sink.seek(0)
+        with stopwatch(timings, 'stream_decrypt'):
+            security.decrypt_stream(sink, io.BytesIO())
+
+    legacy_bytes = len(canonical_bytes(legacy))
+    count = len(records)
+    return {
+        'benchmark': 'security_throughput',
+        'scale': scale,
+        'cpu_bound': True,
+        'reference': ['per_field_records_per_sec'],
+        'records': count,
+        'per_field_records_per_sec': round(count / timings['per_field']),
+        'batch_encrypt_records_per_sec': round(count / timings['batch_encrypt']),
+        'batch_decrypt_records_per_sec': round(count / timings['batch_decrypt']),
+        'batch_encrypt_mb_per_sec': round(plaintext_mb / timings['batch_encrypt'], 2),
+        'per_field_payload_bytes': legacy_bytes,
+        'batch_payload_bytes': len(token),
+        'stream_encrypt_mb_per_sec': round(len(blob) / 1e6 / timings['stream_encrypt'], 2),
+        'stream_decrypt_mb_per_sec': round(len(blob) / 1e6 / timings['stream_decrypt'], 2)
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
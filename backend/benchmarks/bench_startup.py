@@ -0,0 +1,96 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.common import percentile, run_cli
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COLD_STARTS = {'small': 3, 'medium': 7, 'large': 15}
+TOP_MODULES = 10
+READY_MARKER = '-- ready --'
+# Must stay out of a worker until a request actually needs them
+HEAVY_MODULES = ('numpy', 'pandas', 'sklearn', 'cv2', 'PIL', 'pytesseract', 'aiohttp', 'cryptography')
+
+# Runs in a fresh interpreter: import the app, enter its lifespan, then report what got loaded
+CHILD = '''
+import asyncio, json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+
+async def measure():
+    # Timings and the module snapshot are taken inside the lifespan, before its shutdown runs
+    async with main.app.router.lifespan_context(main.app):
+        ready = time.perf_counter()
+        print(%r, file=sys.stderr, flush=True)
+        heavy = sorted(name for name in %r if name in sys.modules)
+        build = time.perf_counter()
+        await main.agent_registry.aget('job_matcher')
+        built = time.perf_counter()
+    return {'import_s': imported - start, 'ready_s': ready - start, 'heavy': heavy,
+            'first_agent_s': built - build, 'modules': len(sys.modules)}
+
+
+print(json.dumps(asyncio.run(measure())))
+''' % (READY_MARKER, HEAVY_MODULES)
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    # "import time: self [us] | cumulative | imported package", nested imports indented
+    # Stops at the ready marker, so imports made by the first agent build are not counted
+    modules = []
+    for line in stderr.splitlines():
+        if line == READY_MARKER:
+            break
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):
+            modules.append((name.strip(), int(cumulative)))
+    return modules
+
+
+def cold_start() -> Tuple[Dict[str, Any], List[Tuple[str, int]]]:
+    env = {key: value for key, value in os.environ.items() if key != 'JOB_LISTINGS_PATH'}
+    with tempfile.TemporaryDirectory() as scratch:
+        # Startup resumes the application queue; each cold start gets an empty one of its own
+        env['APPLICATION_QUEUE_DB'] = os.path.join(scratch, 'applications.db')
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD], cwd=BACKEND_DIR, env=env,
+                                   capture_output=True, text=True, timeout=300)
+    if completed.returncode != 0:
+        raise RuntimeError((completed.stderr.strip().splitlines() or ['startup failed'])[-1])
+    return json.loads(completed.stdout.strip().splitlines()[-1]), parse_importtime(completed.stderr)
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    samples = [cold_start() for _ in range(COLD_STARTS[scale])]
+    reports = [report for report, _ in samples]
+    heavy = sorted({name for report in reports for name in report['heavy']})
+    # Top-level imports of the fastest start, largest first
+    _, modules = min(samples, key=lambda sample: sample[0]['ready_s'])
+    top = sorted(modules, key=lambda module: module[1], reverse=True)[:TOP_MODULES]
+    result = {
+        'benchmark': 'startup',
+        'scale': scale,
+        'cold_starts': len(samples),
+        'import_p50_ms': round(percentile([report['import_s'] for report in reports], 50) * 1000, 1),
+        'ready_p50_ms': round(percentile([report['ready_s'] for report in reports], 50) * 1000, 1),
+        'ready_p99_ms': round(percentile([report['ready_s'] for report in reports], 99) * 1000, 1),
+        'first_agent_build_ms': round(percentile([report['first_agent_s'] for report in reports], 50) * 1000, 1),
+        'modules_loaded': reports[0]['modules'],
+        'heavy_modules_loaded': heavy,
+        'top_imports_ms': {name: round(cumulative / 1000, 1) for name, cumulative in top}
+    }
+    if heavy:
+        # Fails the suite run: a worker would pay for these before serving its first request
+        print(json.dumps(result, indent=2, sort_keys=True), file=sys.stderr)
+        raise SystemExit(f"startup imports heavy modules: {', '.join(heavy)}")
+    return result
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,83 @@
+import asyncio
+import random
+import string
+from typing import Any, Dict, List
+
+from benchmarks.common import load_source_module, run_cli, stopwatch
+
+VOCABULARY_SIZES = (20, 100, 1000, 10000)
+TASKS = {'small': 200, 'medium': 2000, 'large': 10000}
+FILLER = ['the', 'for', 'our', 'south', 'african', 'job', 'seekers', 'and', 'employers', 'with', 'a', 'weekly', 'report']
+
+
+def _vocabulary(rng: random.Random, size: int) -> List[str]:
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10))))
+    return sorted(words)
+
+
+def _tables(words: List[str]):
+    levels = ['high', 'medium', 'low']
+    complexity = {level: words[index::6] for index, level in enumerate(levels)}
+    capabilities = {f"capability_{index}": words[index + 3::6 * 4] for index in range(12)}
+    return complexity, capabilities
+
+
+def _legacy_classify(task: str, complexity: Dict[str, List[str]], capabilities: Dict[str, List[str]]):
+    task_lower = task.lower()
+    score = 0
+    for level, keywords in complexity.items():
+        for keyword in keywords:
+            if keyword in task_lower:
+                score += 1 if level == 'high' else 0.5 if level == 'medium' else 0.2
+    required = [capability for capability, keywords in capabilities.items()
+                if any(keyword in task_lower for keyword in keywords)]
+    return 'high' if score > 2 else 'medium' if score > 1 else 'low', required or ['general_ai']
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    module = load_source_module('synthetic_intelligence_core', 'agents/synthetic_intelligence.core.py')
+    rng = random.Random(seed)
+    results = []
+    for size in VOCABULARY_SIZES:
+        words = _vocabulary(rng, size)
+        complexity, capabilities = _tables(words)
+        tasks = [' '.join(rng.choice(words) if rng.random() < 0.3 else rng.choice(FILLER) for _ in range(20))
+                 for _ in range(TASKS[scale])]
+        timings = {}
+
+        with stopwatch(timings, 'compile'):
+            classifier = module.TaskClassifier(complexity, capabilities)
+        intelligence = module.StrategicIntelligence(classifier)
+        with stopwatch(timings, 'legacy'):
+            expected = [_legacy_classify(task, complexity, capabilities) for task in tasks]
+        with stopwatch(timings, 'automaton'):
+            analysed = asyncio.run(intelligence.analyze_tasks(tasks))
+
+        async def one_at_a_time():
+            for task in tasks:
+                await intelligence.analyze_task(task)
+
+        with stopwatch(timings, 'analyze_task'):
+            asyncio.run(one_at_a_time())
+
+        results.append({
+            'vocabulary': size,
+            'compile_ms': round(timings['compile'] * 1000, 2),
+            'legacy_tasks_per_sec': round(len(tasks) / timings['legacy']),
+            'automaton_tasks_per_sec': round(len(tasks) / timings['automaton']),
+            'analyze_task_us': round(timings['analyze_task'] / len(tasks) * 1e6, 2),
+            # Tasks where legacy substring matching fired on a keyword buried inside another word
+            'differs_from_substring_matching': sum(
+                (task.complexity, task.required_capabilities) != (level, required)
+                for task, (level, required) in zip(analysed, expected)
+            )
+        })
+
+    return {'benchmark': 'task_classifier', 'scale': scale, 'cpu_bound': True, 'reference': ['legacy_tasks_per_sec'],
+            'tasks': TASKS[scale], 'vocabularies': results}
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,96 @@
+import asyncio
+import random
+from datetime import datetime
+from typing import Any, Dict, List
+
+from benchmarks.common import load_source_module, run_cli
+
+core = load_source_module('synthetic_intelligence_core', 'agents/synthetic_intelligence.core.py')
+
+NODES = {'small': 10000, 'medium': 100000, 'large': 500000}
+CAPABILITIES = ['data_analysis', 'content_creation', 'social_media', 'payment_processing', 'compliance']
+
+
+class InstantAgent(core.AICapability):
+    def __init__(self, capability: str):
+        self.capabilities = [capability]
+
+    async def execute(self, task):
+        return None
+
+
+class SleepAgent(core.AICapability):
+    capabilities = ['data_analysis']
+
+    async def execute(self, task):
+        await asyncio.sleep(0.02)
+
+
+class ChecksumAgent(core.CPUBoundCapability):
+    capabilities = ['security']
+
+    def compute(self, task):
+        return sum(i * i for i in range(200000))
+
+
+def _layered_dag(rng: random.Random, nodes: int, width: int) -> List[Any]:
+    now = datetime.now()
+    tasks = []
+    for index in range(nodes):
+        layer_start = (index // width - 1) * width
+        dependencies = []
+        if layer_start >= 0:
+            dependencies = [f"t{rng.randrange(layer_start, layer_start + width)}" for _ in range(rng.randint(1, 3))]
+        tasks.append(core.Task(f"t{index}", 'synthetic', 'low', sorted(set(dependencies)),
+                               [CAPABILITIES[index % len(CAPABILITIES)]], now))
+    return tasks
+
+
+async def _throughput(rng: random.Random, nodes: int) -> Dict[str, Any]:
+    registry = {capability: InstantAgent(capability) for capability in CAPABILITIES}
+    executor = core.TaskExecutor(registry, default_limit=256)
+    results = await executor.run(_layered_dag(rng, nodes, width=1000))
+    return {'completed': sum(result.status == 'completed' for result in results.values()), **executor.stats}
+
+
+async def _critical_path() -> Dict[str, Any]:
+    # A 10-deep chain next to 200 independent tasks: wall time should track the chain, not the total
+    now = datetime.now()
+    chain = [core.Task(f"c{i}", 'chain', 'low', [f"c{i - 1}"] if i else [], ['data_analysis'], now) for i in range(10)]
+    wide = [core.Task(f"w{i}", 'wide', 'low', [], ['data_analysis'], now) for i in range(200)]
+    executor = core.TaskExecutor({'sleepy': SleepAgent()}, default_limit=256)
+    await executor.run(chain + wide)
+    return {'serial_sum_s': round(0.02 * 210, 3), 'wall_time_s': round(executor.stats['wall_time_s'], 3),
+            'critical_path_s': round(executor.stats['critical_path_s'], 3)}
+
+
+async def _process_pool(workers: int) -> float:
+    now = datetime.now()
+    tasks = [core.Task(f"p{i}", 'checksum', 'low', [], ['security'], now) for i in range(16)]
+    executor = core.TaskExecutor({'checksum': ChecksumAgent()}, default_limit=workers, max_process_workers=workers)
+    try:
+        await executor.run(tasks)
+    finally:
+        executor.close()
+    return round(executor.stats['wall_time_s'], 3)
+
+
+def run(scale: str = 'small', seed: int = 0) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    nodes = NODES[scale]
+    throughput = asyncio.run(_throughput(rng, nodes))
+    return {
+        'benchmark': 'task_executor',
+        'scale': scale,
+        'cpu_bound': ['tasks_per_sec', 'process_pool_wall_s'],
+        'reference': ['serial_sum_s'],
+        'nodes': nodes,
+        'completed': throughput['completed'],
+        'tasks_per_sec': round(nodes / throughput['wall_time_s']),
+        'critical_path': asyncio.run(_critical_path()),
+        'process_pool_wall_s': {workers: asyncio.run(_process_pool(workers)) for workers in (1, 4)}
+    }
+
+
+if __name__ == '__main__':
+    run_cli(run)
@@ -0,0 +1,49 @@
+import argparse
+import json
+import math
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Sequence
+
+SCALES = ('small', 'medium', 'large')
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+@contextmanager
+def stopwatch(results: Dict[str, float], name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        results[name] = time.perf_counter() - start
+
+
+def run_cli(run: Callable[..., Dict[str, Any]]):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(run(scale=args.scale, seed=args.seed), indent=2, sort_keys=True))
+
+
+def load_source_module(name: str, path: str):
+    # For agent modules whose file names are not importable (e.g. synthetic_intelligence.core.py)
+    import importlib.util
+    import os
+    import sys
+
+    if name in sys.modules:
+        return sys.modules[name]
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    spec = importlib.util.spec_from_file_location(name, os.path.join(backend_dir, path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
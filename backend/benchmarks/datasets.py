@@ -0,0 +1,54 @@
+import random
+from typing import Any, Dict, List
+
+import numpy as np
+
+from agents.ledger import KIND_PAYMENT, KIND_PAYOUT, LEDGER_DTYPE, STATUS_OK
+
+# Seeded generators shared by benchmarks that need the same shape of data
+PAYMENT_METHODS = ['payfast', 'payfast', 'credit_card', 'eft', 'bank_transfer']
+PLANS = {'basic': 149.0, 'premium': 299.0, 'enterprise': 499.0}
+JOB_TITLES = ['Software Developer', 'Data Scientist', 'Marketing Manager', 'Accountant', 'Nurse',
+              'Civil Engineer', 'Sales Representative', 'Call Centre Agent', 'Project Manager', 'Teacher']
+JOB_LOCATIONS = ['Johannesburg, Gauteng', 'Pretoria, Gauteng', 'Cape Town, Western Cape', 'Durban, KZN',
+                 'Port Elizabeth, Eastern Cape', 'Bloemfontein, Free State', 'Nelspruit, Mpumalanga',
+                 'Polokwane, Limpopo', 'Rustenburg, North West', 'Kimberley, Northern Cape']
+JOB_TYPES = ['Full-time', 'Full-time', 'Full-time', 'Contract', 'Part-time', 'Internship']
+
+
+def payments(rng: random.Random, count: int, duplicate_rate: float = 0.0) -> List[Dict[str, Any]]:
+    generated = []
+    for index in range(count):
+        # Retried submissions reuse an earlier key, as a client re-sending after a timeout would
+        key = f"sub-{rng.randrange(index)}" if index and rng.random() < duplicate_rate else f"sub-{index}"
+        plan = rng.choice(list(PLANS))
+        generated.append({'idempotency_key': key, 'amount': PLANS[plan], 'method': rng.choice(PAYMENT_METHODS),
+                          'user_data': {'user_id': index, 'email': f"user{index}@example.co.za", 'plan': plan}})
+    return generated
+
+
+def ledger_history(rng: np.random.Generator, count: int, start: float, end: float) -> np.ndarray:
+    # Mostly payments with a few payouts, in timestamp order across [start, end)
+    records = np.zeros(count, dtype=LEDGER_DTYPE)
+    records['timestamp'] = np.sort(rng.uniform(start, end, count))
+    records['amount'] = rng.choice(np.array([14900, 29900, 49900]), count)
+    records['kind'] = np.where(rng.random(count) < 0.98, KIND_PAYMENT, KIND_PAYOUT)
+    records['code'] = rng.integers(1, 5, count)
+    records['status'] = (rng.random(count) < 0.95).astype(np.uint8) * STATUS_OK
+    records['reference'] = np.frombuffer(rng.bytes(16 * count), dtype='S16')
+    return records
+
+
+def jobs(rng: random.Random, count: int, start: float, end: float) -> List[Dict[str, Any]]:
+    # Listings shaped like the frontend's cards, posted across [start, end); Gauteng-heavy like real volume
+    generated = []
+    for index in range(count):
+        low = rng.randrange(8, 90) * 1000
+        generated.append({
+            'id': f"job-{index}", 'title': rng.choice(JOB_TITLES), 'company': f"Company {rng.randrange(2000)}",
+            'location': JOB_LOCATIONS[min(int(rng.expovariate(0.6)), len(JOB_LOCATIONS) - 1)],
+            'salary': f"R{low:,} - R{low + rng.randrange(0, 30) * 1000:,}", 'type': rng.choice(JOB_TYPES),
+            'description': ' '.join(rng.choice(JOB_TITLES).lower() for _ in range(rng.randrange(10, 40))),
+            'posted_at': rng.uniform(start, end), 'urgent': rng.random() < 0.1
+        })
+    return generated
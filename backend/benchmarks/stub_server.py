@@ -0,0 +1,55 @@
+import asyncio
+from collections import Counter
+from typing import Dict, Optional
+
+from aiohttp import web
+
+
+class StubServer:
+    # Local stand-in for third-party APIs: every POST/GET /<name> answers after a configurable delay
+    def __init__(self, delays: Optional[Dict[str, float]] = None, throttle: Optional[Dict[str, int]] = None,
+                 retry_after: float = 1.0, default_delay: float = 0.0):
+        self.delays = dict(delays or {})
+        self.throttle = dict(throttle or {})
+        self.retry_after = retry_after
+        self.default_delay = default_delay
+        self.hits = Counter()
+        self.base_url = None
+        self._runner = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_route('*', '/{name}', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def url(self, name: str) -> str:
+        return f"{self.base_url}/{name}"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        name = request.match_info['name']
+        self.hits[name] += 1
+        await request.read()
+        if self.throttle.get(name, 0) > 0:
+            self.throttle[name] -= 1
+            return web.json_response({'error': 'rate limited'}, status=429,
+                                     headers={'Retry-After': str(self.retry_after)})
+        await asyncio.sleep(self.delays.get(name, self.default_delay))
+        return web.json_response({'id': f"{name}_{self.hits[name]}", 'success': True})
@@ -0,0 +1,272 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.common import SCALES
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+DEFAULT_THRESHOLD = 0.15
+DEFAULT_TIMEOUT = 1800
+CALIBRATION_ROUNDS = 7
+# Metric name fragments that say which direction is better; anything else is informational
+HIGHER_IS_BETTER = ('per_sec', 'speedup', 'hit_ratio', 'throughput')
+LOWER_IS_BETTER_SUFFIXES = ('_ms', '_s', '_us', '_ns', '_seconds', '_pct')
+LOWER_IS_BETTER = ('p50', 'p95', 'p99', 'latency', 'slowdown')
+# Relative numbers: the machine's speed cancels out of them, so they are never rescaled
+UNSCALED = ('speedup', 'ratio', 'slowdown')
+# Benchmarks label their own metrics in the result: 'cpu_bound' (True, or a list of metrics) are the ones
+# rescaled by the calibration, and 'reference' metrics describe old code or fixed inputs, not this tree
+CPU_BOUND_KEY = 'cpu_bound'
+REFERENCE_KEY = 'reference'
+
+
+def discover() -> List[str]:
+    return sorted(name[len('bench_'):-len('.py')] for name in os.listdir(BENCHMARKS_DIR)
+                  if name.startswith('bench_') and name.endswith('.py'))
+
+
+def run_benchmark(name: str, scale: str, seed: int, timeout: float) -> Dict[str, Any]:
+    # Each benchmark gets a fresh interpreter so process-wide singletons, caches and memory
+    # left behind by one cannot skew the next. Default stores point at a scratch directory.
+    start = time.perf_counter()
+    try:
+        with tempfile.TemporaryDirectory() as scratch:
+            env = {**os.environ, 'JOBPLATFORM_LEDGER_PATH': os.path.join(scratch, 'ledger.bin'),
+                   'PAYMENT_IDEMPOTENCY_DB': os.path.join(scratch, 'idempotency.db'),
+                   'POST_SCHEDULER_DB': os.path.join(scratch, 'scheduled_posts.db'),
+                   'APPLICATION_QUEUE_DB': os.path.join(scratch, 'applications.db')}
+            completed = subprocess.run(
+                [sys.executable, '-m', f'benchmarks.bench_{name}', '--scale', scale, '--seed', str(seed)],
+                cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=timeout
+            )
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {timeout}s"}
+    elapsed = round(time.perf_counter() - start, 3)
+    if completed.returncode != 0:
+        return {'error': (completed.stderr.strip().splitlines() or ['exit code %d' % completed.returncode])[-1],
+                'elapsed_s': elapsed}
+    try:
+        result = json.loads(completed.stdout)
+    except ValueError:
+        return {'error': 'benchmark did not print a JSON result', 'elapsed_s': elapsed}
+    return {**result, 'elapsed_s': elapsed}
+
+
+def calibrate() -> float:
+    # Fixed pure-Python workload timed next to the suite. Shared and throttled machines drift by
+    # tens of percent between runs; comparing against this rescales that drift away.
+    best = float('inf')
+    for _ in range(CALIBRATION_ROUNDS):
+        start = time.perf_counter()
+        table: Dict[str, int] = {}
+        for value in range(200000):
+            key = str(value % 5000)
+            table[key] = table.get(key, 0) + value * 3
+        sorted(table.values())
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def best_of(first: Any, second: Any, metric: str = '') -> Any:
+    # Merges repeated runs metric by metric, keeping the better value of each
+    if isinstance(first, dict) and isinstance(second, dict):
+        return {key: best_of(value, second[key], f"{metric}.{key}" if metric else key) if key in second else value
+                for key, value in first.items()}
+    if isinstance(first, list) and isinstance(second, list) and len(first) == len(second):
+        return [best_of(a, b, f"{metric}[{index}]") for index, (a, b) in enumerate(zip(first, second))]
+    if isinstance(first, (int, float)) and isinstance(second, (int, float)) and not isinstance(first, bool):
+        better = direction(metric)
+        if better > 0:
+            return max(first, second)
+        if better < 0:
+            return min(first, second)
+    return first
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True,
+                              timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(names: List[str], scale: str, seed: int, timeout: float = DEFAULT_TIMEOUT,
+              repeat: int = 1) -> Dict[str, Any]:
+    results = {}
+    calibration = calibrate()
+    for name in names:
+        for attempt in range(repeat):
+            print(f"running {name} ({scale}, run {attempt + 1}/{repeat})", file=sys.stderr, flush=True)
+            result = run_benchmark(name, scale, seed, timeout)
+            if 'error' in result:
+                results[name] = result
+                break
+            results[name] = best_of(results[name], result) if name in results else result
+    return {
+        'scale': scale,
+        'seed': seed,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': repeat,
+        # Best of the timings before and after, so a burst of load during one does not count
+        'calibration_s': round(min(calibration, calibrate()), 6),
+        'benchmarks': results
+    }
+
+
+def direction(metric: str) -> int:
+    # +1 when a larger value is better, -1 when smaller is better, 0 when the metric is a count or label
+    leaf = metric.rsplit('.', 1)[-1]
+    if any(fragment in leaf for fragment in HIGHER_IS_BETTER):
+        return 1
+    if leaf.endswith(LOWER_IS_BETTER_SUFFIXES) or any(fragment in leaf for fragment in LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def labelled(metric: str, labels: Any) -> bool:
+    # A label names a metric, a group of metrics (its dotted prefix), or a leaf name found at any depth
+    if labels is True:
+        return True
+    if not isinstance(labels, list):
+        return False
+    leaf = metric.rsplit('.', 1)[-1]
+    return any(metric == label or metric.startswith(label + '.') or leaf == label for label in labels)
+
+
+def flatten(value: Any, prefix: str = '') -> Iterator[Tuple[str, float]]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from flatten(item, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from flatten(item, f"{prefix}[{index}]")
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        yield prefix, float(value)
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD,
+            normalize: bool = True) -> Dict[str, Any]:
+    regressions, improvements, missing = [], [], []
+    compared = 0
+    # >1 when this machine ran slower than the baseline's; CPU-bound timings are divided by it, rates multiplied.
+    # I/O- and sleep-bound metrics do not follow the CPU, so they are compared as measured.
+    speed = 1.0
+    if normalize and baseline.get('calibration_s') and current.get('calibration_s'):
+        speed = current['calibration_s'] / baseline['calibration_s']
+    for name, result in current['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if previous is None or 'error' in previous:
+            continue
+        if 'error' in result:
+            missing.append(name)
+            continue
+        before = dict(flatten(previous))
+        cpu_bound = result.get(CPU_BOUND_KEY, previous.get(CPU_BOUND_KEY))
+        reference = result.get(REFERENCE_KEY, previous.get(REFERENCE_KEY))
+        for metric, value in flatten(result):
+            better = direction(metric)
+            if not better or metric == 'elapsed_s' or metric not in before or before[metric] == 0:
+                continue
+            if labelled(metric, reference):
+                continue
+            compared += 1
+            if metric.endswith('_pct'):
+                # Already a percentage: compare in points, since a baseline near zero makes ratios explode
+                change = (value - before[metric]) / 100
+            else:
+                rescale = labelled(metric, cpu_bound) and not any(fragment in metric for fragment in UNSCALED)
+                factor = speed if rescale else 1.0
+                adjusted = value * factor if better > 0 else value / factor
+                change = (adjusted - before[metric]) / abs(before[metric])
+            entry = {'benchmark': name, 'metric': metric, 'baseline': before[metric], 'current': value,
+                     'change_pct': round(change * 100, 2)}
+            if change * better < -threshold:
+                regressions.append(entry)
+            elif change * better > threshold:
+                improvements.append(entry)
+    return {
+        'threshold_pct': round(threshold * 100, 2),
+        'machine_speed_ratio': round(speed, 4),
+        'metrics_compared': compared,
+        'regressions': regressions,
+        'improvements': improvements,
+        'failed': missing
+    }
+
+
+def _report(comparison: Dict[str, Any]):
+    for label, entries in (('REGRESSION', comparison['regressions']), ('improved', comparison['improvements'])):
+        for entry in entries:
+            print(f"{label:10} {entry['benchmark']}.{entry['metric']}: {entry['baseline']:g} -> "
+                  f"{entry['current']:g} ({entry['change_pct']:+.1f}%)", file=sys.stderr)
+    for name in comparison['failed']:
+        print(f"FAILED     {name}", file=sys.stderr)
+    print(f"{comparison['metrics_compared']} metrics compared, {len(comparison['regressions'])} regressions "
+          f"beyond {comparison['threshold_pct']}% (machine speed ratio {comparison['machine_speed_ratio']})",
+          file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--scale', choices=SCALES, default='small')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--only', help='comma-separated benchmark names, e.g. ledger,payouts')
+    parser.add_argument('--output', help='write the suite result JSON here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='flag regressions against a stored result')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='relative change treated as a regression (default %(default)s)')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per benchmark; the best value of each metric is kept')
+    parser.add_argument('--no-normalize', action='store_true',
+                        help="compare raw numbers instead of rescaling a benchmark's CPU-bound metrics by the "
+                             'calibration timing')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help='seconds allowed per benchmark')
+    parser.add_argument('--list', action='store_true', help='list benchmarks and exit')
+    args = parser.parse_args(argv)
+
+    available = discover()
+    if args.list:
+        print('\n'.join(available))
+        return 0
+    names = available
+    if args.only:
+        names = [name.strip() for name in args.only.split(',') if name.strip()]
+        unknown = sorted(set(names) - set(available))
+        if unknown:
+            parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+
+    result = run_suite(names, args.scale, args.seed, args.timeout, max(1, args.repeat))
+    exit_code = 1 if any('error' in entry for entry in result['benchmarks'].values()) else 0
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        if baseline.get('scale') != args.scale:
+            print(f"warning: baseline scale is {baseline.get('scale')}, this run is {args.scale}", file=sys.stderr)
+        result['comparison'] = compare(baseline, result, args.threshold, normalize=not args.no_normalize)
+        _report(result['comparison'])
+        if result['comparison']['regressions']:
+            exit_code = 1
+
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(text + '\n')
+    else:
+        print(text)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+import json
+import math
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Union
+
+from fastapi import FastAPI, File, Query, Request, Response, UploadFile
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+from agents.application_queue import QueueFull
+from agents.registry import AgentRegistry
+from utils.http_cache import EncodedBodyCache, choose_encoding, etag_matches, gzip_stream
+from utils.http_pool import close_http_pool
+from utils.instrumentation import SamplingProfiler, get_profile, registry, store_profile
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    listings = os.environ.get('JOB_LISTINGS_PATH')
+    if listings and os.path.exists(listings):
+        load_job_listings(listings)
+    # Resumes applications left unfinished by the previous process
+    await agent_registry.get('application_queue').start()
+    yield
+    await agent_registry.close()
+    # Agents share the process-wide keep-alive pool; it outlives them and is closed last
+    await close_http_pool()
+
+
+app = FastAPI(title="JobConnect SA API", version="1.0.0", lifespan=lifespan)
+
+# Agents (and NumPy, OpenCV, ...) are imported and built on the first request that needs them,
+# so a fresh worker is ready to serve as soon as FastAPI is
+agent_registry = AgentRegistry()
+agent_registry.register('job_matcher', 'agents.job_matching:JobMatchingEngine')
+agent_registry.register('job_feed', 'agents.job_feed:JobFeed')
+agent_registry.register('application_queue', 'agents.application_queue:ApplicationQueue')
+agent_registry.register('document_generator', 'agents.document_generation:DocumentGenerator')
+agent_registry.register('cv_pipeline', 'agents.cv_analysis:CVAnalysisPipeline',
+                        upload_dir=os.environ.get('CV_UPLOAD_DIR'),
+                        max_workers=int(os.environ['CV_WORKERS']) if os.environ.get('CV_WORKERS') else None)
+# Per-request sampling (?profile=1) is opt-in: stacks can reveal internals
+REQUEST_PROFILING = os.environ.get('ENABLE_REQUEST_PROFILING') == '1'
+# Feed pages are revalidated with If-None-Match on every view rather than cached blind
+FEED_CACHE_CONTROL = 'no-cache'
+MAX_LONG_POLL = 60.0
+SSE_HEARTBEAT = 15.0
+feed_bodies = EncodedBodyCache()
+
+
+class JobScanRequest(BaseModel):
+    skills: Union[List[str], str, None] = None
+    experience: Union[float, str, None] = None
+    location: Optional[str] = None
+    salary_expectation: Union[float, str, None] = None
+    industry: Optional[str] = None
+    top_k: int = 20
+
+
+class CoverLetterRequest(BaseModel):
+    job_description: str = ''
+    cv_data: Union[Dict[str, Any], str, None] = None
+    tone: str = 'professional'
+    length: str = 'medium'
+
+
+class OptimizeCVRequest(BaseModel):
+    original_analysis: Optional[Dict[str, Any]] = None
+    target_industry: Optional[str] = None
+    experience_level: Optional[str] = None
+
+
+class ApplicationBatchRequest(BaseModel):
+    applications: List[Dict[str, Any]]
+    batch_id: Optional[str] = None
+
+
+def load_job_listings(path: str) -> int:
+    # JSON array or one JSON object per line
+    with open(path) as handle:
+        if path.endswith('.json'):
+            jobs = json.load(handle)
+        else:
+            jobs = [json.loads(line) for line in handle if line.strip()]
+    agent_registry.get('job_feed').upsert_many(jobs)
+    return agent_registry.get('job_matcher').add_jobs(jobs)
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    if not (REQUEST_PROFILING and request.query_params.get('profile') == '1'):
+        return await call_next(request)
+    # Samples every thread, so concurrent requests and threadpool handlers show up too
+    with SamplingProfiler() as profiler:
+        response = await call_next(request)
+    response.headers['X-Profile-Id'] = store_profile({'path': request.url.path, **profiler.snapshot()})
+    return response
+
+
+# Matching is CPU-bound NumPy work, so these run in the threadpool rather than on the event loop
+@app.post("/api/v1/scan-jobs")
+def scan_jobs(request: JobScanRequest) -> Dict[str, Any]:
+    query = request.model_dump()
+    top_k = max(1, min(query.pop('top_k'), 100))
+    try:
+        return {'success': True, 'data': agent_registry.get('job_matcher').search(query, top_k=top_k)}
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+
+
+@app.post("/api/v1/jobs/index")
+def index_jobs(jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    if any('id' not in job for job in jobs):
+        return {'success': False, 'error': 'Every job needs an id'}
+    job_matcher = agent_registry.get('job_matcher')
+    agent_registry.get('job_feed').upsert_many(jobs)
+    return {'success': True, 'data': {'indexed': job_matcher.add_jobs(jobs), 'total': len(job_matcher)}}
+
+
+@app.delete("/api/v1/jobs/index/{job_id}")
+def unindex_job(job_id: str) -> Dict[str, Any]:
+    job_matcher = agent_registry.get('job_matcher')
+    agent_registry.get('job_feed').remove(job_id)
+    return {'success': job_matcher.remove_job(job_id), 'data': {'total': len(job_matcher)}}
+
+
+@app.get("/api/v1/jobs")
+def job_feed(request: Request, province: Optional[str] = None, job_type: Optional[str] = Query(None, alias='type'),
+             min_salary: Optional[float] = None, cursor: Optional[str] = None, limit: Optional[int] = None,
+             format: Optional[str] = None) -> Response:
+    # Newest-first listings, one keyset page at a time: pass next_cursor back as ?cursor= for the next page.
+    # ?format=ndjson (or Accept: application/x-ndjson) streams up to `limit` jobs, one per line.
+    feed = agent_registry.get('job_feed')
+    stream = format == 'ndjson' or 'application/x-ndjson' in request.headers.get('accept', '')
+    try:
+        query = feed.query(province, job_type, min_salary, cursor, limit, stream=stream)
+    except ValueError as e:
+        return JSONResponse({'success': False, 'error': str(e)}, status_code=400)
+
+    etag = feed.etag(query, 'ndjson' if stream else 'json')
+    headers = {'ETag': etag, 'Cache-Control': FEED_CACHE_CONTROL, 'Vary': 'Accept, Accept-Encoding'}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+    accept_encoding = request.headers.get('accept-encoding')
+    if stream:
+        chunks = feed.iter_ndjson(query)
+        if choose_encoding(accept_encoding, offered=('gzip',)):
+            # Streams are gzipped on the fly, chunk by chunk
+            chunks = gzip_stream(chunks)
+            headers['Content-Encoding'] = 'gzip'
+        return StreamingResponse(chunks, media_type='application/x-ndjson', headers=headers)
+    body, applied = feed_bodies.get(etag, choose_encoding(accept_encoding), lambda: feed.render_page(query))
+    if applied:
+        headers['Content-Encoding'] = applied
+    return Response(body, media_type='application/json', headers=headers)
+
+
+@app.post("/api/v1/analyze-cv")
+async def analyze_cv(cv: UploadFile = File(...)) -> Dict[str, Any]:
+    # Saving streams to disk; decoding, deskew and extraction run in the pipeline's process pool
+    pipeline = await agent_registry.aget('cv_pipeline')
+    try:
+        return {'success': True, 'data': await pipeline.analyze_upload(cv)}
+    except ValueError as e:
+        return JSONResponse({'success': False, 'error': str(e)}, status_code=400)
+
+
+@app.post("/api/v1/generate-cover-letter")
+async def generate_cover_letter(request: CoverLetterRequest) -> Dict[str, Any]:
+    generator = await agent_registry.aget('document_generator')
+    data = await generator.generate_cover_letter(
+        request.job_description, request.cv_data, request.tone, request.length
+    )
+    return {'success': True, 'data': data}
+
+
+@app.post("/api/v1/optimize-cv")
+async def optimize_cv(request: OptimizeCVRequest) -> Dict[str, Any]:
+    generator = await agent_registry.aget('document_generator')
+    data = await generator.optimize_cv(
+        request.original_analysis, request.target_industry, request.experience_level
+    )
+    return {'success': True, 'data': data}
+
+
+@app.get("/api/v1/generation-cache/stats")
+def generation_cache_stats() -> Dict[str, Any]:
+    return {'success': True, 'data': agent_registry.get('document_generator').cache_stats()}
+
+
+@app.post("/api/v1/applications", status_code=202)
+async def submit_applications(request: ApplicationBatchRequest) -> Response:
+    # Returns application ids as soon as the batch is stored; follow progress with /events or /wait
+    try:
+        data = await agent_registry.get('application_queue').submit_many(request.applications, request.batch_id)
+    except QueueFull as e:
+        return JSONResponse({'success': False, 'error': str(e)}, status_code=429,
+                            headers={'Retry-After': str(math.ceil(e.retry_after))})
+    except ValueError as e:
+        return JSONResponse({'success': False, 'error': str(e)}, status_code=400)
+    return JSONResponse({'success': True, 'data': data}, status_code=202)
+
+
+@app.get("/api/v1/applications/status")
+async def application_status(ids: Optional[str] = None, batch_id: Optional[str] = None) -> Dict[str, Any]:
+    queue = agent_registry.get('application_queue')
+    if ids:
+        return {'success': True, 'data': await queue.status(ids.split(','))}
+    if batch_id:
+        return {'success': True, 'data': {'batch_id': batch_id, 'statuses': await queue.batch_summary(batch_id),
+                                          'active': queue.is_active(batch_id)}}
+    return {'success': True, 'data': queue.stats()}
+
+
+@app.get("/api/v1/applications/wait")
+async def wait_for_applications(since: int = 0, batch_id: Optional[str] = None, ids: Optional[str] = None,
+                                timeout: float = 25.0) -> Dict[str, Any]:
+    # Long-poll: answers as soon as a watched application changes status; pass back seq as ?since=
+    queue = agent_registry.get('application_queue')
+    data = await queue.wait(since, batch_id, ids.split(',') if ids else None,
+                            timeout=max(0.0, min(timeout, MAX_LONG_POLL)))
+    return {'success': True, 'data': data}
+
+
+@app.get("/api/v1/applications/events")
+async def application_events(request: Request, batch_id: Optional[str] = None, since: int = 0) -> StreamingResponse:
+    # Server-sent events; a reconnecting EventSource resumes from Last-Event-ID
+    queue = agent_registry.get('application_queue')
+    last_event_id = request.headers.get('last-event-id')
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def stream():
+        async for update in queue.events(since, batch_id, heartbeat=SSE_HEARTBEAT):
+            if await request.is_disconnected():
+                return
+            if update['resync']:
+                yield f"id: {update['seq']}\nevent: resync\ndata: {{}}\n\n"
+            elif update['changes']:
+                yield f"id: {update['seq']}\nevent: status\ndata: {json.dumps(update['changes'])}\n\n"
+            else:
+                yield ': keep-alive\n\n'
+        yield f"event: done\ndata: {json.dumps({'batch_id': batch_id})}\n\n"
+
+    return StreamingResponse(stream(), media_type='text/event-stream',
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.prometheus(), media_type='text/plain; version=0.0.4')
+
+
+@app.get("/api/v1/metrics")
+def metrics_snapshot() -> Dict[str, Any]:
+    return {'success': True, 'data': registry.snapshot()}
+
+
+@app.get("/api/v1/health")
+def health() -> Dict[str, Any]:
+    return {'success': True, 'data': {'agents': agent_registry.stats()}}
+
+
+@app.get("/api/v1/profiles/{profile_id}")
+def request_profile(profile_id: str) -> Dict[str, Any]:
+    profile = get_profile(profile_id)
+    if profile is None:
+        return {'success': False, 'error': 'Unknown or expired profile'}
+    return {'success': True, 'data': profile}
@@ -0,0 +1,205 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(value: Any) -> Any:
+    # Whitespace differences should not produce a different generation; case can (role and company
+    # extraction keys off capitalised words and the letter echoes the text as written)
+    if isinstance(value, str):
+        return _WHITESPACE.sub(' ', value).strip()
+    if isinstance(value, dict):
+        return {str(key): normalize(item) for key, item in value.items() if item not in (None, '', [], {})}
+    if isinstance(value, (list, tuple)):
+        return [normalize(item) for item in value]
+    return value
+
+
+def generation_key(namespace: str, template_version: str, **parts: Any) -> str:
+    payload = json.dumps([namespace, template_version, normalize(parts)], sort_keys=True,
+                         separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class GenerationCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600.0, disk_dir: Optional[str] = None,
+                 max_disk_bytes: int = 256 << 20, clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._clock = clock
+        # key -> (expires_at, value), least recently used first
+        self._memory: 'OrderedDict[str, Tuple[float, Any]]' = OrderedDict()
+        # key -> file size, least recently used first; rebuilt from the directory on start
+        self._disk: 'OrderedDict[str, int]' = OrderedDict()
+        self._disk_bytes = 0
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._pending_writes: Set[asyncio.Task] = set()
+        self.counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'single_flight_waits': 0,
+                         'memory_evictions': 0, 'disk_evictions': 0, 'expired': 0, 'errors': 0}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self):
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.json'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-5], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._trim_disk()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key + '.json')
+
+    def _remember(self, key: str, value: Any, expires_at: float):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.counters['memory_evictions'] += 1
+
+    def _memory_get(self, key: str) -> Tuple[bool, Any]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return False, None
+        if entry[0] <= self._clock():
+            del self._memory[key]
+            self.counters['expired'] += 1
+            return False, None
+        self._memory.move_to_end(key)
+        return True, entry[1]
+
+    def _disk_read(self, key: str) -> Optional[Tuple[float, Any]]:
+        try:
+            with open(self._path(key)) as handle:
+                record = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        return record['expires_at'], record['value']
+
+    def _disk_write(self, key: str, value: Any, expires_at: float) -> int:
+        # Write-then-rename so a crash never leaves a torn entry behind
+        handle = tempfile.NamedTemporaryFile('w', dir=self.disk_dir, suffix='.tmp', delete=False)
+        try:
+            with handle:
+                json.dump({'expires_at': expires_at, 'value': value}, handle, separators=(',', ':'))
+            os.replace(handle.name, self._path(key))
+        except BaseException:
+            os.unlink(handle.name)
+            raise
+        return os.path.getsize(self._path(key))
+
+    def _disk_remove(self, key: str):
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+            try:
+                os.unlink(self._path(key))
+            except OSError:
+                pass
+
+    def _trim_disk(self):
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            self._disk_remove(next(iter(self._disk)))
+            self.counters['disk_evictions'] += 1
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, str]:
+        # Returns (value, source) where source is 'memory', 'disk', 'shared' or 'generated'
+        found, value = self._memory_get(key)
+        if found:
+            self.counters['memory_hits'] += 1
+            return value, 'memory'
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.counters['single_flight_waits'] += 1
+            return await asyncio.shield(in_flight), 'shared'
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value, source = await self._load_or_generate(key, factory)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.counters['errors'] += 1
+            future.set_exception(e)
+            # Waiters get the exception; nobody else needs to retrieve it
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+            return value, source
+        finally:
+            del self._in_flight[key]
+
+    async def _load_or_generate(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[Any, str]:
+        loop = asyncio.get_running_loop()
+        if key in self._disk:
+            # Entries are a few KB; a direct read is cheaper than the thread hand-off (and its GIL wait)
+            record = self._disk_read(key)
+            if record is not None and record[0] > self._clock():
+                self._disk.move_to_end(key)
+                self.counters['disk_hits'] += 1
+                self._remember(key, record[1], record[0])
+                return record[1], 'disk'
+            self._disk_remove(key)
+            if record is not None:
+                self.counters['expired'] += 1
+
+        self.counters['misses'] += 1
+        value = await factory()
+        expires_at = self._clock() + self.ttl
+        self._remember(key, value, expires_at)
+        if self.disk_dir:
+            # Persisting is off the response path; the memory tier already serves the key
+            task = loop.create_task(self._persist(key, value, expires_at))
+            self._pending_writes.add(task)
+            task.add_done_callback(self._pending_writes.discard)
+        return value, 'generated'
+
+    async def _persist(self, key: str, value: Any, expires_at: float):
+        try:
+            size = await asyncio.get_running_loop().run_in_executor(None, self._disk_write, key, value, expires_at)
+        except (OSError, TypeError, ValueError):
+            self.counters['errors'] += 1
+            return
+        self._disk_bytes += size - self._disk.pop(key, 0)
+        self._disk[key] = size
+        self._trim_disk()
+
+    async def flush(self):
+        while self._pending_writes:
+            await asyncio.gather(*list(self._pending_writes))
+
+    def invalidate(self, key: str):
+        self._memory.pop(key, None)
+        if self.disk_dir:
+            self._disk_remove(key)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = sum(self.counters[name] for name in ('memory_hits', 'disk_hits', 'misses', 'single_flight_waits'))
+        hits = lookups - self.counters['misses']
+        return {
+            **self.counters,
+            'hit_ratio': round(hits / lookups, 4) if lookups else 0.0,
+            'memory_entries': len(self._memory),
+            'disk_entries': len(self._disk),
+            'disk_bytes': self._disk_bytes
+        }
@@ -0,0 +1,108 @@
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+MIN_COMPRESS_BYTES = 512
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+MAX_CACHED_BODIES = 512
+
+
+@lru_cache(maxsize=1)
+def _brotli():
+    # Optional: offered only when the brotli package is installed
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # Weak comparison, as If-None-Match requires
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    bare = etag[2:] if etag.startswith('W/') else etag
+    return any((tag.strip()[2:] if tag.strip().startswith('W/') else tag.strip()) == bare
+               for tag in if_none_match.split(','))
+
+
+def choose_encoding(accept_encoding: Optional[str], offered: Tuple[str, ...] = ('br', 'gzip')) -> Optional[str]:
+    if not accept_encoding:
+        return None
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        weight = 1.0
+        if params.strip().startswith('q='):
+            try:
+                weight = float(params.strip()[2:])
+            except ValueError:
+                weight = 0.0
+        accepted[name.strip().lower()] = weight
+    for encoding in offered:
+        if encoding == 'br' and _brotli() is None:
+            continue
+        if accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == 'br':
+        return _brotli().compress(body, quality=BROTLI_QUALITY)
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    return body
+
+
+def gzip_stream(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # Compresses a streamed body chunk by chunk; each chunk is flushed so lines reach the client promptly
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class EncodedBodyCache:
+    # Rendered and compressed bodies keyed by (etag, encoding). An ETag changes whenever the content
+    # does, so entries never need invalidating; old ones simply age out of the LRU.
+    def __init__(self, max_entries: int = MAX_CACHED_BODIES):
+        self.max_entries = max_entries
+        self._bodies: 'OrderedDict[Tuple[str, Optional[str]], Tuple[bytes, Optional[str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, etag: str, encoding: Optional[str],
+            render: Callable[[], bytes]) -> Tuple[bytes, Optional[str]]:
+        # Returns the body and the Content-Encoding actually applied (small bodies are sent as-is)
+        key = (etag, encoding)
+        with self._lock:
+            cached = self._bodies.get(key)
+            if cached is not None:
+                self._bodies.move_to_end(key)
+                self.counters['hits'] += 1
+                return cached
+        body = render()
+        if encoding and len(body) >= MIN_COMPRESS_BYTES:
+            cached = (compress(body, encoding), encoding)
+        else:
+            cached = (body, None)
+        with self._lock:
+            self.counters['misses'] += 1
+            self._bodies[key] = cached
+            while len(self._bodies) > self.max_entries:
+                self._bodies.popitem(last=False)
+                self.counters['evictions'] += 1
+        return cached
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'entries': len(self._bodies), **self.counters}
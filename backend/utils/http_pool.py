@@ -0,0 +1,154 @@
+import asyncio
+from collections import defaultdict
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from utils.stats import LatencyHistogram
+
+if TYPE_CHECKING:
+    import aiohttp
+
+POOL_LIMIT = 100
+POOL_LIMIT_PER_HOST = 20
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 30
+# aiohttp costs ~170 ms to import, so it is loaded when the first session is opened
+DEFAULT_TIMEOUT = {'total': 30, 'connect': 5, 'sock_read': 20}
+
+
+@lru_cache(maxsize=1)
+def client_errors() -> Tuple[type, ...]:
+    # Transport failures worth retrying; for use in except clauses without importing aiohttp up front
+    import aiohttp
+    return aiohttp.ClientError, asyncio.TimeoutError
+
+
+class HttpPool:
+    def __init__(self, limit: int = POOL_LIMIT, limit_per_host: int = POOL_LIMIT_PER_HOST,
+                 dns_cache_ttl: int = DNS_CACHE_TTL, keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+                 timeout: Optional['aiohttp.ClientTimeout'] = None):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.session: Optional['aiohttp.ClientSession'] = None
+        self._loop = None
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.latency = LatencyHistogram()
+        self.host_latency: Dict[str, LatencyHistogram] = defaultdict(LatencyHistogram)
+
+    async def start(self) -> 'aiohttp.ClientSession':
+        import aiohttp
+
+        loop = asyncio.get_running_loop()
+        # Sessions are bound to the loop that created them
+        if self.session is not None and not self.session.closed and self._loop is not loop:
+            if not self._loop.is_closed():
+                # Replacing it would leak its sockets and break requests still running on that loop
+                raise RuntimeError('HttpPool is in use by another event loop; close() it there first')
+            # Its loop is gone and nothing on it can be awaited any more; the sockets go with the session
+            self.session = None
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                use_dns_cache=True,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout or aiohttp.ClientTimeout(**DEFAULT_TIMEOUT),
+                trace_configs=[self._trace_config()]
+            )
+            self._loop = loop
+        return self.session
+
+    async def close(self):
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self._loop = None
+
+    async def __aenter__(self) -> 'HttpPool':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _trace_config(self) -> 'aiohttp.TraceConfig':
+        import aiohttp
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        trace.on_connection_create_end.append(self._on_connection_create)
+        trace.on_connection_reuseconn.append(self._on_connection_reuse)
+        return trace
+
+    async def _on_request_start(self, session, ctx, params):
+        ctx.started_at = asyncio.get_running_loop().time()
+        self.in_flight += 1
+        self.requests += 1
+
+    def _finish(self, ctx, url):
+        self.in_flight -= 1
+        elapsed = asyncio.get_running_loop().time() - ctx.started_at
+        self.latency.observe(elapsed)
+        self.host_latency[url.host].observe(elapsed)
+
+    async def _on_request_end(self, session, ctx, params):
+        self._finish(ctx, params.url)
+
+    async def _on_request_exception(self, session, ctx, params):
+        self.errors += 1
+        self._finish(ctx, params.url)
+
+    async def _on_connection_create(self, session, ctx, params):
+        self.connections_created += 1
+
+    async def _on_connection_reuse(self, session, ctx, params):
+        self.connections_reused += 1
+
+    def stats(self) -> Dict[str, Any]:
+        idle = active = 0
+        if self.session is not None and not self.session.closed:
+            connector = self.session.connector
+            # aiohttp keeps idle keep-alive sockets in _conns and checked-out ones in _acquired
+            idle = sum(len(conns) for conns in getattr(connector, '_conns', {}).values())
+            active = len(getattr(connector, '_acquired', ()))
+        return {
+            'open_connections': idle + active,
+            'idle_connections': idle,
+            'active_connections': active,
+            'in_flight_requests': self.in_flight,
+            'requests': self.requests,
+            'errors': self.errors,
+            'connections_created': self.connections_created,
+            'connections_reused': self.connections_reused,
+            'latency': self.latency.snapshot(),
+            'host_latency': {host: histogram.snapshot() for host, histogram in self.host_latency.items()}
+        }
+
+
+_default_pool: Optional[HttpPool] = None
+
+
+def get_http_pool() -> HttpPool:
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = HttpPool()
+    return _default_pool
+
+
+async def close_http_pool():
+    if _default_pool is not None:
+        await _default_pool.close()
@@ -0,0 +1,304 @@
+import functools
+import inspect
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from utils.stats import LatencyHistogram
+
+METRIC_PREFIX = 'jobplatform'
+PROFILE_INTERVAL = 0.002
+PROFILE_MAX_DEPTH = 48
+PROFILES_KEPT = 32
+
+
+class _State:
+    __slots__ = ('enabled',)
+
+    def __init__(self):
+        self.enabled = os.environ.get('JOBPLATFORM_INSTRUMENTATION', '1') != '0'
+
+
+_state = _State()
+
+
+def enable():
+    _state.enabled = True
+
+
+def disable():
+    _state.enabled = False
+
+
+def is_enabled() -> bool:
+    return _state.enabled
+
+
+class OperationStats:
+    __slots__ = ('component', 'operation', 'calls', 'errors', 'in_flight', 'latency', '_lock')
+
+    def __init__(self, component: str, operation: str):
+        self.component = component
+        self.operation = operation
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.latency = LatencyHistogram()
+        # Security calls run in executor threads, so updates are locked
+        self._lock = threading.Lock()
+
+    def start(self) -> float:
+        with self._lock:
+            self.in_flight += 1
+        return time.perf_counter()
+
+    def finish(self, started: float, failed: bool = False):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.in_flight -= 1
+            self.calls += 1
+            if failed:
+                self.errors += 1
+            self.latency.observe(elapsed)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'calls': self.calls, 'errors': self.errors, 'in_flight': self.in_flight,
+                    'latency': self.latency.snapshot()}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._operations: Dict[Tuple[str, str], OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def operation(self, component: str, operation: str) -> OperationStats:
+        key = (component, operation)
+        stats = self._operations.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._operations.setdefault(key, OperationStats(component, operation))
+        return stats
+
+    def component(self, component: str) -> Dict[str, Dict[str, Any]]:
+        return {stats.operation: stats.snapshot() for (name, _), stats in list(self._operations.items())
+                if name == component}
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        components: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (component, operation), stats in sorted(self._operations.items()):
+            components.setdefault(component, {})[operation] = stats.snapshot()
+        return components
+
+    def reset(self):
+        # Cleared in place: decorated functions hold on to their OperationStats
+        for stats in list(self._operations.values()):
+            with stats._lock:
+                stats.calls = stats.errors = 0
+                stats.latency = LatencyHistogram()
+
+    def prometheus(self) -> str:
+        calls, errors, in_flight, latency = [], [], [], []
+        for (component, operation), stats in sorted(self._operations.items()):
+            labels = f'component="{component}",operation="{operation}"'
+            with stats._lock:
+                calls.append(f"{METRIC_PREFIX}_calls_total{{{labels}}} {stats.calls}")
+                errors.append(f"{METRIC_PREFIX}_errors_total{{{labels}}} {stats.errors}")
+                in_flight.append(f"{METRIC_PREFIX}_in_flight{{{labels}}} {stats.in_flight}")
+                for upper_bound, count in stats.latency.cumulative():
+                    le = '+Inf' if upper_bound == float('inf') else repr(upper_bound)
+                    latency.append(f'{METRIC_PREFIX}_latency_seconds_bucket{{{labels},le="{le}"}} {count}')
+                latency.append(f"{METRIC_PREFIX}_latency_seconds_sum{{{labels}}} {stats.latency.sum!r}")
+                latency.append(f"{METRIC_PREFIX}_latency_seconds_count{{{labels}}} {stats.latency.count}")
+        lines = []
+        for name, kind, help_text, samples in (
+            ('calls_total', 'counter', 'Completed calls', calls),
+            ('errors_total', 'counter', 'Calls that raised', errors),
+            ('in_flight', 'gauge', 'Calls currently running', in_flight),
+            ('latency_seconds', 'histogram', 'Call latency', latency)
+        ):
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+class measure:
+    # Context manager for blocks that are not a whole function: `with measure('ledger', 'scan'):`
+    __slots__ = ('stats', 'started')
+
+    def __init__(self, component: str, operation: str):
+        self.stats = registry.operation(component, operation)
+        self.started = None
+
+    def __enter__(self) -> 'measure':
+        if _state.enabled:
+            self.started = self.stats.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if self.started is not None:
+            self.stats.finish(self.started, exc_type is not None)
+            self.started = None
+
+    async def __aenter__(self) -> 'measure':
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        self.__exit__(exc_type, exc, traceback)
+
+
+def instrumented(component: str, operation: Optional[str] = None) -> Callable:
+    # Stats are resolved once at decoration time; when disabled a call costs one flag check
+    def decorate(func: Callable) -> Callable:
+        stats = registry.operation(component, operation or func.__name__.lstrip('_'))
+
+        if inspect.isasyncgenfunction(func):
+            async def measured_stream(args, kwargs):
+                started = stats.start()
+                failed = True
+                agen = func(*args, **kwargs)
+                try:
+                    async for item in agen:
+                        yield item
+                    failed = False
+                except GeneratorExit:
+                    # The consumer stopped reading early; that is not a failure
+                    failed = False
+                    raise
+                finally:
+                    try:
+                        # Runs the wrapped generator's own cleanup now rather than whenever it is collected
+                        await agen.aclose()
+                    finally:
+                        stats.finish(started, failed)
+
+            @functools.wraps(func)
+            def stream_wrapper(*args, **kwargs):
+                if not _state.enabled:
+                    return func(*args, **kwargs)
+                return measured_stream(args, kwargs)
+            return stream_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _state.enabled:
+                    return await func(*args, **kwargs)
+                started = stats.start()
+                failed = True
+                try:
+                    result = await func(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    stats.finish(started, failed)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            started = stats.start()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                stats.finish(started, failed)
+        return wrapper
+    return decorate
+
+
+class SamplingProfiler:
+    # Walks sys._current_frames() from a background thread and counts collapsed stacks
+    # ("outer;inner;leaf"), the input format of flame graph tools.
+    def __init__(self, interval: float = PROFILE_INTERVAL, thread_ids: Optional[List[int]] = None,
+                 max_depth: int = PROFILE_MAX_DEPTH):
+        self.interval = interval
+        self.thread_ids = set(thread_ids) if thread_ids else None
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = 0.0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'SamplingProfiler':
+        self.started_at = time.perf_counter()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> 'SamplingProfiler':
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.duration = time.perf_counter() - self.started_at
+        return self
+
+    def __enter__(self) -> 'SamplingProfiler':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        # First sample is taken immediately so short requests still record something
+        while True:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                self.stacks[self._collapse(frame)] += 1
+            self.samples += 1
+            if self._stop.wait(self.interval):
+                return
+
+    def _collapse(self, frame) -> str:
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+    def collapsed(self) -> str:
+        return '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def snapshot(self, top: int = 25) -> Dict[str, Any]:
+        return {
+            'samples': self.samples,
+            'interval_s': self.interval,
+            'duration_s': round(self.duration, 6),
+            'top_stacks': [{'stack': stack, 'count': count} for stack, count in self.stacks.most_common(top)]
+        }
+
+
+_profiles: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def store_profile(profile: Dict[str, Any]) -> str:
+    profile_id = secrets.token_hex(8)
+    with _profiles_lock:
+        _profiles[profile_id] = profile
+        while len(_profiles) > PROFILES_KEPT:
+            _profiles.popitem(last=False)
+    return profile_id
+
+
+def get_profile(profile_id: str) -> Optional[Dict[str, Any]]:
+    with _profiles_lock:
+        return _profiles.get(profile_id)
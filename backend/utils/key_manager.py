@@ -0,0 +1,189 @@
+import base64
+import json
+import os
+import tempfile
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+# cryptography is imported where keys are first generated, derived or wrapped, not at module load
+if TYPE_CHECKING:
+    from cryptography.fernet import MultiFernet
+
+# "3:<fernet key>,2:<fernet key>" or bare keys, newest first
+KEYS_ENV = 'JOBPLATFORM_ENCRYPTION_KEYS'
+KEYRING_PATH_ENV = 'JOBPLATFORM_KEYRING_PATH'
+MASTER_SECRET_ENV = 'JOBPLATFORM_MASTER_SECRET'
+KEY_SALT_ENV = 'JOBPLATFORM_KEY_SALT'
+
+DEFAULT_KEYRING_PATH = os.path.join(os.path.expanduser('~'), '.jobplatform', 'keyring.json')
+DEFAULT_KEY_SALT = b'jobconnect-sa-keyring'
+PBKDF2_ITERATIONS = 100000
+
+
+def derive_key(secret: bytes, salt: bytes, iterations: int = PBKDF2_ITERATIONS) -> bytes:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=salt,
+        iterations=iterations,
+    )
+    return base64.urlsafe_b64encode(kdf.derive(secret))
+
+
+class KeyManager:
+    def __init__(self, keyring_path: Optional[str] = None, keys: Optional[Dict[int, bytes]] = None):
+        self.keyring_path = keyring_path or os.environ.get(KEYRING_PATH_ENV, DEFAULT_KEYRING_PATH)
+        self._lock = threading.RLock()
+        if keys:
+            self._keys = dict(keys)
+            self.source = 'explicit'
+        else:
+            self._keys, self.source = self._load_keys()
+        self._rebuild()
+
+    @property
+    def primary_version(self) -> int:
+        return self._primary_version
+
+    @property
+    def primary_key(self) -> bytes:
+        return self._keys[self._primary_version]
+
+    @property
+    def versions(self) -> List[int]:
+        return sorted(self._keys, reverse=True)
+
+    @property
+    def fernet(self) -> 'MultiFernet':
+        return self._fernet
+
+    def _load_keys(self):
+        env_keys = os.environ.get(KEYS_ENV)
+        if env_keys:
+            return self._parse_env_keys(env_keys), 'env'
+
+        if os.path.exists(self.keyring_path):
+            return self._read_keyring(), 'keyring'
+
+        master_secret = os.environ.get(MASTER_SECRET_ENV)
+        if master_secret:
+            salt = os.environ.get(KEY_SALT_ENV, '').encode() or DEFAULT_KEY_SALT
+            return {1: derive_key(master_secret.encode(), salt)}, 'derived'
+
+        from cryptography.fernet import Fernet
+
+        keys = {1: Fernet.generate_key()}
+        try:
+            self._write_keyring(keys, exclusive=True)
+        except FileExistsError:
+            # Another worker started at the same moment and created the keyring first; use its key
+            return self._read_keyring(), 'keyring'
+        except OSError:
+            # Read-only deployments keep the generated key for the life of the process
+            pass
+        return keys, 'generated'
+
+    def _parse_env_keys(self, value: str) -> Dict[int, bytes]:
+        entries = [entry.strip() for entry in value.split(',') if entry.strip()]
+        keys = {}
+        for position, entry in enumerate(entries):
+            version, sep, key = entry.partition(':')
+            if sep:
+                keys[int(version)] = key.encode()
+            else:
+                keys[len(entries) - position] = entry.encode()
+        return keys
+
+    def _read_keyring(self) -> Dict[int, bytes]:
+        with open(self.keyring_path, 'r') as keyring_file:
+            payload = json.load(keyring_file)
+        return {int(version): key.encode() for version, key in payload['keys'].items()}
+
+    def _write_keyring(self, keys: Dict[int, bytes], exclusive: bool = False):
+        # Written to a private temp file and moved into place, so readers never see a partial keyring.
+        # exclusive=True fails with FileExistsError instead of replacing a keyring that already exists.
+        directory = os.path.dirname(os.path.abspath(self.keyring_path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.keyring-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as keyring_file:
+                json.dump({
+                    'primary': max(keys),
+                    'keys': {str(version): key.decode() for version, key in keys.items()}
+                }, keyring_file)
+                keyring_file.flush()
+                os.fsync(keyring_file.fileno())
+            if exclusive:
+                os.link(tmp_path, self.keyring_path)
+            else:
+                os.replace(tmp_path, self.keyring_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _rebuild(self):
+        from cryptography.fernet import Fernet, MultiFernet
+
+        self._primary_version = max(self._keys)
+        self._fernet = MultiFernet([Fernet(self._keys[version]) for version in self.versions])
+
+    def _check_persistable(self):
+        # Keys from the environment win over the keyring file on every start, so a change written to the file
+        # would be silently undone by the next restart
+        if self.source == 'env':
+            raise ValueError(f"Encryption keys come from {KEYS_ENV}; update that variable to rotate or retire keys")
+
+    def rotate(self, new_key: Optional[bytes] = None, persist: bool = True) -> int:
+        # With persist=True a failed write raises and the current keys stay in use
+        with self._lock:
+            if persist:
+                self._check_persistable()
+            keys = dict(self._keys)
+            version = max(keys) + 1
+            if new_key is None:
+                from cryptography.fernet import Fernet
+                new_key = Fernet.generate_key()
+            keys[version] = new_key
+            if persist:
+                self._write_keyring(keys)
+            self._keys = keys
+            self._rebuild()
+            return version
+
+    def retire(self, version: int, persist: bool = True):
+        with self._lock:
+            if version == self._primary_version:
+                raise ValueError("Cannot retire the primary encryption key")
+            if persist:
+                self._check_persistable()
+            keys = {v: k for v, k in self._keys.items() if v != version}
+            if persist:
+                self._write_keyring(keys)
+            self._keys = keys
+            self._rebuild()
+
+    def reencrypt(self, tokens: Iterable[bytes]) -> List[bytes]:
+        fernet = self._fernet
+        return [fernet.rotate(token) for token in tokens]
+
+
+_default_manager: Optional[KeyManager] = None
+_default_manager_lock = threading.Lock()
+
+
+def get_key_manager() -> KeyManager:
+    global _default_manager
+    if _default_manager is None:
+        with _default_manager_lock:
+            if _default_manager is None:
+                _default_manager = KeyManager()
+    return _default_manager
+
+
+def set_key_manager(manager: Optional[KeyManager]):
+    global _default_manager
+    with _default_manager_lock:
+        _default_manager = manager
@@ -0,0 +1,123 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == '_'
+
+
+class KeywordAutomaton:
+    # Aho-Corasick automaton: every keyword is found in one left-to-right pass over the text,
+    # however large the vocabulary grows.
+    def __init__(self, keywords: Iterable[str] = (), whole_words: bool = False):
+        self.whole_words = whole_words
+        self.keywords: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._terminal: List[Tuple[int, ...]] = [()]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self._built = True
+        for keyword in keywords:
+            self.add(keyword)
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def add(self, keyword: str) -> int:
+        keyword = keyword.lower()
+        if keyword in self._index:
+            return self._index[keyword]
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._terminal.append(())
+            state = next_state
+        keyword_id = len(self.keywords)
+        self.keywords.append(keyword)
+        self._index[keyword] = keyword_id
+        self._terminal[state] = self._terminal[state] + (keyword_id,)
+        self._built = False
+        return keyword_id
+
+    def build(self):
+        # Breadth-first failure links; each state's outputs include those of its failure state
+        goto, fail = self._goto, self._fail
+        outputs = self._outputs = list(self._terminal)
+        queue = deque()
+        for state in goto[0].values():
+            fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, next_state in goto[state].items():
+                queue.append(next_state)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[next_state] = goto[fallback].get(char, 0)
+                outputs[next_state] = outputs[next_state] + outputs[fail[next_state]]
+        self._built = True
+
+    def iter_matches(self, text: str):
+        # Yields (start, keyword_id) for matches that begin on a word boundary
+        # (and, with whole_words, also end on one). Expects lowercased text.
+        if not self._built:
+            self.build()
+        goto, fail, outputs, keywords = self._goto, self._fail, self._outputs, self.keywords
+        whole_words = self.whole_words
+        length = len(text)
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not outputs[state]:
+                continue
+            for keyword_id in outputs[state]:
+                start = position - len(keywords[keyword_id]) + 1
+                if start and _is_word_char(text[start - 1]):
+                    continue
+                if whole_words and position + 1 < length and _is_word_char(text[position + 1]):
+                    continue
+                yield start, keyword_id
+
+    def matches(self, text: str) -> Set[int]:
+        return {keyword_id for _, keyword_id in self.iter_matches(text.lower())}
+
+    def matched_keywords(self, text: str) -> List[str]:
+        return [self.keywords[keyword_id] for keyword_id in sorted(self.matches(text))]
+
+
+class KeywordClassifier:
+    # Maps keywords to labels in several tables (e.g. complexity level, capability) with one automaton
+    def __init__(self, tables: Dict[str, Dict[str, Iterable[str]]], whole_words: bool = False):
+        self.automaton = KeywordAutomaton(whole_words=whole_words)
+        self.labels: Dict[str, List[str]] = {table: list(groups) for table, groups in tables.items()}
+        self._payloads: List[List[Tuple[str, str]]] = []
+        for table, groups in tables.items():
+            for label, keywords in groups.items():
+                for keyword in keywords:
+                    keyword_id = self.automaton.add(keyword)
+                    if keyword_id == len(self._payloads):
+                        self._payloads.append([])
+                    if (table, label) not in self._payloads[keyword_id]:
+                        self._payloads[keyword_id].append((table, label))
+        self.automaton.build()
+
+    def classify(self, text: str) -> Dict[str, Dict[str, List[str]]]:
+        # {table: {label: [matched keywords]}} for every distinct keyword found
+        hits: Dict[str, Dict[str, List[str]]] = {table: {} for table in self.labels}
+        for keyword_id in self.automaton.matches(text):
+            keyword = self.automaton.keywords[keyword_id]
+            for table, label in self._payloads[keyword_id]:
+                hits[table].setdefault(label, []).append(keyword)
+        return hits
+
+    def classify_many(self, texts: Iterable[str]) -> List[Dict[str, Dict[str, List[str]]]]:
+        return [self.classify(text) for text in texts]
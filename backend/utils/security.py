@@ -1,52 +1,146 @@
 import hashlib
+import json
 import secrets
 import base64
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+import struct
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Iterable, List, Optional, Union
+
+from utils.instrumentation import instrumented
+from utils.key_manager import KeyManager, get_key_manager
+
+if TYPE_CHECKING:
+    from cryptography.fernet import MultiFernet
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Each stream frame is a length-prefixed Fernet token over (chunk index, last flag, chunk)
+_FRAME_LENGTH = struct.Struct('>I')
+_CHUNK_HEADER = struct.Struct('>IB')
+
+
+def canonical_bytes(data: Any) -> bytes:
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, str):
+        return data.encode()
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str).encode()
 
 class MilitaryGradeSecurity:
-    def __init__(self):
-        self.encryption_key = self._generate_encryption_key()
-        self.fernet = Fernet(self.encryption_key)
-        
-    def _generate_encryption_key(self) -> bytes:
-        password = secrets.token_bytes(32)
-        salt = secrets.token_bytes(16)
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        return key
+    def __init__(self, key_manager: Optional[KeyManager] = None):
+        self._key_manager = key_manager
+
+    @property
+    def key_manager(self) -> KeyManager:
+        # Keys are derived/loaded once per process and shared by every agent, on first use rather
+        # than when an agent is constructed
+        if self._key_manager is None:
+            self._key_manager = get_key_manager()
+        return self._key_manager
+
+    @property
+    def encryption_key(self) -> bytes:
+        return self.key_manager.primary_key
+
+    @property
+    def fernet(self) -> 'MultiFernet':
+        return self.key_manager.fernet
     
+    @instrumented('security')
     def encrypt_sensitive_data(self, data: str) -> str:
         encrypted_data = self.fernet.encrypt(data.encode())
         return base64.urlsafe_b64encode(encrypted_data).decode()
     
+    @instrumented('security')
     def decrypt_sensitive_data(self, encrypted_data: str) -> str:
         decoded_data = base64.urlsafe_b64decode(encrypted_data)
         return self.fernet.decrypt(decoded_data).decode()
     
+    @instrumented('security')
+    def reencrypt_records(self, records: Iterable[Dict], fields: Iterable[str]) -> List[Dict]:
+        fields = tuple(fields)
+        fernet = self.fernet
+        rotated = []
+        for record in records:
+            updated = dict(record)
+            for field in fields:
+                value = updated.get(field)
+                if value:
+                    token = fernet.rotate(base64.urlsafe_b64decode(value))
+                    updated[field] = base64.urlsafe_b64encode(token).decode()
+            rotated.append(updated)
+        return rotated
+    
+    @instrumented('security')
+    def encrypt_batch(self, records: Union[Dict, List[Dict]]) -> str:
+        # One Fernet token for the whole record (or list of records); tokens are already urlsafe base64
+        return self.fernet.encrypt(canonical_bytes(records)).decode()
+    
+    @instrumented('security')
+    def decrypt_batch(self, token: Union[str, bytes]) -> Union[Dict, List[Dict]]:
+        if isinstance(token, str):
+            token = token.encode()
+        return json.loads(self.fernet.decrypt(token))
+    
+    @instrumented('security')
+    def encrypt_stream(self, source: BinaryIO, sink: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> str:
+        fernet = self.fernet
+        digest = hashlib.sha256()
+        index = 0
+        chunk = source.read(chunk_size)
+        while True:
+            next_chunk = source.read(chunk_size) if chunk else b''
+            is_last = not next_chunk
+            digest.update(chunk)
+            token = fernet.encrypt(_CHUNK_HEADER.pack(index, is_last) + chunk)
+            sink.write(_FRAME_LENGTH.pack(len(token)))
+            sink.write(token)
+            if is_last:
+                return digest.hexdigest()
+            chunk = next_chunk
+            index += 1
+    
+    @instrumented('security')
+    def decrypt_stream(self, source: BinaryIO, sink: BinaryIO) -> str:
+        from cryptography.fernet import InvalidToken
+
+        fernet = self.fernet
+        digest = hashlib.sha256()
+        expected_index = 0
+        while True:
+            header = source.read(_FRAME_LENGTH.size)
+            if len(header) < _FRAME_LENGTH.size:
+                raise InvalidToken("Encrypted stream is truncated")
+            token = source.read(_FRAME_LENGTH.unpack(header)[0])
+            payload = fernet.decrypt(token)
+            index, is_last = _CHUNK_HEADER.unpack_from(payload)
+            if index != expected_index:
+                raise InvalidToken("Encrypted stream chunks are out of order")
+            chunk = payload[_CHUNK_HEADER.size:]
+            digest.update(chunk)
+            sink.write(chunk)
+            if is_last:
+                return digest.hexdigest()
+            expected_index += 1
+    
+    @instrumented('security')
     def secure_api_call(self, endpoint: str, data: Dict) -> Dict:
-        encrypted_data = {k: self.encrypt_sensitive_data(str(v)) for k, v in data.items()}
+        encrypted_data = self.encrypt_batch(data)
         return {
             'encrypted': True,
             'data': encrypted_data,
             'timestamp': datetime.now().isoformat(),
             'security_level': 'military_grade',
-            'checksum': self._generate_checksum(str(encrypted_data))
+            'checksum': self._generate_checksum(encrypted_data)
         }
     
-    def _generate_checksum(self, data: str) -> str:
-        return hashlib.sha256(data.encode()).hexdigest()
+    def _generate_checksum(self, data: Any) -> str:
+        return hashlib.sha256(canonical_bytes(data)).hexdigest()
     
+    @instrumented('security')
     def validate_request(self, request_data: Dict) -> bool:
         expected_checksum = request_data.get('checksum')
         data = request_data.get('data', {})
-        return self._generate_checksum(str(data)) == expected_checksum
+        return self._generate_checksum(data) == expected_checksum
     
     def generate_secure_token(self, length: int = 32) -> str:
         return secrets.token_urlsafe(length)
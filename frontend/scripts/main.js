@@ -2,7 +2,11 @@
 class JobPlatform {
     constructor() {
         this.currentUser = null;
-        this.jobs = [];
+        // Jobs shown so far, by id; pages are fetched from the feed as the user asks for more
+        this.jobs = new Map();
+        this.jobsEndpoint = '/api/v1/jobs';
+        this.jobFilters = {};
+        this.nextCursor = null;
         this.provinces = {
             'gauteng': ['Johannesburg', 'Pretoria', 'Sandton', 'Randburg', 'Centurion'],
             'western-cape': ['Cape Town', 'Stellenbosch', 'Paarl', 'Worcester'],
@@ -21,7 +25,7 @@ class JobPlatform {
     init() {
         this.loadComponents();
         this.initializeEventListeners();
-        this.loadSampleJobs();
+        this.loadJobs();
         this.initializeAnimations();
         this.startCounters();
     }
@@ -56,6 +60,21 @@ class JobPlatform {
             registrationForm.addEventListener('submit', (e) => this.handleRegistration(e));
         }
 
+        // Job card buttons: one delegated listener, so appended pages need no binding of their own
+        const jobsGrid = document.getElementById('jobsGrid');
+        if (jobsGrid) {
+            jobsGrid.addEventListener('click', (e) => {
+                const button = e.target.closest('button[data-action]');
+                if (!button) return;
+                const jobId = button.closest('.job-card').dataset.jobId;
+                if (button.dataset.action === 'apply') {
+                    this.applyToJob(jobId);
+                } else if (button.dataset.action === 'save') {
+                    this.saveJob(jobId);
+                }
+            });
+        }
+
         // Scroll animations
         window.addEventListener('scroll', () => this.handleScroll());
     }
@@ -76,8 +95,33 @@ class JobPlatform {
         }
     }
 
+    async loadJobs(append = false) {
+        const params = new URLSearchParams({ limit: 20, ...this.jobFilters });
+        if (append && this.nextCursor) {
+            params.set('cursor', this.nextCursor);
+        }
+
+        try {
+            const response = await fetch(`${this.jobsEndpoint}?${params}`);
+            const result = await response.json();
+            if (!result.success) throw new Error(result.error);
+            this.nextCursor = result.data.next_cursor;
+            this.renderJobs(result.data.jobs, append);
+            return result.data.jobs.length;
+        } catch (error) {
+            // Static hosting without the API: show the sample listings instead
+            if (!append) this.loadSampleJobs();
+            return 0;
+        }
+    }
+
+    loadMoreJobs() {
+        if (this.nextCursor) this.loadJobs(true);
+    }
+
     loadSampleJobs() {
-        this.jobs = [
+        this.nextCursor = null;
+        this.renderJobs([
             {
                 id: 1,
                 title: "Senior Software Developer",
@@ -111,73 +155,136 @@ class JobPlatform {
                 posted: "3 days ago",
                 urgent: false
             }
-        ];
-
-        this.renderJobs();
+        ]);
     }
 
-    renderJobs() {
+    renderJobs(jobs, append = false) {
         const jobsGrid = document.getElementById('jobsGrid');
         if (!jobsGrid) return;
 
-        jobsGrid.innerHTML = this.jobs.map(job => `
-            <div class="job-card" data-aos="fade-up">
+        // Only the new page is turned into markup; earlier cards stay in the DOM untouched
+        if (!append) this.jobs.clear();
+        jobs.forEach(job => this.jobs.set(String(job.id), job));
+        const html = jobs.map(job => this.renderJobCard(job)).join('');
+        if (append) {
+            jobsGrid.insertAdjacentHTML('beforeend', html);
+        } else {
+            jobsGrid.innerHTML = html;
+        }
+
+        const loadMore = document.getElementById('loadMoreJobs');
+        if (loadMore) loadMore.style.display = this.nextCursor ? '' : 'none';
+    }
+
+    escapeHtml(value) {
+        // Listings come from employers, so every field is text, never markup
+        return String(value ?? '').replace(/[&<>"']/g, (c) => ({
+            '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+        })[c]);
+    }
+
+    renderJobCard(job) {
+        const e = (value) => this.escapeHtml(value);
+        return `
+            <div class="job-card" data-aos="fade-up" data-job-id="${e(job.id)}">
                 ${job.urgent ? '<div class="card-badge">URGENT</div>' : ''}
-                <h3>${job.title}</h3>
-                <p class="company">${job.company}</p>
-                <p class="location"><i class="fas fa-map-marker-alt"></i> ${job.location}</p>
-                <p class="salary"><i class="fas fa-money-bill-wave"></i> ${job.salary}/month</p>
-                <p class="type"><i class="fas fa-clock"></i> ${job.type}</p>
-                <p class="description">${job.description}</p>
+                <h3>${e(job.title)}</h3>
+                <p class="company">${e(job.company)}</p>
+                <p class="location"><i class="fas fa-map-marker-alt"></i> ${e(job.location)}</p>
+                <p class="salary"><i class="fas fa-money-bill-wave"></i> ${e(job.salary)}/month</p>
+                <p class="type"><i class="fas fa-clock"></i> ${e(job.type)}</p>
+                <p class="description">${e(job.description)}</p>
                 <div class="job-actions">
-                    <button class="btn btn-primary" onclick="jobPlatform.applyToJob(${job.id})">
+                    <button class="btn btn-primary" data-action="apply">
                         <i class="fas fa-paper-plane"></i>
                         Apply Now
                     </button>
-                    <button class="btn btn-secondary" onclick="jobPlatform.saveJob(${job.id})">
+                    <button class="btn btn-secondary" data-action="save">
                         <i class="fas fa-heart"></i>
                         Save
                     </button>
                 </div>
-                <p class="posted-time">${job.posted}</p>
+                <p class="posted-time">${e(job.posted || this.timeAgo(job.posted_at))}</p>
             </div>
-        `).join('');
+        `;
+    }
+
+    timeAgo(postedAt) {
+        if (!postedAt) return '';
+        const seconds = Date.now() / 1000 - (typeof postedAt === 'number' ? postedAt : Date.parse(postedAt) / 1000);
+        const units = [['day', 86400], ['hour', 3600], ['minute', 60]];
+        for (const [unit, size] of units) {
+            const count = Math.floor(seconds / size);
+            if (count >= 1) return `${count} ${unit}${count > 1 ? 's' : ''} ago`;
+        }
+        return 'just now';
     }
 
     async applyToJob(jobId) {
+        return this.applyToJobs([jobId]);
+    }
+
+    async applyToJobs(jobIds) {
+        // Bulk-friendly: the queue answers with application ids straight away and reports
+        // each submission over server-sent events as employers accept it
         if (!this.currentUser) {
             showRegistrationModal();
             return;
         }
 
-        const job = this.jobs.find(j => j.id === jobId);
-        if (!job) return;
+        const jobs = jobIds.map(jobId => this.jobs.get(String(jobId))).filter(Boolean);
+        if (!jobs.length) return;
 
         try {
-            // Simulate AI-powered application
-            const result = await this.submitAIApplication(job);
-            
-            if (result.success) {
-                this.showNotification('Application submitted successfully!', 'success');
-            } else {
-                this.showNotification('Application failed. Please try again.', 'error');
+            const result = await this.submitAIApplications(jobs);
+            if (!result.success) {
+                this.showNotification(result.error || 'Application failed. Please try again.', 'error');
+                return;
             }
+            const queued = jobs.length === 1 ? 'Application' : `${jobs.length} applications`;
+            this.showNotification(`${queued} queued - we'll let you know when submitted`, 'info');
+            this.watchApplications(result.data.batch_id);
         } catch (error) {
             this.showNotification('Error submitting application', 'error');
         }
     }
 
-    async submitAIApplication(job) {
-        // Simulate AI processing
-        return new Promise(resolve => {
-            setTimeout(() => {
-                resolve({
-                    success: true,
-                    message: 'AI-optimized application submitted',
-                    applicationId: `app_${Date.now()}`,
-                    optimizationScore: 92
-                });
-            }, 2000);
+    async submitAIApplications(jobs) {
+        const response = await fetch('/api/v1/applications', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                applications: jobs.map(job => ({
+                    job_id: job.id,
+                    user_id: this.currentUser.id,
+                    employer: job.company,
+                    title: job.title
+                }))
+            })
+        });
+        if (response.status === 429) {
+            const retryAfter = response.headers.get('Retry-After') || 'a few';
+            return { success: false, error: `We're busy right now - try again in ${retryAfter} seconds` };
+        }
+        return response.json();
+    }
+
+    watchApplications(batchId) {
+        if (typeof EventSource === 'undefined') return;
+
+        let submitted = 0;
+        let failed = 0;
+        const events = new EventSource(`/api/v1/applications/events?batch_id=${encodeURIComponent(batchId)}`);
+        events.addEventListener('status', (event) => {
+            JSON.parse(event.data).forEach(change => {
+                if (change.status === 'submitted') submitted += 1;
+                if (change.status === 'failed') failed += 1;
+            });
+        });
+        events.addEventListener('done', () => {
+            events.close();
+            if (submitted) this.showNotification(`${submitted} application${submitted > 1 ? 's' : ''} submitted successfully!`, 'success');
+            if (failed) this.showNotification(`${failed} application${failed > 1 ? 's' : ''} failed. Please try again.`, 'error');
         });
     }
 
@@ -345,19 +452,19 @@ function scrollToSection(sectionId) {
     });
 }
 
-function searchJobs() {
+async function searchJobs() {
     const province = document.getElementById('provinceSelect').value;
-    const city = document.getElementById('citySelect').value;
-    const industry = document.getElementById('industrySelect').value;
-    const salary = document.getElementById('salaryRange').value;
-    
+    const salary = document.getElementById('salaryRange').value.replace(/[^\d.]/g, '');
+
+    // Filtering happens on the server, against indexed columns
+    jobPlatform.jobFilters = {};
+    if (province) jobPlatform.jobFilters.province = province;
+    if (salary) jobPlatform.jobFilters.min_salary = salary;
+
     jobPlatform.showNotification('Searching for matching jobs...', 'info');
-    
-    // Simulate search
-    setTimeout(() => {
-        jobPlatform.renderJobs();
-        jobPlatform.showNotification('Found 25 matching jobs!', 'success');
-    }, 1000);
+    const found = await jobPlatform.loadJobs();
+    const more = jobPlatform.nextCursor ? '+' : '';
+    jobPlatform.showNotification(`Found ${found}${more} matching jobs!`, 'success');
 }
 
 function selectPlan(plan) {